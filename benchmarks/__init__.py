@@ -0,0 +1 @@
+"""Benchmarks of functional_stability engine (they are not tests, results are compared with saved baseline)"""
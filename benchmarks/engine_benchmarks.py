@@ -0,0 +1,264 @@
+"""Time, memory and accuracy of every method and every variant of minimum cuts over families of graphs
+
+    python -m benchmarks.engine_benchmarks                    # compare with benchmarks/baseline.json
+    python -m benchmarks.engine_benchmarks --save-baseline    # write new baseline
+    python -m benchmarks.engine_benchmarks --families ladder,wheel --methods "Simple paths" --repeats 5
+
+Families: complete graphs (as default tab of main window), ladders, grids, wheels, random graphs G(n, m)
+(as "generate_new_graph" of main window, but with fixed seeds) and chains of complete graphs with articulation
+points. Source and target are the first and the last nodes, as in formula window. For every case time is the best
+of several runs, peak memory is measured by one more run with tracemalloc, values are taken for equal
+probabilities p (bound gap is upper - lower bound, error is distance to exact value by binary decision diagram).
+Regression is slower time or bigger memory (more than tolerance and more than minimal absolute difference),
+bigger bound gap or error, other amount of cuts.
+Time and memory of baseline depend on computer, so baseline is saved again on new computer before changes.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+import networkx as nx
+import numpy as np
+
+import functional_stability
+
+logger = logging.getLogger(__name__)
+
+default_baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# equal probabilities of edges, values of methods are compared at these points
+probabilities_levels = [0.5, 0.7, 0.9]
+# variants of functional_stability.get_minimum_cuts
+minimum_cuts_variants = [1, 2, 3, 4, 5]
+# exhaustive search checks 2ᵐ states, bigger graphs are skipped
+max_exhaustive_search_edges = 20
+# limits of enumeration, so one case can't take whole run
+paths_limits = dict(max_paths_amount=20000, max_seconds=30)
+cuts_limits = dict(max_paths_amount=20000, max_seconds=30, items_name="cuts")
+
+
+def get_random_graph(nodes_amount, edges_amount, seed):
+    # the same algorithm as "generate_new_graph" of main window: random edges of complete graph
+    random_generator = random.Random(seed)
+    new_graph_edges = list(combinations(range(nodes_amount), 2))
+    random_generator.shuffle(new_graph_edges)
+    new_graph_data = nx.Graph()
+    new_graph_data.add_nodes_from(range(nodes_amount))
+    new_graph_data.add_edges_from(new_graph_edges[:edges_amount])
+    return new_graph_data
+
+
+def get_blocks_chain(blocks_amount, block_nodes_amount):
+    # complete graphs, where the last node of one graph is the first node of next one (articulation points)
+    new_graph_data = nx.Graph()
+    for block_ind in range(blocks_amount):
+        first_node = block_ind * (block_nodes_amount - 1)
+        new_graph_data.add_edges_from(combinations(range(first_node, first_node + block_nodes_amount), 2))
+    return new_graph_data
+
+
+def _get_integer_graph(arg_graph):
+    # nodes of main window are 0, 1, 2, ... (grid has nodes (i, j))
+    return nx.convert_node_labels_to_integers(arg_graph, ordering="sorted")
+
+
+# family -> list of (name of case, function which makes graph)
+graph_families = {
+    "complete": [(f"K{nodes_amount}", lambda nodes_amount=nodes_amount: nx.complete_graph(nodes_amount))
+                 for nodes_amount in (4, 5, 6, 7)],
+    "ladder": [(f"ladder{rungs_amount}", lambda rungs_amount=rungs_amount: nx.ladder_graph(rungs_amount))
+               for rungs_amount in (3, 5, 8)],
+    "grid": [(f"grid{rows_amount}x{columns_amount}",
+              lambda rows_amount=rows_amount, columns_amount=columns_amount:
+              _get_integer_graph(nx.grid_2d_graph(rows_amount, columns_amount)))
+             for rows_amount, columns_amount in ((3, 3), (3, 4), (4, 4))],
+    "wheel": [(f"wheel{nodes_amount}", lambda nodes_amount=nodes_amount: nx.wheel_graph(nodes_amount))
+              for nodes_amount in (5, 7, 9)],
+    "random": [(f"gnm{nodes_amount}_{edges_amount}_seed{seed}",
+                lambda nodes_amount=nodes_amount, edges_amount=edges_amount, seed=seed:
+                get_random_graph(nodes_amount, edges_amount, seed))
+               for nodes_amount, edges_amount, seed in ((7, 12, 0), (8, 16, 1), (10, 20, 2))],
+    "blocks": [(f"K{block_nodes_amount}chain{blocks_amount}",
+                lambda blocks_amount=blocks_amount, block_nodes_amount=block_nodes_amount:
+                get_blocks_chain(blocks_amount, block_nodes_amount))
+               for blocks_amount, block_nodes_amount in ((2, 5), (3, 5), (4, 6))],
+}
+
+
+def _get_uniform_values(method_result_data):
+    # every function of first formula (e.g. lower and upper bounds) at every level of p
+    return [[float(one_value) for one_value in one_function.evaluate_uniform(np.array(probabilities_levels))]
+            for one_function, _ in method_result_data["first_formula_functions"]]
+
+
+def _run_method(arg_graph, arg_method, trace_memory=False):
+    run_metrics = functional_stability.RunMetrics(trace_memory=trace_memory)
+    method_result_data = functional_stability.get_all_info_by_method(
+        arg_graph, arg_method, arg_budget=functional_stability.EnumerationBudget(**paths_limits),
+        arg_cuts_budget=functional_stability.EnumerationBudget(**cuts_limits), arg_metrics=run_metrics)
+    with run_metrics.measure_stage("evaluation"):
+        all_values = _get_uniform_values(method_result_data)
+    run_metrics.finish()
+    return method_result_data, all_values, run_metrics
+
+
+def benchmark_method(arg_graph, arg_method, exact_values, repeats_amount):
+    """Best time of several runs, peak memory of traced run, values, bound gap and error"""
+    best_seconds = None
+    for _ in range(repeats_amount):
+        method_result_data, all_values, run_metrics = _run_method(arg_graph, arg_method)
+        if best_seconds is None or run_metrics.total_seconds < best_seconds:
+            best_seconds = run_metrics.total_seconds
+            best_metrics = run_metrics
+    _, _, traced_metrics = _run_method(arg_graph, arg_method, trace_memory=True)
+    case_result = {
+        "seconds": best_seconds,
+        "peak_memory_bytes": max(one_stage["peak_memory_bytes"] for one_stage in traced_metrics.stages.values()),
+        "stages": best_metrics.to_dict()["stages"],
+        "values": all_values,
+        "partial": (method_result_data["paths_enumeration_stop_reason"] is not None
+                    or method_result_data["cuts_enumeration_stop_reason"] is not None),
+    }
+    # bounds are the last two functions: [lower, upper] or [estimate, lower, upper] (Monte Carlo)
+    if len(all_values) >= 2:
+        case_result["bound_gap"] = max(upper_value - lower_value
+                                       for lower_value, upper_value in zip(all_values[-2], all_values[-1]))
+    if exact_values is not None:
+        if len(all_values) == 2:
+            # distance from exact value to range of bounds (0 if value is inside)
+            case_result["error"] = max(max(lower_value - one_exact, one_exact - upper_value, 0.)
+                                       for lower_value, upper_value, one_exact
+                                       in zip(all_values[0], all_values[1], exact_values))
+        else:
+            case_result["error"] = max(abs(one_value - one_exact)
+                                       for one_value, one_exact in zip(all_values[0], exact_values))
+    return case_result
+
+
+def benchmark_minimum_cuts(arg_graph, arg_variant, repeats_amount):
+    first_node, last_node = functional_stability.get_default_terminals(arg_graph)
+    best_seconds = None
+    for _ in range(repeats_amount):
+        start_time = time.perf_counter()
+        all_minimum_cuts = functional_stability.get_minimum_cuts(arg_graph, first_node, last_node, arg_variant)
+        elapsed_seconds = time.perf_counter() - start_time
+        best_seconds = elapsed_seconds if best_seconds is None else min(best_seconds, elapsed_seconds)
+    return {"seconds": best_seconds, "cuts_amount": len(all_minimum_cuts)}
+
+
+def run_benchmarks(chosen_families=None, chosen_methods=None, repeats_amount=3, with_minimum_cuts=True):
+    """Case key ("family/graph/method" or "family/graph/minimum cuts N") -> results of case"""
+    all_results = {}
+    for family_name, family_cases in graph_families.items():
+        if chosen_families is not None and family_name not in chosen_families:
+            continue
+        for case_name, get_case_graph in family_cases:
+            case_graph = get_case_graph()
+            graph_key = f"{family_name}/{case_name}"
+            exact_values = None
+            if nx.has_path(case_graph, *functional_stability.get_default_terminals(case_graph)):
+                _, exact_bdd_values, _ = _run_method(case_graph, "Binary decision diagram")
+                exact_values = exact_bdd_values[0]
+            for one_method in functional_stability.all_methods_for_functional_stability:
+                if chosen_methods is not None and one_method not in chosen_methods:
+                    continue
+                if one_method == "Exhaustive search" and case_graph.number_of_edges() > max_exhaustive_search_edges:
+                    continue
+                logger.info("%s: %s", graph_key, one_method)
+                try:
+                    all_results[f"{graph_key}/{one_method}"] = benchmark_method(case_graph, one_method,
+                                                                                exact_values, repeats_amount)
+                except (ValueError, nx.NetworkXException) as method_error:
+                    # e.g. Litvak-Ushakov for source and target without path
+                    all_results[f"{graph_key}/{one_method}"] = {"error_text": str(method_error)}
+            if with_minimum_cuts:
+                for one_variant in minimum_cuts_variants:
+                    all_results[f"{graph_key}/minimum cuts {one_variant}"] = benchmark_minimum_cuts(
+                        case_graph, one_variant, repeats_amount)
+    return all_results
+
+
+def compare_with_baseline(all_results, baseline_results, time_tolerance=0.5, min_seconds_difference=0.1,
+                          memory_tolerance=0.5, min_memory_difference=256 * 1024, accuracy_tolerance=1e-9):
+    """List of texts of regressions (cases which are not in baseline are not compared)"""
+    all_regressions = []
+    for case_key, case_result in all_results.items():
+        baseline_case = baseline_results.get(case_key)
+        if baseline_case is None or "error_text" in case_result or "error_text" in baseline_case:
+            continue
+        for value_key, relative_tolerance, absolute_difference in (
+                ("seconds", time_tolerance, min_seconds_difference),
+                ("peak_memory_bytes", memory_tolerance, min_memory_difference)):
+            if value_key not in case_result or value_key not in baseline_case:
+                continue
+            new_value, old_value = case_result[value_key], baseline_case[value_key]
+            if new_value > old_value * (1 + relative_tolerance) and new_value - old_value > absolute_difference:
+                all_regressions.append(f"{case_key}: {value_key} {old_value:.6g} -> {new_value:.6g}")
+        for value_key in ("bound_gap", "error"):
+            if value_key in case_result and value_key in baseline_case \
+                    and case_result[value_key] > baseline_case[value_key] + accuracy_tolerance:
+                all_regressions.append(f"{case_key}: {value_key} {baseline_case[value_key]:.6g} -> "
+                                       f"{case_result[value_key]:.6g}")
+        if "cuts_amount" in case_result and case_result["cuts_amount"] != baseline_case.get("cuts_amount"):
+            all_regressions.append(f"{case_key}: cuts_amount {baseline_case.get('cuts_amount')} -> "
+                                   f"{case_result['cuts_amount']}")
+    return all_regressions
+
+
+def get_arguments_parser():
+    arguments_parser = argparse.ArgumentParser(prog="python -m benchmarks.engine_benchmarks",
+                                               description="Benchmarks of methods of functional stability")
+    arguments_parser.add_argument("--baseline", default=default_baseline_path, help="JSON file of baseline")
+    arguments_parser.add_argument("--save-baseline", action="store_true",
+                                  help="results are written to baseline file instead of comparison")
+    arguments_parser.add_argument("--output", default=None, help="JSON file of results")
+    arguments_parser.add_argument("--families", default=None,
+                                  help=f"comma-separated families, all by default ({', '.join(graph_families)})")
+    arguments_parser.add_argument("--methods", default=None, help="comma-separated methods, all by default")
+    arguments_parser.add_argument("--no-minimum-cuts", action="store_true", help="variants of minimum cuts are skipped")
+    arguments_parser.add_argument("--repeats", type=int, default=3, help="runs of every case, the best time is kept")
+    arguments_parser.add_argument("--time-tolerance", type=float, default=0.5,
+                                  help="allowed relative slowdown (0.5 -> 50%%)")
+    arguments_parser.add_argument("--verbose", action="store_true")
+    return arguments_parser
+
+
+def main(arguments_list=None):
+    parsed_arguments = get_arguments_parser().parse_args(arguments_list)
+    logging.basicConfig(level=logging.INFO if parsed_arguments.verbose else logging.WARNING,
+                        format="%(levelname)s: %(message)s")
+    chosen_families = None if parsed_arguments.families is None else parsed_arguments.families.split(",")
+    chosen_methods = None if parsed_arguments.methods is None else parsed_arguments.methods.split(",")
+    all_results = run_benchmarks(chosen_families, chosen_methods, max(1, parsed_arguments.repeats),
+                                 not parsed_arguments.no_minimum_cuts)
+    benchmark_info = {"python": sys.version.split()[0], "numpy": np.__version__, "networkx": nx.__version__,
+                      "cases": all_results}
+    if parsed_arguments.output is not None:
+        with open(parsed_arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(benchmark_info, output_file, ensure_ascii=False, indent=1)
+    if parsed_arguments.save_baseline:
+        with open(parsed_arguments.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(benchmark_info, baseline_file, ensure_ascii=False, indent=1)
+        print(f"Baseline of {len(all_results)} cases is saved to {parsed_arguments.baseline}")
+        return 0
+    try:
+        with open(parsed_arguments.baseline, encoding="utf-8") as baseline_file:
+            baseline_results = json.load(baseline_file)["cases"]
+    except (OSError, ValueError, KeyError) as baseline_error:
+        print(f"Baseline can't be read ({baseline_error}), run with --save-baseline first")
+        return 1
+    all_regressions = compare_with_baseline(all_results, baseline_results,
+                                            time_tolerance=parsed_arguments.time_tolerance)
+    for one_regression in all_regressions:
+        print(f"REGRESSION {one_regression}")
+    print(f"{len(all_results)} cases, {len(all_regressions)} regressions")
+    return 1 if all_regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Thread of calculation of one method for formula window (it's shared by both main files), so window isn't hung"""
+import logging
+
+from PyQt5 import QtCore
+import numpy as np
+
+import functional_stability
+
+logger = logging.getLogger(__name__)
+
+
+class MethodCalculationThread(QtCore.QThread):
+    """Formulas, compiled functions and values of chart of one method; results are sent back by signals
+
+    Cancel stops enumeration of paths and cuts right after next found path (cut), building of binary decision
+    diagram, exhaustive search (between parts of states or shards of processes) and samples of Monte Carlo (between
+    batches), other stages are finished first, then results are dropped.
+    """
+    stage_changed = QtCore.pyqtSignal(str)
+    paths_found = QtCore.pyqtSignal(int)
+    cuts_found = QtCore.pyqtSignal(int)
+    # results of method, points of chart, list of values of chart for every second formula function
+    calculation_finished = QtCore.pyqtSignal(object, object, object)
+    calculation_failed = QtCore.pyqtSignal(str)
+    calculation_cancelled = QtCore.pyqtSignal()
+    # points of chart of equal probabilities (p₁ = p₂ = ... = p)
+    chart_x_values = np.arange(0, 1, 0.01)
+    # exact methods give coefficients of polynomial, so many more points cost almost nothing
+    polynomial_chart_x_values = np.linspace(0, 1, 10001)
+    # working threads are kept here, so thread isn't destroyed with window, which is closed before end of thread
+    running_threads = set()
+
+    def __init__(self, chosen_graph_info, chosen_method, paths_limits, cuts_limits, chosen_paths_and_cuts=None,
+                 trace_memory=False, fixed_edges_values=None, edges_probabilities=None, parent=None):
+        super().__init__(parent)
+        self.chosen_graph_data = chosen_graph_info
+        self.chosen_method = chosen_method
+        self.chosen_paths_and_cuts = chosen_paths_and_cuts
+        # edges with p = 0 or p = 1 (sliders), they are deleted or contracted by reduction of graph
+        self.fixed_edges_values = fixed_edges_values
+        # all sliders, families of disjoint paths and cuts are chosen for them too
+        self.edges_probabilities = edges_probabilities
+        self.paths_budget = functional_stability.EnumerationBudget(
+            **paths_limits, progress_callback=lambda found_amount, _: self.paths_found.emit(found_amount))
+        self.cuts_budget = functional_stability.EnumerationBudget(
+            **cuts_limits, progress_callback=lambda found_amount, _: self.cuts_found.emit(found_amount))
+        self.is_cancelled = False
+        # time, memory and counters of stages, they are read by window after end of thread
+        self.run_metrics = functional_stability.RunMetrics(trace_memory=trace_memory)
+
+    def start(self, *args):
+        MethodCalculationThread.running_threads.add(self)
+        self.finished.connect(lambda: MethodCalculationThread.running_threads.discard(self))
+        super().start(*args)
+
+    def cancel(self):
+        # it's called by thread of window
+        self.is_cancelled = True
+        self.paths_budget.cancel()
+        self.cuts_budget.cancel()
+
+    @classmethod
+    def get_chart_x_values(cls, method_result_data):
+        if "reliability_polynomial" in method_result_data:
+            return cls.polynomial_chart_x_values
+        return cls.chart_x_values
+
+    def run(self):
+        try:
+            # cancel of budgets stops stages without budget too (exhaustive search, Monte Carlo)
+            with functional_stability.cancellation_scope(self.paths_budget, self.cuts_budget):
+                self.stage_changed.emit(f"Building formulas ({self.chosen_method})...")
+                method_result_data = functional_stability.get_all_info_by_method(
+                    self.chosen_graph_data, self.chosen_method,
+                    arg_budget=self.paths_budget,
+                    arg_cuts_budget=self.cuts_budget,
+                    arg_results_cache=functional_stability.get_default_results_cache(),
+                    arg_paths_and_cuts=self.chosen_paths_and_cuts,
+                    arg_metrics=self.run_metrics,
+                    arg_fixed_edges_values=self.fixed_edges_values,
+                    arg_edges_probabilities=self.edges_probabilities)
+                if self.is_cancelled:
+                    raise functional_stability.CalculationCancelled
+                self.stage_changed.emit("Calculating chart...")
+                chart_x_values = self.get_chart_x_values(method_result_data)
+                # all values of chart are calculated in one call for every function
+                with self.run_metrics.measure_stage("chart"):
+                    all_chart_values = [one_second_function(chart_x_values)
+                                        for one_second_function in method_result_data["second_formula_functions"]]
+                self.run_metrics.add_counter("chart", "points", len(chart_x_values) * len(all_chart_values))
+                if self.is_cancelled:
+                    raise functional_stability.CalculationCancelled
+        except functional_stability.CalculationCancelled:
+            self.run_metrics.finish()
+            self.calculation_cancelled.emit()
+        except ValueError as method_error:  # e.g. too many edges for exhaustive search
+            self.run_metrics.finish()
+            self.calculation_failed.emit(str(method_error))
+        except Exception as unexpected_error:  # e.g. MemoryError of too many paths, OSError of cache
+            # otherwise thread is finished without any signal and window shows stage of calculation forever
+            logger.exception("Calculation of %s is failed", self.chosen_method)
+            self.run_metrics.finish()
+            self.calculation_failed.emit(f"{type(unexpected_error).__name__}: {unexpected_error}")
+        else:
+            self.run_metrics.finish()
+            self.calculation_finished.emit(method_result_data, chart_x_values, all_chart_values)
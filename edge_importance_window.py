@@ -0,0 +1,75 @@
+"""Window with Birnbaum importance of edges (table and colours of edges), it's shared by both main files"""
+from PyQt5 import QtWidgets, QtGui
+from PyQt5.QtCore import Qt
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+import networkx as nx
+import numpy as np
+
+import functional_stability
+
+
+class EdgeImportanceWindow(QtWidgets.QWidget):
+    # colours of edges: the least important edge -> the most important edge
+    importance_colour_map = "coolwarm"
+
+    def __init__(self, chosen_graph_info, method_result_data, all_edges_probabilities, node_positions=None):
+        super().__init__()
+        self.chosen_graph_data = chosen_graph_info
+        self.setWindowTitle(f"Importance of edges ({method_result_data['method_name']})")
+        self.setGeometry(0, 0, 700, 800)
+        self.setStyleSheet("background-color: #FFFCF4;")
+
+        # ∂P/∂pₑ for every function of method (e.g. lower and upper bounds), edges are in order of graph
+        all_edges = list(self.chosen_graph_data.edges)
+        importance_names = []
+        all_importances = []
+        for one_importance_function, importance_name in method_result_data["importance_functions"]:
+            importance_names.append(importance_name)
+            all_importances.append(functional_stability.get_birnbaum_importances(one_importance_function,
+                                                                                 all_edges_probabilities))
+        # edges are ranked by the first function, other functions are shown in the same rows
+        importance_ranking = functional_stability.get_importance_ranking(all_edges, all_importances[0])
+        edges_columns = {tuple(sorted(one_edge)): one_edge_ind for one_edge_ind, one_edge in enumerate(all_edges)}
+
+        self.importance_description_label = QtWidgets.QLabel(
+            "Birnbaum importance ∂P/∂pₑ = P(pₑ = 1) - P(pₑ = 0) for current probabilities of edges")
+        self.importance_description_label.setWordWrap(True)
+        self.importance_description_label.setFont(QtGui.QFont("Arial", 12))
+
+        self.importance_table = QtWidgets.QTableWidget(len(importance_ranking), 2 + len(importance_names))
+        self.importance_table.setHorizontalHeaderLabels(["Rank", "Edge"] + [f"∂P/∂pₑ ({one_name})"
+                                                                              for one_name in importance_names])
+        self.importance_table.verticalHeader().hide()
+        self.importance_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for one_rank, (one_edge, _) in enumerate(importance_ranking):
+            one_row_texts = [str(one_rank + 1), f"({one_edge[0] + 1}-{one_edge[1] + 1})"]
+            one_row_texts += [f"{one_importances[edges_columns[one_edge]]:.6g}" for one_importances in all_importances]
+            for one_column_ind, one_text in enumerate(one_row_texts):
+                one_item = QtWidgets.QTableWidgetItem(one_text)
+                one_item.setTextAlignment(Qt.AlignCenter)
+                self.importance_table.setItem(one_rank, one_column_ind, one_item)
+        self.importance_table.resizeColumnsToContents()
+
+        # the same graph with coloured edges (positions of nodes are taken from editor)
+        self.main_figure, self.ax = plt.subplots(dpi=100)
+        self.importance_canvas = FigureCanvasQTAgg(self.main_figure)
+        if node_positions is None:
+            node_positions = nx.spring_layout(self.chosen_graph_data, seed=0)
+        edges_collection = nx.draw_networkx_edges(self.chosen_graph_data, node_positions, ax=self.ax, width=4,
+                                                  edgelist=all_edges, edge_color=all_importances[0],
+                                                  edge_cmap=plt.get_cmap(self.importance_colour_map),
+                                                  edge_vmin=0., edge_vmax=max(float(np.max(all_importances[0])),
+                                                                              1e-12))
+        nx.draw_networkx_nodes(self.chosen_graph_data, node_positions, ax=self.ax, node_color="white",
+                               edgecolors="black")
+        nx.draw_networkx_labels(self.chosen_graph_data, node_positions, ax=self.ax,
+                                labels={one_node: str(one_node + 1) for one_node in self.chosen_graph_data.nodes})
+        if all_edges:
+            self.main_figure.colorbar(edges_collection, ax=self.ax, label=f"∂P/∂pₑ ({importance_names[0]})")
+        self.ax.set_axis_off()
+
+        self.main_vertical_layout = QtWidgets.QVBoxLayout(self)
+        self.main_vertical_layout.addWidget(self.importance_description_label)
+        self.main_vertical_layout.addWidget(self.importance_table)
+        self.main_vertical_layout.addWidget(self.importance_canvas)
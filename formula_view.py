@@ -0,0 +1,131 @@
+"""View of long formulas by pages of rows with search and export (it's shared by both main files)
+
+Qt asks model only for visible rows, so formula with thousands of terms isn't laid out as one giant label.
+"""
+from PyQt5 import QtCore, QtWidgets, QtGui
+from PyQt5.QtCore import Qt
+
+import functional_stability
+
+
+class FormulaRowsModel(QtCore.QAbstractListModel):
+    """Rows of one page of FormulaText, text of row is made only when it's shown"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.formula_text = functional_stability.FormulaText()
+        self.page_start = 0
+        self.page_rows_amount = 0
+
+    def set_page(self, formula_text, page_start, page_rows_amount):
+        self.beginResetModel()
+        self.formula_text = formula_text
+        self.page_start = page_start
+        self.page_rows_amount = page_rows_amount
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.page_rows_amount
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.formula_text.get_row(self.page_start + index.row())
+
+
+class FormulaView(QtWidgets.QWidget):
+    # rows of one page, view of one page stays fast for any amount of terms
+    rows_in_page = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.formula_text = functional_stability.FormulaText()
+        self.page_ind = 0
+
+        self.summary_label = QtWidgets.QLabel()
+        self.summary_label.setFont(QtGui.QFont("Arial", 10))
+        self.search_line = QtWidgets.QLineEdit()
+        self.search_line.setPlaceholderText("Search in formulas (e.g. p₁₋₂)")
+        self.search_line.returnPressed.connect(self.find_next_row)
+        self.button_to_find = QtWidgets.QPushButton("Find next")
+        self.button_to_find.clicked.connect(self.find_next_row)
+        self.button_to_export = QtWidgets.QPushButton("Export...")
+        self.button_to_export.clicked.connect(self.export_formulas)
+        self.search_layout = QtWidgets.QHBoxLayout()
+        self.search_layout.addWidget(self.summary_label)
+        self.search_layout.addWidget(self.search_line)
+        self.button_to_find.setMaximumWidth(100)
+        self.search_layout.addWidget(self.button_to_find)
+        self.button_to_export.setMaximumWidth(100)
+        self.search_layout.addWidget(self.button_to_export)
+
+        self.rows_model = FormulaRowsModel(self)
+        self.rows_view = QtWidgets.QListView()
+        self.rows_view.setModel(self.rows_model)
+        # all rows have the same height, so Qt doesn't measure every row
+        self.rows_view.setUniformItemSizes(True)
+        self.rows_view.setFont(QtGui.QFont("", 12))
+        self.rows_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        self.button_to_previous_page = QtWidgets.QPushButton("<")
+        self.button_to_previous_page.setMaximumWidth(40)
+        self.button_to_previous_page.clicked.connect(lambda: self.show_page(self.page_ind - 1))
+        self.page_label = QtWidgets.QLabel()
+        self.page_label.setAlignment(Qt.AlignCenter)
+        self.button_to_next_page = QtWidgets.QPushButton(">")
+        self.button_to_next_page.setMaximumWidth(40)
+        self.button_to_next_page.clicked.connect(lambda: self.show_page(self.page_ind + 1))
+        self.pages_layout = QtWidgets.QHBoxLayout()
+        self.pages_layout.addWidget(self.button_to_previous_page)
+        self.pages_layout.addWidget(self.page_label)
+        self.pages_layout.addWidget(self.button_to_next_page)
+
+        self.main_vertical_layout = QtWidgets.QVBoxLayout(self)
+        self.main_vertical_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_vertical_layout.addLayout(self.search_layout)
+        self.main_vertical_layout.addWidget(self.rows_view)
+        self.main_vertical_layout.addLayout(self.pages_layout)
+
+    @property
+    def pages_amount(self):
+        return max(1, -(-len(self.formula_text) // self.rows_in_page))
+
+    def set_formula_text(self, formula_text):
+        self.formula_text = formula_text
+        self.summary_label.setText(formula_text.get_summary())
+        self.show_page(0)
+
+    def show_page(self, page_ind):
+        rows_amount = len(self.formula_text)
+        self.page_ind = min(max(page_ind, 0), self.pages_amount - 1)
+        page_start = self.page_ind * self.rows_in_page
+        self.rows_model.set_page(self.formula_text, page_start, min(self.rows_in_page, rows_amount - page_start))
+        self.page_label.setText(f"Page {self.page_ind + 1} / {self.pages_amount}")
+        self.button_to_previous_page.setEnabled(self.page_ind > 0)
+        self.button_to_next_page.setEnabled(self.page_ind < self.pages_amount - 1)
+
+    def find_next_row(self):
+        current_index = self.rows_view.currentIndex()
+        current_row = self.page_ind * self.rows_in_page + (current_index.row() if current_index.isValid() else -1)
+        found_row = self.formula_text.find_row(self.search_line.text(), current_row + 1)
+        if found_row is None:
+            self.summary_label.setText(f"{self.formula_text.get_summary()}, nothing is found")
+            return
+        self.summary_label.setText(self.formula_text.get_summary())
+        if found_row // self.rows_in_page != self.page_ind:
+            self.show_page(found_row // self.rows_in_page)
+        found_index = self.rows_model.index(found_row - self.page_ind * self.rows_in_page)
+        self.rows_view.setCurrentIndex(found_index)
+        self.rows_view.scrollTo(found_index, QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    def export_formulas(self):
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export formulas", "formulas.txt",
+                                                             "Text files (*.txt)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", encoding="utf-8") as formulas_file:
+                # whole text is made only here, by parts
+                self.formula_text.write_text(formulas_file)
+        except OSError as export_error:
+            QtWidgets.QMessageBox.warning(self, "Export formulas", str(export_error))
@@ -0,0 +1,60 @@
+"""Functional stability calculator without graphical interface (can be used by batch jobs and worker processes)"""
+from functional_stability.engine import (
+    all_methods_for_functional_stability,
+    can_use_paths_and_cuts,
+    get_all_info_by_method,
+    get_minimum_cuts,
+    get_default_terminals,
+    get_subscript_number,
+    get_superscript_number,
+    methods_with_block_decomposition,
+    methods_with_disjoint_families,
+    methods_with_graph_reduction,
+)
+from functional_stability.binary_decision_diagram import (
+    ConnectivityDiagram,
+    get_connectivity_diagram,
+)
+from functional_stability.evaluators import (
+    PathsFormulaEvaluator,
+    PathGroupsEvaluator,
+    CutGroupsEvaluator,
+    BoundsEvaluator,
+    get_probabilities_matrix,
+)
+from functional_stability.batch_runner import run_batch
+from functional_stability.block_decomposition import (
+    BlockDecomposition,
+    BlocksProductEvaluator,
+)
+from functional_stability.cuts_enumeration import iterate_minimal_cuts
+from functional_stability.exhaustive_search import ExhaustiveSearchEvaluator
+from functional_stability.formula_text import FormulaText
+from functional_stability.graph_reduction import (
+    GraphReduction,
+    ReducedGraphEvaluator,
+)
+from functional_stability.gomory_hu import (
+    AllPairsMinimumCuts,
+    get_all_pairs_minimum_cuts,
+)
+from functional_stability.importance import (
+    get_birnbaum_importances,
+    get_importance_ranking,
+)
+from functional_stability.incremental_structure import IncrementalPathsAndCuts
+from functional_stability.instrumentation import RunMetrics
+from functional_stability.monte_carlo import MonteCarloEvaluator
+from functional_stability.path_set import PathGroups, PathSet
+from functional_stability.reliability_polynomial import ReliabilityPolynomial
+from functional_stability.paths_enumeration import (
+    CalculationCancelled,
+    EnumerationBudget,
+    cancellation_scope,
+    check_cancelled,
+    iterate_simple_paths,
+)
+from functional_stability.results_cache import (
+    ResultsCache,
+    get_default_results_cache,
+)
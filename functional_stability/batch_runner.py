@@ -0,0 +1,256 @@
+"""Batch mode: every row of CSV table (probabilities of all edges) is calculated by chosen method
+
+    python -m functional_stability.batch_runner graph.graphml scenarios.csv results.csv --method "Monte Carlo"
+
+Graph is .graphml file exported by main window (or edge list, one "u v" pair in line). Nodes are numbered from 1,
+as in main window: column "1-2" of table is probability of edge between nodes 1 and 2, other columns (e.g.
+name of scenario) are copied to results. Formulas (compiled functions) of method are built once, then they are
+sent once to every process of pool, and rows are sent to processes by tasks of several rows. Every task is
+calculated by one vectorized call, so "seconds" of row is time of its task divided by amount of rows in task
+(--rows-in-task 1 gives time of every row separately).
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+from functional_stability.engine import all_methods_for_functional_stability, get_all_info_by_method
+from functional_stability.evaluators import get_edges_index
+from functional_stability.instrumentation import RunMetrics
+from functional_stability.paths_enumeration import EnumerationBudget
+
+logger = logging.getLogger(__name__)
+
+# names of result columns, they are in order of 'first_formula_functions' of method
+result_columns_by_method = {
+    "Esary-Proshan": ["lower_bound", "upper_bound"],
+    "Litvak-Ushakov": ["lower_bound", "upper_bound"],
+    "Monte Carlo": ["estimate", "interval_lower", "interval_upper"],
+}
+
+
+def read_graph(graph_file_path):
+    """Graph from .graphml file of main window or from edge list (nodes are integers, as in main window)"""
+    if graph_file_path.endswith(".graphml"):
+        graph_from_file = nx.read_graphml(graph_file_path)
+        defined_graph = nx.Graph()
+        defined_graph.add_nodes_from(int(one_node) for one_node in graph_from_file.nodes)
+        defined_graph.add_edges_from((int(one_edge[0]), int(one_edge[1])) for one_edge in graph_from_file.edges)
+        return defined_graph
+    return nx.read_edgelist(graph_file_path, nodetype=int, create_using=nx.Graph)
+
+
+def get_edge_column_name(one_edge):
+    # (0, 1) -> "1-2", nodes are numbered from 1 as in main window
+    return f"{one_edge[0] + 1}-{one_edge[1] + 1}"
+
+
+def get_edges_columns(all_column_names, all_edges):
+    """Column of table for every column of probabilities matrix, and columns which are copied to results"""
+    edges_index = get_edges_index(all_edges)
+    edges_columns = [None] * len(all_edges)
+    copied_columns = []
+    for one_column_ind, one_column_name in enumerate(all_column_names):
+        one_edge = None
+        edge_nodes = one_column_name.strip().strip("()").split("-")
+        if len(edge_nodes) == 2 and all(one_node.strip().isdigit() for one_node in edge_nodes):
+            one_edge = tuple(sorted(int(one_node) - 1 for one_node in edge_nodes))
+        if one_edge is None:
+            copied_columns.append(one_column_ind)
+        elif one_edge not in edges_index:
+            raise ValueError(f"Column {one_column_name!r}: there is no such edge in graph")
+        else:
+            edges_columns[edges_index[one_edge]] = one_column_ind
+    missing_edges = [get_edge_column_name(one_edge) for one_edge, one_column_ind in zip(all_edges, edges_columns)
+                     if one_column_ind is None]
+    if missing_edges:
+        raise ValueError(f"There are no columns for edges: {', '.join(missing_edges)}")
+    return edges_columns, copied_columns
+
+
+def iterate_rows_tasks(all_numbered_rows, edges_columns, rows_in_task):
+    """(number of row in file, row) -> tasks (numbers of rows, probabilities matrix) of at most 'rows_in_task' rows"""
+    rows_numbers = []
+    rows_probabilities = []
+    for one_row_number, one_table_row in all_numbered_rows:
+        try:
+            one_row_probabilities = [float(one_table_row[one_column_ind]) for one_column_ind in edges_columns]
+        except (ValueError, IndexError):
+            raise ValueError(f"Row {one_row_number}: probabilities of all edges must be numbers") from None
+        if not all(0. <= one_probability <= 1. for one_probability in one_row_probabilities):
+            raise ValueError(f"Row {one_row_number}: probabilities must be inside [0, 1]")
+        rows_numbers.append(one_row_number)
+        rows_probabilities.append(one_row_probabilities)
+        if len(rows_numbers) == rows_in_task:
+            yield rows_numbers, np.array(rows_probabilities)
+            rows_numbers, rows_probabilities = [], []
+    if rows_numbers:
+        yield rows_numbers, np.array(rows_probabilities)
+
+
+# tasks which are submitted to pool, but aren't written yet (rows of table aren't kept in memory all at once)
+tasks_in_flight_per_process = 2
+
+# functions of method in process of pool, they are received once by initializer of process
+_worker_functions = None
+
+
+def _init_worker(all_functions):
+    global _worker_functions
+    _worker_functions = all_functions
+
+
+def _calculate_rows_task(arg_rows_task):
+    rows_numbers, probabilities_matrix = arg_rows_task
+    start_time = time.perf_counter()
+    # the same matrix is calculated by all functions (e.g. Monte Carlo calculates interval with estimate once)
+    all_results = [one_function.evaluate(probabilities_matrix) for one_function in _worker_functions]
+    return rows_numbers, np.column_stack(all_results), time.perf_counter() - start_time
+
+
+def run_batch(arg_defined_graph, scenarios_file_path, results_file_path, arg_method, arg_source=None,
+              arg_target=None, processes_amount=None, rows_in_task=64, arg_budget=None, arg_cuts_budget=None,
+              arg_metrics=None):
+    """All rows of scenarios table -> rows of results table, returns amount of calculated rows
+
+    arg_metrics (RunMetrics) gets stages of method and stage "evaluation" (with reading and writing of tables).
+    """
+    start_time = time.perf_counter()
+    if arg_metrics is None:
+        arg_metrics = RunMetrics()
+    method_result_data = get_all_info_by_method(arg_defined_graph, arg_method, arg_source, arg_target,
+                                                arg_budget, arg_cuts_budget, arg_metrics=arg_metrics)
+    for stop_reason_key in ("paths_enumeration_stop_reason", "cuts_enumeration_stop_reason"):
+        if method_result_data.get(stop_reason_key) is not None:
+            logger.warning("Results are partial: %s", method_result_data[stop_reason_key])
+    all_functions = [one_function for one_function, _ in method_result_data["first_formula_functions"]]
+    for one_function in all_functions:
+        # rows are already spread over processes (functions of blocks and of reduced graph pass it to their
+        # exhaustive search)
+        if hasattr(one_function, "processes_amount"):
+            one_function.processes_amount = 1
+    logger.info("Formulas of %s are built in %.3f seconds", arg_method, time.perf_counter() - start_time)
+    result_columns = result_columns_by_method.get(arg_method, ["value"])
+    all_edges = list(arg_defined_graph.edges)
+    if processes_amount is None:
+        processes_amount = os.cpu_count() or 1
+
+    calculated_rows_amount = 0
+    with open(scenarios_file_path, newline="", encoding="utf-8") as scenarios_file, \
+            open(results_file_path, "w", newline="", encoding="utf-8") as results_file:
+        scenarios_reader = csv.reader(scenarios_file)
+        all_column_names = next(scenarios_reader, None)
+        if all_column_names is None:
+            raise ValueError(f"Table {scenarios_file_path} is empty")
+        edges_columns, copied_columns = get_edges_columns(all_column_names, all_edges)
+        # rows are kept only for columns which are copied to results
+        copied_values = {}
+
+        def iterate_table_rows():
+            for one_row_number, one_table_row in enumerate(scenarios_reader, start=2):
+                if one_table_row:  # empty lines are skipped
+                    copied_values[one_row_number] = [
+                        one_table_row[one_column_ind] if one_column_ind < len(one_table_row) else ""
+                        for one_column_ind in copied_columns]
+                    yield one_row_number, one_table_row
+
+        all_rows_tasks = iterate_rows_tasks(iterate_table_rows(), edges_columns, rows_in_task)
+        results_writer = csv.writer(results_file)
+        results_writer.writerow(["row"] + [all_column_names[one_column_ind] for one_column_ind in copied_columns]
+                                + result_columns + ["seconds"])
+
+        def write_task_results(rows_numbers, task_results, task_seconds):
+            nonlocal calculated_rows_amount
+            for one_row_number, one_row_results in zip(rows_numbers, task_results):
+                results_writer.writerow([one_row_number] + copied_values.pop(one_row_number, [])
+                                        + [repr(float(one_value)) for one_value in one_row_results]
+                                        + [f"{task_seconds / len(rows_numbers):.6g}"])
+            calculated_rows_amount += len(rows_numbers)
+
+        with arg_metrics.measure_stage("evaluation"):
+            if processes_amount > 1:
+                with ProcessPoolExecutor(max_workers=processes_amount, initializer=_init_worker,
+                                         initargs=(all_functions,)) as processes_pool:
+                    # Executor.map reads all tasks at once, so only several tasks for every process are
+                    # submitted, results are written in order of rows
+                    running_tasks = deque()
+                    for one_rows_task in all_rows_tasks:
+                        if len(running_tasks) >= processes_amount * tasks_in_flight_per_process:
+                            write_task_results(*running_tasks.popleft().result())
+                        running_tasks.append(processes_pool.submit(_calculate_rows_task, one_rows_task))
+                    while running_tasks:
+                        write_task_results(*running_tasks.popleft().result())
+            else:
+                _init_worker(all_functions)
+                for one_rows_task in all_rows_tasks:
+                    write_task_results(*_calculate_rows_task(one_rows_task))
+        arg_metrics.add_counter("evaluation", "evaluations", calculated_rows_amount * len(all_functions))
+    logger.info("%s rows are calculated in %.3f seconds", calculated_rows_amount, time.perf_counter() - start_time)
+    return calculated_rows_amount
+
+
+def get_arguments_parser():
+    arguments_parser = argparse.ArgumentParser(
+        prog="python -m functional_stability.batch_runner",
+        description="Functional stability for every row of table of edges probabilities")
+    arguments_parser.add_argument("graph_file", help=".graphml file of main window or edge list")
+    arguments_parser.add_argument("scenarios_file", help="CSV table, columns '1-2', '2-3', ... are edges")
+    arguments_parser.add_argument("results_file", help="CSV table of results")
+    arguments_parser.add_argument("--method", default="Binary decision diagram",
+                                  choices=all_methods_for_functional_stability)
+    arguments_parser.add_argument("--source", type=int, help="source node (from 1), first node by default")
+    arguments_parser.add_argument("--target", type=int, help="target node (from 1), last node by default")
+    arguments_parser.add_argument("--processes", type=int, default=None,
+                                  help="amount of processes (1 -> without pool), all processors by default")
+    arguments_parser.add_argument("--rows-in-task", type=int, default=64,
+                                  help="rows which are calculated by one vectorized call")
+    arguments_parser.add_argument("--max-paths", type=int, default=None, help="limit of simple paths")
+    arguments_parser.add_argument("--max-cuts", type=int, default=None, help="limit of minimal cuts")
+    arguments_parser.add_argument("--max-seconds", type=float, default=None,
+                                  help="limit of time for every enumeration (paths, cuts)")
+    arguments_parser.add_argument("--metrics-json", default=None,
+                                  help="JSON file with time, memory and counters of every stage")
+    arguments_parser.add_argument("--trace-memory", action="store_true",
+                                  help="peak memory of stages by tracemalloc (calculation is slower)")
+    arguments_parser.add_argument("--verbose", action="store_true")
+    return arguments_parser
+
+
+def main(arguments_list=None):
+    parsed_arguments = get_arguments_parser().parse_args(arguments_list)
+    logging.basicConfig(level=logging.DEBUG if parsed_arguments.verbose else logging.INFO,
+                        format="%(levelname)s: %(message)s")
+    try:
+        defined_graph = read_graph(parsed_arguments.graph_file)
+        arg_source = None if parsed_arguments.source is None else parsed_arguments.source - 1
+        arg_target = None if parsed_arguments.target is None else parsed_arguments.target - 1
+        for one_terminal in (arg_source, arg_target):
+            if one_terminal is not None and one_terminal not in defined_graph:
+                raise ValueError(f"There is no node {one_terminal + 1} in graph")
+        run_metrics = RunMetrics(trace_memory=parsed_arguments.trace_memory)
+        run_batch(defined_graph, parsed_arguments.scenarios_file, parsed_arguments.results_file,
+                  parsed_arguments.method, arg_source, arg_target, parsed_arguments.processes,
+                  max(1, parsed_arguments.rows_in_task),
+                  EnumerationBudget(max_paths_amount=parsed_arguments.max_paths,
+                                    max_seconds=parsed_arguments.max_seconds),
+                  EnumerationBudget(max_paths_amount=parsed_arguments.max_cuts,
+                                    max_seconds=parsed_arguments.max_seconds, items_name="cuts"),
+                  run_metrics)
+        run_metrics.finish()
+        if parsed_arguments.metrics_json is not None:
+            run_metrics.write_json(parsed_arguments.metrics_json)
+    except (OSError, ValueError) as batch_error:
+        logger.error("%s", batch_error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Exact functional stability by reduced ordered binary decision diagram (BDD) of s-t connectivity"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    get_uniform_probabilities_matrix,
+    return_like_input,
+)
+from functional_stability.paths_enumeration import CalculationCancelled
+from functional_stability.reliability_polynomial import ReliabilityPolynomial
+
+# ids of terminal nodes of diagram
+FALSE_NODE = 0
+TRUE_NODE = 1
+
+
+def get_bfs_edges_order(all_edges, arg_source):
+    """Edges in order of breadth-first search from source, so frontier of processed edges stays narrow"""
+    all_neighbours = {}
+    for one_edge in all_edges:
+        all_neighbours.setdefault(one_edge[0], []).append(one_edge)
+        all_neighbours.setdefault(one_edge[1], []).append(one_edge)
+    ordered_edges = []
+    added_edges = set()
+    visited_nodes = {arg_source}
+    nodes_queue = deque([arg_source])
+    while nodes_queue:
+        one_node = nodes_queue.popleft()
+        for one_edge in all_neighbours.get(one_node, []):
+            if one_edge not in added_edges:
+                added_edges.add(one_edge)
+                ordered_edges.append(one_edge)
+            another_node = one_edge[1] if one_edge[0] == one_node else one_edge[0]
+            if another_node not in visited_nodes:
+                visited_nodes.add(another_node)
+                nodes_queue.append(another_node)
+    # edges which can't be reached from source don't change connectivity, so they are not used by diagram
+    return ordered_edges
+
+
+def _normalize_labels(all_labels):
+    # (5, 2, 5, 7) -> (0, 1, 0, 2), so equal partitions of frontier nodes give equal states
+    renamed_labels = {}
+    return tuple(renamed_labels.setdefault(one_label, len(renamed_labels)) for one_label in all_labels)
+
+
+class ConnectivityDiagram:
+    """Reduced ordered BDD of function "source and target are connected by working edges"
+
+    Diagram is built by frontier-based search: states after processing of one edge are partitions of frontier
+    nodes into connected components, equal states are merged. After building, any probabilities are calculated
+    in time linear in size of diagram (all nodes of one level are calculated together by numpy).
+
+    Amount of states can grow exponentially with width of frontier, so building is checked after every level:
+    cancel of budget raises CalculationCancelled, limits of states, seconds or memory raise ValueError (part of
+    diagram gives no value at all, so there is no partial result).
+    """
+    # maximum amount of (diagram nodes × scenarios) values calculated at once
+    max_elements_in_chunk = 2 ** 22
+    # maximum amount of states of all levels during building (it's used without budget too)
+    max_states_amount = 2 ** 21
+    # approximate memory of one state during building (key of level, children, labels), measured by tracemalloc
+    estimated_bytes_per_state = 500
+
+    def __init__(self, all_edges, arg_source, arg_target, arg_budget=None):
+        self.all_edges = [tuple(sorted(one_edge)) for one_edge in all_edges]
+        self.edges_index = get_edges_index(self.all_edges)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        self.ordered_edges = get_bfs_edges_order(self.all_edges, arg_source)
+        # node id -> column of edge in probabilities matrix, low child (edge fails), high child (edge works)
+        self.nodes_columns = [-1, -1]
+        self.nodes_low = [FALSE_NODE, TRUE_NODE]
+        self.nodes_high = [FALSE_NODE, TRUE_NODE]
+        self.root_node = self._build_diagram(arg_budget)
+        self._prepare_levels()
+
+    def __len__(self):
+        return len(self.nodes_columns)
+
+    def _check_building(self, arg_budget, states_amount, start_time):
+        if arg_budget is not None and arg_budget.is_cancelled:
+            raise CalculationCancelled("Building of binary decision diagram is cancelled")
+        stop_reason = None
+        if states_amount >= self.max_states_amount:
+            stop_reason = f"limit of {self.max_states_amount} states of diagram is reached"
+        elif arg_budget is not None:
+            arg_budget.elapsed_seconds = time.perf_counter() - start_time
+            arg_budget.estimated_memory_bytes = states_amount * self.estimated_bytes_per_state
+            if arg_budget.max_seconds is not None and arg_budget.elapsed_seconds >= arg_budget.max_seconds:
+                stop_reason = f"limit of {arg_budget.max_seconds} seconds is reached"
+            elif arg_budget.max_memory_bytes is not None \
+                    and arg_budget.estimated_memory_bytes >= arg_budget.max_memory_bytes:
+                stop_reason = f"limit of {arg_budget.max_memory_bytes} bytes of memory is reached"
+        if stop_reason is not None:
+            if arg_budget is not None:
+                arg_budget.stop_reason = stop_reason
+            raise ValueError(f"Binary decision diagram isn't built: {stop_reason}")
+
+    def _build_diagram(self, arg_budget):
+        if self.source_node == self.target_node:
+            return TRUE_NODE
+        ordered_edges = self.ordered_edges
+        last_edge_ind = {}
+        for one_edge_ind, one_edge in enumerate(ordered_edges):
+            last_edge_ind[one_edge[0]] = one_edge_ind
+            last_edge_ind[one_edge[1]] = one_edge_ind
+        if self.target_node not in last_edge_ind:  # target is not reachable at all
+            return FALSE_NODE
+        terminals = (self.source_node, self.target_node)
+        # frontier (without terminals) before processing of edge with index i
+        all_frontiers = [[]]
+        entered_nodes = set()
+        for one_edge_ind, one_edge in enumerate(ordered_edges):
+            entered_nodes.update(one_edge)
+            all_frontiers.append(sorted(one_node for one_node in entered_nodes
+                                        if last_edge_ind[one_node] > one_edge_ind and one_node not in terminals))
+        # states of every level: state (labels of terminals + frontier nodes) -> (low child, high child),
+        # child is ("node", terminal id) or ("state", state of next level)
+        all_levels_states = [{(0, 1): None}]
+        # seconds of budget are added to seconds of previous stages (e.g. diagrams of other blocks)
+        start_time = time.perf_counter() - (arg_budget.elapsed_seconds if arg_budget is not None else 0.)
+        states_amount = 1
+        for one_edge_ind, (first_edge_node, second_edge_node) in enumerate(ordered_edges):
+            self._check_building(arg_budget, states_amount, start_time)
+            previous_nodes = list(terminals) + all_frontiers[one_edge_ind]
+            next_nodes = list(terminals) + all_frontiers[one_edge_ind + 1]
+            next_level_states = {}
+            for one_state in all_levels_states[one_edge_ind]:
+                nodes_labels = dict(zip(previous_nodes, one_state))
+                new_label = len(one_state)
+                for one_node in (first_edge_node, second_edge_node):
+                    if one_node not in nodes_labels:  # node is used by first time, it is alone
+                        nodes_labels[one_node] = new_label
+                        new_label += 1
+                children = []
+                for edge_works in (False, True):
+                    child_labels = nodes_labels
+                    if edge_works:
+                        old_label = nodes_labels[second_edge_node]
+                        kept_label = nodes_labels[first_edge_node]
+                        child_labels = {one_node: (kept_label if one_label == old_label else one_label)
+                                        for one_node, one_label in nodes_labels.items()}
+                    children.append(self._get_child(child_labels, next_nodes, one_edge_ind, last_edge_ind,
+                                                    next_level_states))
+                all_levels_states[one_edge_ind][one_state] = tuple(children)
+            all_levels_states.append(next_level_states)
+            states_amount += len(next_level_states)
+        self._check_building(arg_budget, states_amount, start_time)
+        # bottom-up reduction: equal children -> node is skipped, equal (edge, low, high) -> the same node
+        unique_nodes = {}
+        resolved_states = {}
+        for one_edge_ind in range(len(ordered_edges) - 1, -1, -1):
+            edge_column = self.edges_index[ordered_edges[one_edge_ind]]
+            level_resolved_states = {}
+            for one_state, (low_child, high_child) in all_levels_states[one_edge_ind].items():
+                low_node = low_child[1] if low_child[0] == "node" else resolved_states[low_child[1]]
+                high_node = high_child[1] if high_child[0] == "node" else resolved_states[high_child[1]]
+                if low_node == high_node:
+                    level_resolved_states[one_state] = low_node
+                    continue
+                node_key = (edge_column, low_node, high_node)
+                if node_key not in unique_nodes:
+                    unique_nodes[node_key] = len(self.nodes_columns)
+                    self.nodes_columns.append(edge_column)
+                    self.nodes_low.append(low_node)
+                    self.nodes_high.append(high_node)
+                level_resolved_states[one_state] = unique_nodes[node_key]
+            resolved_states = level_resolved_states
+        return resolved_states[(0, 1)] if ordered_edges else FALSE_NODE
+
+    def _get_child(self, child_labels, next_nodes, one_edge_ind, last_edge_ind, next_level_states):
+        source_label = child_labels[self.source_node]
+        target_label = child_labels[self.target_node]
+        if source_label == target_label:
+            return "node", TRUE_NODE
+        frontier_labels = {child_labels[one_node] for one_node in next_nodes[2:]}
+        # component of terminal is alive, if terminal itself or other node of component has unprocessed edges
+        for one_terminal, one_label in ((self.source_node, source_label), (self.target_node, target_label)):
+            if last_edge_ind.get(one_terminal, -1) <= one_edge_ind and one_label not in frontier_labels:
+                return "node", FALSE_NODE
+        child_state = _normalize_labels([child_labels.get(one_node, -1 - one_node_ind)
+                                         for one_node_ind, one_node in enumerate(next_nodes)])
+        next_level_states.setdefault(child_state, None)
+        return "state", child_state
+
+    def _prepare_levels(self):
+        # nodes were created bottom-up, so all nodes of one edge (level) are calculated after their children
+        self.nodes_columns = np.array(self.nodes_columns, dtype=np.int32)
+        self.nodes_low = np.array(self.nodes_low, dtype=np.int64)
+        self.nodes_high = np.array(self.nodes_high, dtype=np.int64)
+        self.all_levels = []
+        for one_edge in reversed(self.ordered_edges):
+            edge_column = self.edges_index[one_edge]
+            level_nodes = np.flatnonzero(self.nodes_columns == edge_column)
+            if len(level_nodes):
+                self.all_levels.append((edge_column, level_nodes))
+
+    def _get_nodes_values(self, chunk_probabilities):
+        # array (diagram nodes, N scenarios): P(function is true) from every node
+        nodes_values = np.empty((len(self), chunk_probabilities.shape[0]))
+        nodes_values[FALSE_NODE] = 0.
+        nodes_values[TRUE_NODE] = 1.
+        for edge_column, level_nodes in self.all_levels:
+            edge_probabilities = chunk_probabilities[:, edge_column]
+            # P(node) = p × P(high) + (1 - p) × P(low)
+            nodes_values[level_nodes] = (edge_probabilities * nodes_values[self.nodes_high[level_nodes]]
+                                         + (1 - edge_probabilities) * nodes_values[self.nodes_low[level_nodes]])
+        return nodes_values
+
+    def evaluate(self, probabilities_matrix):
+        scenarios_amount = probabilities_matrix.shape[0]
+        scenarios_in_chunk = max(1, self.max_elements_in_chunk // len(self))
+        all_results = np.empty(scenarios_amount)
+        for chunk_start in range(0, scenarios_amount, scenarios_in_chunk):
+            chunk_probabilities = probabilities_matrix[chunk_start:chunk_start + scenarios_in_chunk]
+            all_results[chunk_start:chunk_start + scenarios_in_chunk] = \
+                self._get_nodes_values(chunk_probabilities)[self.root_node]
+        return all_results
+
+    def get_birnbaum_importances(self, probabilities_matrix):
+        """Array (N scenarios, m edges) of ∂P/∂pₑ = P(pₑ = 1) - P(pₑ = 0) by two passes over diagram
+
+        Function is linear in every pₑ, so ∂P/∂pₑ = Σ P(node is reached) × (P(high) - P(low)) over nodes of edge:
+        values of nodes are found bottom-up (as by 'evaluate'), probabilities to reach nodes are found top-down.
+        """
+        scenarios_amount = probabilities_matrix.shape[0]
+        scenarios_in_chunk = max(1, self.max_elements_in_chunk // len(self))
+        all_importances = np.zeros((scenarios_amount, len(self.edges_index)))
+        for chunk_start in range(0, scenarios_amount, scenarios_in_chunk):
+            chunk_probabilities = probabilities_matrix[chunk_start:chunk_start + scenarios_in_chunk]
+            nodes_values = self._get_nodes_values(chunk_probabilities)
+            reached_probabilities = np.zeros_like(nodes_values)
+            reached_probabilities[self.root_node] = 1.
+            for edge_column, level_nodes in reversed(self.all_levels):
+                edge_probabilities = chunk_probabilities[:, edge_column]
+                level_reached = reached_probabilities[level_nodes]
+                # several nodes of level can have the same child, so their probabilities are added by np.add.at
+                np.add.at(reached_probabilities, self.nodes_high[level_nodes], edge_probabilities * level_reached)
+                np.add.at(reached_probabilities, self.nodes_low[level_nodes], (1 - edge_probabilities) * level_reached)
+                all_importances[chunk_start:chunk_start + scenarios_in_chunk, edge_column] = np.sum(
+                    level_reached * (nodes_values[self.nodes_high[level_nodes]]
+                                     - nodes_values[self.nodes_low[level_nodes]]), axis=0)
+        return all_importances
+
+    def get_reliability_polynomial(self):
+        """Exact coefficients of P(p) for p₁ = p₂ = ... = p by one bottom-up pass with integer polynomials
+
+        P(node) = p × P(high) + (1 - p) × P(low) = P(low) + p × (P(high) - P(low)), skipped edges give nothing
+        (p + q = 1), so coefficients of every node are found without orders of levels.
+        """
+        edges_amount = len(self.ordered_edges)
+        # array (diagram nodes, m + 1) of coefficients of p⁰ ... pᵐ, Python integers don't overflow
+        nodes_coefficients = np.zeros((len(self), edges_amount + 1), dtype=object)
+        nodes_coefficients[TRUE_NODE, 0] = 1
+        for _, level_nodes in self.all_levels:
+            low_coefficients = nodes_coefficients[self.nodes_low[level_nodes]]
+            high_coefficients = nodes_coefficients[self.nodes_high[level_nodes]]
+            nodes_coefficients[level_nodes] = low_coefficients
+            nodes_coefficients[level_nodes, 1:] += (high_coefficients - low_coefficients)[:, :-1]
+        return ReliabilityPolynomial.from_power_coefficients(nodes_coefficients[self.root_node])
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.01) -> array of numbers"""
+        calculated_values = self.evaluate(get_uniform_probabilities_matrix(arg_general_edge_values,
+                                                                           len(self.edges_index)))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
+
+
+# (edges, source, target) -> diagram, the least recently used diagram is removed first
+_connectivity_diagrams = OrderedDict()
+_connectivity_diagrams_lock = threading.Lock()
+max_cached_diagrams_amount = 32
+
+
+def get_connectivity_diagram(arg_defined_graph, arg_source, arg_target, arg_budget=None):
+    """Diagram is built once for graph (its edges), source and target, then it's taken from cache (budget limits
+    only building, so it isn't part of key)"""
+    all_edges = tuple(tuple(sorted(one_edge)) for one_edge in arg_defined_graph.edges)
+    diagram_key = (all_edges, arg_source, arg_target)
+    with _connectivity_diagrams_lock:
+        if diagram_key in _connectivity_diagrams:
+            _connectivity_diagrams.move_to_end(diagram_key)
+            return _connectivity_diagrams[diagram_key]
+    connectivity_diagram = ConnectivityDiagram(all_edges, arg_source, arg_target, arg_budget)
+    with _connectivity_diagrams_lock:
+        _connectivity_diagrams[diagram_key] = connectivity_diagram
+        while len(_connectivity_diagrams) > max_cached_diagrams_amount:
+            _connectivity_diagrams.popitem(last=False)
+    return connectivity_diagram
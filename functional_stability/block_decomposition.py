@@ -0,0 +1,182 @@
+"""Decomposition of two-terminal reliability by blocks (biconnected components) of graph
+
+If every path between source and target goes through articulation points c₁ ... cₖ, then
+P(s ~ t) = P(s ~ c₁) × P(c₁ ~ c₂) × ... × P(cₖ ~ t), where every probability is found inside its own block of path
+of block-cut tree (blocks have no common edges, so their states are independent, and edges of other blocks don't
+change result). Method is used for every block separately, so paths and cuts are never enumerated for whole graph:
+cost is exponential in size of the largest block, not in size of graph. Block with one edge (bridge) isn't
+calculated by method, its probability is the factor itself.
+"""
+import networkx as nx
+import numpy as np
+
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    get_uniform_probabilities_matrix,
+    return_like_input,
+)
+from functional_stability.reliability_polynomial import ReliabilityPolynomial
+
+
+class BlockDecomposition:
+    """Blocks of path of block-cut tree between source and target, in order from source to target"""
+
+    def __init__(self, all_edges, arg_source, arg_target):
+        self.all_edges = [tuple(one_edge) for one_edge in all_edges]
+        self.edges_index = get_edges_index(self.all_edges)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        # (entry node, exit node) of every block: entry of the first block is source, exit of the last block is
+        # target, other ends are articulation points
+        self.all_blocks_terminals = []
+        # edges of every block in order of edges of graph
+        self.all_blocks_edges = []
+        if arg_source != arg_target:
+            self._decompose()
+
+    def _decompose(self):
+        main_graph = nx.Graph(self.all_edges)
+        if self.source_node not in main_graph or self.target_node not in main_graph \
+                or not nx.has_path(main_graph, self.source_node, self.target_node):
+            return
+        articulation_points = set(nx.articulation_points(main_graph))
+        # block-cut tree: ("block", i) - ("node", c) for every articulation point c of block i
+        block_cut_tree = nx.Graph()
+        edges_blocks = {}
+        for block_ind, all_component_edges in enumerate(nx.biconnected_component_edges(main_graph)):
+            block_cut_tree.add_node(("block", block_ind))
+            for one_edge in all_component_edges:
+                edges_blocks[tuple(sorted(one_edge))] = block_ind
+                for one_node in one_edge:
+                    if one_node in articulation_points:
+                        block_cut_tree.add_edge(("block", block_ind), ("node", one_node))
+
+        def get_tree_node(one_node):
+            if one_node in articulation_points:
+                return "node", one_node
+            # node which isn't articulation point is inside one block only
+            return "block", edges_blocks[tuple(sorted(next(iter(main_graph.edges(one_node)))))]
+
+        tree_path = nx.shortest_path(block_cut_tree, get_tree_node(self.source_node),
+                                     get_tree_node(self.target_node))
+        all_path_blocks = {}
+        entry_node = self.source_node
+        for tree_ind, (node_kind, node_value) in enumerate(tree_path):
+            if node_kind == "node":
+                entry_node = node_value
+                continue
+            exit_node = tree_path[tree_ind + 1][1] if tree_ind + 1 < len(tree_path) else self.target_node
+            all_path_blocks[node_value] = len(self.all_blocks_terminals)
+            self.all_blocks_terminals.append((entry_node, exit_node))
+            self.all_blocks_edges.append([])
+        for one_edge in self.all_edges:
+            block_ind = edges_blocks.get(tuple(sorted(one_edge)))
+            if block_ind in all_path_blocks:
+                self.all_blocks_edges[all_path_blocks[block_ind]].append(one_edge)
+
+    def __len__(self):
+        return len(self.all_blocks_edges)
+
+    @property
+    def is_trivial(self):
+        # one block (or source and target aren't connected) -> method is used for whole graph, the same for path of
+        # bridges only (it's small for any method)
+        return len(self) < 2 or self.bridges_amount == len(self)
+
+    @property
+    def bridges_amount(self):
+        return sum(1 for all_block_edges in self.all_blocks_edges if len(all_block_edges) == 1)
+
+    def is_bridge(self, block_ind):
+        return len(self.all_blocks_edges[block_ind]) == 1
+
+    def get_block_graph(self, block_ind):
+        return nx.Graph(self.all_blocks_edges[block_ind])
+
+    def get_summary(self):
+        largest_block_size = max((len(all_block_edges) for all_block_edges in self.all_blocks_edges), default=0)
+        return (f"{len(self)} blocks ({self.bridges_amount} bridges), the largest block has {largest_block_size} "
+                f"of {len(self.all_edges)} edges")
+
+    def get_blocks_columns(self, all_blocks_edges_indexes):
+        """Columns of edges of graph for columns of every block function (None -> bridge, its only edge)"""
+        all_blocks_columns = []
+        for block_ind, block_edges_index in enumerate(all_blocks_edges_indexes):
+            if block_edges_index is None:
+                block_edges_index = get_edges_index(self.all_blocks_edges[block_ind])
+            block_columns = np.empty(len(block_edges_index), dtype=np.intp)
+            for one_edge, one_column in block_edges_index.items():
+                block_columns[one_column] = self.edges_index[tuple(sorted(one_edge))]
+            all_blocks_columns.append(block_columns)
+        return all_blocks_columns
+
+    def get_reliability_polynomial(self, all_blocks_polynomials):
+        """Polynomials of blocks (None -> bridge) -> polynomial of graph: Nᵢ of product is convolution of Nᵢ"""
+        product_polynomial = ReliabilityPolynomial([1])
+        for one_polynomial in all_blocks_polynomials:
+            product_polynomial *= ReliabilityPolynomial([0, 1]) if one_polynomial is None else one_polynomial
+        return product_polynomial
+
+
+class BlocksProductEvaluator:
+    """Function of graph as product of functions of blocks, which are calculated for their own columns of
+    probabilities (None instead of function -> bridge, factor is probability of its edge)"""
+
+    def __init__(self, all_block_evaluators, block_decomposition):
+        self.all_block_evaluators = all_block_evaluators
+        self.edges_index = block_decomposition.edges_index
+        self.all_blocks_columns = block_decomposition.get_blocks_columns(
+            [None if one_evaluator is None else one_evaluator.edges_index for one_evaluator in all_block_evaluators])
+
+    @property
+    def processes_amount(self):
+        # exhaustive search of blocks can use processes, it's set e.g. by batch runner, which has own processes
+        return max((one_evaluator.processes_amount for one_evaluator in self.all_block_evaluators
+                    if hasattr(one_evaluator, "processes_amount")), default=1)
+
+    @processes_amount.setter
+    def processes_amount(self, new_processes_amount):
+        for one_evaluator in self.all_block_evaluators:
+            if hasattr(one_evaluator, "processes_amount"):
+                one_evaluator.processes_amount = new_processes_amount
+
+    def evaluate(self, probabilities_matrix):
+        probabilities_matrix = np.asarray(probabilities_matrix, dtype=float)
+        calculated_values = np.ones(probabilities_matrix.shape[0])
+        for one_evaluator, block_columns in zip(self.all_block_evaluators, self.all_blocks_columns):
+            if one_evaluator is None:
+                calculated_values *= probabilities_matrix[:, block_columns[0]]
+            else:
+                calculated_values *= one_evaluator.evaluate(probabilities_matrix[:, block_columns])
+        return calculated_values
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.01) -> array of numbers"""
+        calculated_values = self.evaluate(get_uniform_probabilities_matrix(arg_general_edge_values,
+                                                                           len(self.edges_index)))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
+
+
+class BlocksUniformProduct:
+    """Product of functions of blocks for p₁ = p₂ = ... = p (None -> bridge, factor is p), e.g. for chart"""
+
+    def __init__(self, all_block_functions):
+        self.all_block_functions = all_block_functions
+
+    def __call__(self, arg_general_edge_values):
+        calculated_values = np.ones(np.shape(arg_general_edge_values))
+        for one_function in self.all_block_functions:
+            if one_function is None:
+                calculated_values = calculated_values * np.asarray(arg_general_edge_values, dtype=float)
+            else:
+                calculated_values = calculated_values * np.asarray(one_function(arg_general_edge_values))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values)
+        return calculated_values
@@ -0,0 +1,68 @@
+"""Streaming enumeration of minimal s-t edge cuts of undirected graph (without doubling of edges)"""
+from functional_stability.paths_enumeration import EnumerationBudget, iterate_with_budget
+
+
+def get_canonical_cut(one_cut):
+    # [(3, 2), (0, 1), (2, 3)] -> [(0, 1), (2, 3)]: the same undirected cut gives the same list
+    return sorted({tuple(sorted(one_edge)) for one_edge in one_cut})
+
+
+def get_side_cut(all_neighbours, source_side):
+    # edges between source side and other nodes
+    return get_canonical_cut((one_node, another_node) for one_node in source_side
+                             for another_node in all_neighbours[one_node] if another_node not in source_side)
+
+
+def is_connected_without(all_neighbours, source_side, required_nodes, arg_target):
+    """All required nodes are reachable from target in graph without nodes of source side"""
+    reachable_nodes = {arg_target}
+    nodes_stack = [arg_target]
+    while nodes_stack:
+        one_node = nodes_stack.pop()
+        for another_node in all_neighbours[one_node]:
+            if another_node not in reachable_nodes and another_node not in source_side:
+                reachable_nodes.add(another_node)
+                nodes_stack.append(another_node)
+    return required_nodes <= reachable_nodes
+
+
+def iterate_source_sides(all_neighbours, arg_source, arg_target, initial_excluded_nodes=frozenset()):
+    """Connected sides S of source, where other side (nodes of component without S) is connected too
+
+    Every such S gives exactly one minimal cut (edges between S and other side). S grows from source: next
+    neighbour of S is added to S or is excluded (it's on target side then). Branch is stopped if excluded
+    nodes and target can't be connected without S, so every not stopped branch gives at least one cut.
+    initial_excluded_nodes are on target side from the start (they must be connected with target by caller).
+    """
+    nodes_order = {one_node: one_node_ind for one_node_ind, one_node in enumerate(all_neighbours)}
+    branches_stack = [(frozenset([arg_source]), frozenset(initial_excluded_nodes))]
+    while branches_stack:
+        source_side, excluded_nodes = branches_stack.pop()
+        candidate_nodes = [another_node for one_node in source_side for another_node in all_neighbours[one_node]
+                           if another_node not in source_side and another_node not in excluded_nodes
+                           and another_node != arg_target]
+        if not candidate_nodes:
+            yield source_side
+            continue
+        chosen_node = min(candidate_nodes, key=nodes_order.get)
+        excluded_branch_nodes = excluded_nodes | {chosen_node}
+        if is_connected_without(all_neighbours, source_side, excluded_branch_nodes, arg_target):
+            branches_stack.append((source_side, excluded_branch_nodes))
+        included_branch_side = source_side | {chosen_node}
+        if is_connected_without(all_neighbours, included_branch_side, excluded_nodes, arg_target):
+            branches_stack.append((included_branch_side, excluded_nodes))
+
+
+def iterate_minimal_cuts(arg_defined_graph, arg_source, arg_target, arg_budget=None):
+    """Generator of minimal s-t edge cuts (canonical lists of sorted edges), every cut is given once"""
+    if arg_budget is None:
+        arg_budget = EnumerationBudget(items_name="cuts")
+    all_neighbours = {one_node: list(arg_defined_graph.neighbors(one_node)) for one_node in arg_defined_graph.nodes}
+    if arg_source == arg_target or not is_connected_without(all_neighbours, set(), {arg_source}, arg_target):
+        return  # there is nothing to cut
+
+    def iterate_cuts():
+        for source_side in iterate_source_sides(all_neighbours, arg_source, arg_target):
+            yield get_side_cut(all_neighbours, source_side)
+
+    yield from iterate_with_budget(iterate_cuts(), arg_budget, len)
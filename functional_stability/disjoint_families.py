@@ -0,0 +1,156 @@
+"""Families of pairwise edge-disjoint cuts (or paths) with maximum weight, found on conflict graph of bitmasks
+
+Two members (cuts or paths) conflict, if they have common edge. Family of disjoint members is independent set
+of conflict graph, family with maximum sum of weights is found by branch and bound. All members with common
+edge are clique of conflict graph, so candidates are covered by such cliques and every clique can add only
+its heaviest candidate: it's upper bound of branch, which is calculated by bitwise operations only.
+"""
+import math
+import time
+
+import numpy as np
+
+from functional_stability.edge_bitmasks import EdgeBitmaskIndex, get_disjoint_rows, iterate_bits
+
+# equal probabilities of edges, for which families are made optimal (every level gives its own family): functions
+# are compiled once and then calculated for any probabilities (e.g. whole chart of p₁ = p₂ = ... = p), so one
+# family for one scenario isn't enough; probabilities of scenario (if they are known) give one more family
+default_probabilities_levels = (0.1, 0.3, 0.5, 0.7, 0.9)
+# maximum probability of member (cut fails or path works), so weight of member stays finite for p = 0 or p = 1
+max_member_probability = 1 - 1e-12
+
+
+def get_cut_weight(one_cut_size, arg_general_edge_value):
+    # family of cuts gives upper bound Π(1 - qᵏ), so every cut decreases it by factor (1 - qᵏ) -> -log(1 - qᵏ)
+    return -math.log1p(-(1 - arg_general_edge_value) ** one_cut_size)
+
+
+def get_path_weight(one_path_size, arg_general_edge_value):
+    # family of paths gives lower bound 1 - Π(1 - pᵏ), every path decreases Π by factor (1 - pᵏ) -> -log(1 - pᵏ)
+    return -math.log1p(-arg_general_edge_value ** one_path_size)
+
+
+def get_scenario_cut_weight(one_cut, arg_edges_probabilities):
+    # the same weight for own probabilities of edges: cut fails with probability Π qₑ
+    cut_probability = math.prod(1 - arg_edges_probabilities[tuple(sorted(one_edge))] for one_edge in one_cut)
+    return -math.log1p(-min(cut_probability, max_member_probability))
+
+
+def get_scenario_path_weight(all_edges_in_path, arg_edges_probabilities):
+    # the same weight for own probabilities of edges: path works with probability Π pₑ
+    path_probability = math.prod(arg_edges_probabilities[tuple(sorted(one_edge))] for one_edge in all_edges_in_path)
+    return -math.log1p(-min(path_probability, max_member_probability))
+
+
+class DisjointFamiliesSearch:
+    """Maximum-weight families of pairwise edge-disjoint members (cuts or paths) with limited search"""
+    # maximum amount of nodes of search tree and seconds for one family, then the best found family is used
+    max_search_nodes = 20000
+    max_seconds = 1.
+
+    def __init__(self, all_members, all_edges):
+        self.all_members = list(all_members)
+        self.edge_bitmask_index = EdgeBitmaskIndex(all_edges)
+        self.members_bitmasks = [self.edge_bitmask_index.get_bitmask(one_member) for one_member in self.all_members]
+        # edge -> bitmask of members with this edge (clique of conflict graph)
+        edges_members = [0] * len(self.edge_bitmask_index)
+        for one_member_ind, one_member_bitmask in enumerate(self.members_bitmasks):
+            for one_edge_ind in iterate_bits(one_member_bitmask):
+                edges_members[one_edge_ind] |= 1 << one_member_ind
+        self.edges_members = [one_edge_members for one_edge_members in edges_members if one_edge_members]
+        self.edges_members_by_index = edges_members
+        # member -> bitmask of members with common edge (including member itself), it's found when it's needed
+        self.members_conflicts = {}
+        self.search_nodes_amount = 0
+        self.search_is_complete = True
+
+    def _get_member_conflicts(self, one_member_ind):
+        if one_member_ind not in self.members_conflicts:
+            one_member_conflicts = 0
+            for one_edge_ind in iterate_bits(self.members_bitmasks[one_member_ind]):
+                one_member_conflicts |= self.edges_members_by_index[one_edge_ind]
+            self.members_conflicts[one_member_ind] = one_member_conflicts
+        return self.members_conflicts[one_member_ind]
+
+    def _get_weight_bound(self, candidates_bitmask, all_weights):
+        # candidates are split by cliques of common edges, every clique gives its heaviest candidate
+        weight_bound = 0.
+        for one_edge_members in self.edges_members:
+            clique_candidates = candidates_bitmask & one_edge_members
+            if clique_candidates:
+                weight_bound += max(all_weights[one_member_ind] for one_member_ind in iterate_bits(clique_candidates))
+                candidates_bitmask &= ~clique_candidates
+                if not candidates_bitmask:
+                    break
+        return weight_bound
+
+    def _get_greedy_family(self, candidates_bitmask, all_weights):
+        family_bitmask = 0
+        for one_member_ind in sorted(iterate_bits(candidates_bitmask), key=lambda ind: -all_weights[ind]):
+            if candidates_bitmask >> one_member_ind & 1:
+                family_bitmask |= 1 << one_member_ind
+                candidates_bitmask &= ~self._get_member_conflicts(one_member_ind)
+        return family_bitmask
+
+    def get_best_family(self, all_weights, candidates_bitmask=None):
+        """Bitmask of members of family with maximum sum of weights (the best found, if search is stopped)"""
+        if candidates_bitmask is None:
+            candidates_bitmask = (1 << len(self.all_members)) - 1
+        best_family = self._get_greedy_family(candidates_bitmask, all_weights)
+        best_weight = sum(all_weights[one_member_ind] for one_member_ind in iterate_bits(best_family))
+        start_time = time.perf_counter()
+        search_nodes_amount = 0
+        # branch: (family, its weight, candidates which are disjoint with whole family)
+        branches_stack = [(0, 0., candidates_bitmask)]
+        while branches_stack:
+            search_nodes_amount += 1
+            if search_nodes_amount > self.max_search_nodes or time.perf_counter() - start_time > self.max_seconds:
+                self.search_is_complete = False
+                break
+            family_bitmask, family_weight, candidates_bitmask = branches_stack.pop()
+            if not candidates_bitmask:
+                if family_weight > best_weight:
+                    best_family, best_weight = family_bitmask, family_weight
+                continue
+            if family_weight + self._get_weight_bound(candidates_bitmask, all_weights) <= best_weight:
+                continue
+            chosen_member_ind = max(iterate_bits(candidates_bitmask), key=lambda ind: all_weights[ind])
+            # branch without chosen member is checked after branch with it
+            branches_stack.append((family_bitmask, family_weight, candidates_bitmask & ~(1 << chosen_member_ind)))
+            branches_stack.append((family_bitmask | (1 << chosen_member_ind),
+                                   family_weight + all_weights[chosen_member_ind],
+                                   candidates_bitmask & ~self._get_member_conflicts(chosen_member_ind)))
+        self.search_nodes_amount += search_nodes_amount
+        return best_family
+
+    def get_families(self, all_weights_variants, cover_all_members=True):
+        """Lists of members: the best family for every variant of weights, then (if cover_all_members) families
+        for members which are not used yet (every member is inside at least one family)"""
+        all_families = []
+        for all_weights in all_weights_variants:
+            one_family = self.get_best_family(all_weights)
+            if one_family and one_family not in all_families:
+                all_families.append(one_family)
+        all_families = [list(iterate_bits(one_family)) for one_family in all_families]
+        if cover_all_members and all_weights_variants:
+            # members which are not used yet go (from the heaviest) to every disjoint with them extra family,
+            # or start new family; unions of edges of extra families are packed rows, checked all at once
+            used_members = {one_member_ind for one_family in all_families for one_member_ind in one_family}
+            all_weights = np.max(all_weights_variants, axis=0)
+            extra_families = []
+            extra_families_rows = np.zeros((len(self.all_members), self.edge_bitmask_index.words_amount),
+                                           dtype=np.uint64)
+            for one_member_ind in np.argsort(-all_weights, kind="stable").tolist():
+                if one_member_ind in used_members:
+                    continue
+                one_packed_row = self.edge_bitmask_index.get_packed_row(self.members_bitmasks[one_member_ind])
+                disjoint_families = np.flatnonzero(get_disjoint_rows(extra_families_rows[:len(extra_families)],
+                                                                     one_packed_row))
+                if not len(disjoint_families):
+                    disjoint_families = [len(extra_families)]
+                    extra_families.append([])
+                for one_family_ind in disjoint_families:
+                    extra_families[one_family_ind].append(one_member_ind)
+                extra_families_rows[disjoint_families] |= one_packed_row
+            all_families.extend(extra_families)
+        return [[self.all_members[one_member_ind] for one_member_ind in one_family] for one_family in all_families]
@@ -0,0 +1,50 @@
+"""Paths and cuts as bitmasks over fixed index of edges (bit i -> edge i is inside path or cut)
+
+Python integer is used for one edge set, so intersection and disjointness checks are single bitwise operations
+(equal sets in any order of edges have equal bitmasks); many edge sets are packed into rows of uint64 words, so one
+set is checked against all rows at once.
+"""
+import numpy as np
+
+
+class EdgeBitmaskIndex:
+    """Conversion of edge groups ([(0, 1), (1, 2)], direction of edge is not important) to bitmasks and packed rows"""
+
+    def __init__(self, all_edges):
+        self.all_edges = [tuple(sorted(one_edge)) for one_edge in all_edges]
+        # the same columns as get_edges_index (evaluators import this module, so it isn't imported from them)
+        self.edges_index = {one_edge: one_edge_ind for one_edge_ind, one_edge in enumerate(self.all_edges)}
+        # amount of uint64 words in packed row
+        self.words_amount = max(1, (len(self.all_edges) + 63) // 64)
+
+    def __len__(self):
+        return len(self.all_edges)
+
+    def get_bitmask(self, one_edge_group):
+        one_bitmask = 0
+        for one_edge in one_edge_group:
+            one_bitmask |= 1 << self.edges_index[tuple(sorted(one_edge))]
+        return one_bitmask
+
+    def get_packed_row(self, one_bitmask):
+        return np.array([(one_bitmask >> (64 * one_word_ind)) & 0xFFFFFFFFFFFFFFFF
+                         for one_word_ind in range(self.words_amount)], dtype=np.uint64)
+
+
+def iterate_bits(one_bitmask):
+    # indexes of set bits, from lowest
+    if one_bitmask.bit_length() > 64:
+        # every step of loop below copies long integer, so bits of long bitmask are found by numpy at once
+        bitmask_bytes = one_bitmask.to_bytes((one_bitmask.bit_length() + 7) // 8, "little")
+        yield from np.flatnonzero(np.unpackbits(np.frombuffer(bitmask_bytes, dtype=np.uint8),
+                                                bitorder="little")).tolist()
+        return
+    while one_bitmask:
+        lowest_bit = one_bitmask & -one_bitmask
+        yield lowest_bit.bit_length() - 1
+        one_bitmask ^= lowest_bit
+
+
+def get_disjoint_rows(packed_rows, packed_row):
+    """Boolean array (rows,): row of packed edge sets has no common edge with given packed edge set"""
+    return ~np.any(packed_rows & packed_row, axis=1)
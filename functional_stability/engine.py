@@ -0,0 +1,880 @@
+"""Calculation of functional stability (two-terminal reliability) of graph without any Qt widgets"""
+import logging
+
+import networkx as nx
+import igraph
+
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    PathsFormulaEvaluator,
+    PathGroupsEvaluator,
+    CutGroupsEvaluator,
+    BoundsEvaluator,
+    UniformPathsFormula,
+)
+from functional_stability.binary_decision_diagram import get_connectivity_diagram
+from functional_stability.block_decomposition import BlockDecomposition, BlocksProductEvaluator, BlocksUniformProduct
+from functional_stability.cuts_enumeration import get_canonical_cut, iterate_minimal_cuts
+from functional_stability.disjoint_families import (
+    DisjointFamiliesSearch,
+    default_probabilities_levels,
+    get_cut_weight,
+    get_path_weight,
+    get_scenario_cut_weight,
+    get_scenario_path_weight,
+)
+from functional_stability.exhaustive_search import ExhaustiveSearchEvaluator
+from functional_stability.formula_text import FormulaText, MappedTerms
+from functional_stability.gomory_hu import get_all_pairs_minimum_cuts
+from functional_stability.graph_reduction import GraphReduction, ReducedGraphEvaluator
+from functional_stability.instrumentation import RunMetrics
+from functional_stability.monte_carlo import MonteCarloEvaluator
+from functional_stability.path_set import PathGroups, PathSet
+from functional_stability.paths_enumeration import EnumerationBudget, iterate_simple_paths, iterate_with_budget
+from functional_stability.reliability_polynomial import ReliabilityPolynomial
+from functional_stability.results_cache import get_results_key
+
+logger = logging.getLogger(__name__)
+
+# amount of first found simple paths, among which families of disjoint paths are searched by "Litvak-Ushakov"
+# (search is limited, so it never takes most of time of method)
+max_paths_in_families_search = 1000
+
+all_methods_for_functional_stability = [
+    "Simple paths",
+    "Esary-Proshan",
+    "Litvak-Ushakov",
+    "Exhaustive search",  # another name: "brute-force search", exact value (ground truth)
+    "Binary decision diagram",  # exact value
+    "Monte Carlo",  # estimate with confidence interval, for graphs of any size
+]
+# methods of paths and cuts use reduced graph (series, parallel... edges are merged before enumeration),
+# exact methods and Monte Carlo use graph as it is (they give reliability polynomial or check other methods)
+methods_with_graph_reduction = ["Simple paths", "Esary-Proshan", "Litvak-Ushakov"]
+# methods which are used for every block of graph separately (product of exact values or of bounds of blocks is
+# exact value or bound of graph), product of Monte Carlo estimates has no such confidence interval
+methods_with_block_decomposition = ["Simple paths", "Esary-Proshan", "Litvak-Ushakov", "Exhaustive search",
+                                    "Binary decision diagram"]
+# methods which choose families of disjoint paths and cuts by probabilities of edges (of scenario, if it's given)
+methods_with_disjoint_families = ["Litvak-Ushakov"]
+
+
+def get_superscript_number(arg_integer):
+    subscript_numbers = "⁰¹²³⁴⁵⁶⁷⁸⁹"
+    return "".join([subscript_numbers[int(one_digit_str)] for one_digit_str in str(arg_integer)])
+
+
+def get_subscript_number(arg_integer):
+    subscript_numbers = "₀₁₂₃₄₅₆₇₈₉"
+    return "".join([subscript_numbers[int(one_digit_str)] for one_digit_str in str(arg_integer)])
+
+
+def get_edge_probability_name(arg_edge, arg_letter="p"):
+    # (0, 1) -> p₁₋₂, nodes are shown to user starting from 1
+    return arg_letter + get_subscript_number(arg_edge[0] + 1) + "₋" + get_subscript_number(arg_edge[1] + 1)
+
+
+def get_terminals_probability_name(arg_source, arg_target):
+    return f"P{get_subscript_number(arg_source + 1)}₋{get_subscript_number(arg_target + 1)}"
+
+
+def get_default_terminals(arg_defined_graph):
+    # first and last nodes of graph are used as source and target
+    all_existing_nodes = list(arg_defined_graph.nodes)
+    return all_existing_nodes[0], all_existing_nodes[-1]
+
+
+def get_minimum_cuts(arg_main_graph, arg_source, arg_target, selected_variant_of_search):
+    all_minimum_cuts = []
+    if selected_variant_of_search in [1, 2]:
+        # minimum cuts of all pairs of nodes by one Gomory-Hu tree (n - 1 max-flow calculations):
+        # variant 1 -> minimum cut of every pair of nodes, variant 2 -> only cuts of global minimum size
+        all_pairs_minimum_cuts = get_all_pairs_minimum_cuts(arg_main_graph)
+        all_minimum_cuts = all_pairs_minimum_cuts.get_all_minimum_cuts(
+            only_global_minimum=selected_variant_of_search == 2)
+    elif selected_variant_of_search in [3, 4]:
+        # using Igraph function
+        # 'all_st_cuts' / 'all_st_mincuts'
+        # to find
+        # all possible / only minimum
+        # cuts
+        all_existing_edges = list(arg_main_graph.edges)
+        all_directed_graph_edges = []
+        for one_edge in all_existing_edges:
+            all_directed_graph_edges.extend([one_edge, tuple(reversed(one_edge))])
+        all_found_cuts = []
+        igraph_created_graph = igraph.Graph(edges=all_directed_graph_edges, directed=True)
+        all_cuts_objects = []
+        if selected_variant_of_search == 3:
+            all_cuts_objects = igraph_created_graph.all_st_cuts(source=arg_source, target=arg_target)
+        elif selected_variant_of_search == 4:
+            all_cuts_objects = igraph_created_graph.all_st_mincuts(source=arg_source, target=arg_target)
+        found_cuts_keys = set()
+        for one_edge_group in [found_cut.cut for found_cut in all_cuts_objects]:
+            # (u, v) and (v, u) are the same undirected edge, so the same cut can be found twice
+            one_found_cut = get_canonical_cut([all_directed_graph_edges[one_edge_id] for one_edge_id in one_edge_group])
+            if tuple(one_found_cut) not in found_cuts_keys:
+                found_cuts_keys.add(tuple(one_found_cut))
+                all_found_cuts.append(one_found_cut)
+        all_minimum_cuts = all_found_cuts.copy()
+    elif selected_variant_of_search == 5:
+        # all minimal s-t cuts of undirected graph by own enumerator (without doubling of edges)
+        all_minimum_cuts = list(iterate_minimal_cuts(arg_main_graph, arg_source, arg_target))
+    return all_minimum_cuts
+
+
+def can_use_paths_and_cuts(arg_defined_graph, arg_source, arg_target):
+    """Kept paths and cuts (IncrementalPathsAndCuts) are used only for graph, which is given to method as it is:
+    reduction and block decomposition change nothing (otherwise methods use other graphs, so editor doesn't keep
+    paths and cuts, they would be updated after every edit for nothing)"""
+    all_edges = list(arg_defined_graph.edges)
+    return arg_source == arg_target or (GraphReduction(all_edges, arg_source, arg_target).is_trivial
+                                        and BlockDecomposition(all_edges, arg_source, arg_target).is_trivial)
+
+
+def _iterate_simple_paths(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts, arg_metrics):
+    # paths which are kept after edits of graph are used instead of enumeration, if they are for the same graph
+    all_kept_paths = None
+    with arg_metrics.measure_stage("paths enumeration"):
+        if arg_paths_and_cuts is not None and arg_paths_and_cuts.matches(arg_defined_graph, first_node, last_node):
+            all_kept_paths = arg_paths_and_cuts.get_paths()
+    if all_kept_paths is None:
+        all_found_paths = iterate_simple_paths(arg_defined_graph, first_node, last_node, arg_budget)
+    else:
+        if arg_budget.max_path_length is not None:
+            all_kept_paths = [one_path for one_path in all_kept_paths
+                              if len(one_path) - 1 <= arg_budget.max_path_length]
+        all_found_paths = iterate_with_budget(all_kept_paths, arg_budget, lambda one_path: len(one_path) - 1)
+    return arg_metrics.iterate_stage("paths enumeration", all_found_paths, "paths")
+
+
+def _iterate_minimal_cuts(arg_defined_graph, first_node, last_node, arg_cuts_budget, arg_paths_and_cuts, arg_metrics):
+    all_kept_cuts = None
+    with arg_metrics.measure_stage("cuts enumeration"):
+        if arg_paths_and_cuts is not None and arg_paths_and_cuts.matches(arg_defined_graph, first_node, last_node):
+            all_kept_cuts = arg_paths_and_cuts.get_cuts()
+    if all_kept_cuts is None:
+        all_found_cuts = iterate_minimal_cuts(arg_defined_graph, first_node, last_node, arg_cuts_budget)
+    else:
+        all_found_cuts = iterate_with_budget(all_kept_cuts, arg_cuts_budget, len)
+    return arg_metrics.iterate_stage("cuts enumeration", all_found_cuts, "cuts")
+
+
+def _get_path_product(all_edges_in_path, arg_letter="p"):
+    # [(0, 1), (1, 3)] -> p₁₋₂×p₂₋₄
+    return "×".join(get_edge_probability_name(one_edge, arg_letter) for one_edge in all_edges_in_path)
+
+
+def _get_path_term(all_edges_in_path):
+    # term of 1 - Π(1 - Π p): (1 - p₁₋₂×p₂₋₄)
+    return f"(1 - {_get_path_product(all_edges_in_path)})"
+
+
+def _get_path_set(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts, arg_metrics):
+    """All found simple paths in PathSet (flat array of edge ids), lists of nodes are not kept"""
+    path_set = PathSet(list(arg_defined_graph.edges))
+    all_found_paths = _iterate_simple_paths(arg_defined_graph, first_node, last_node, arg_budget,
+                                            arg_paths_and_cuts, arg_metrics)
+    with arg_metrics.measure_stage("paths storage"):
+        for one_path in all_found_paths:
+            path_set.add_path(one_path)
+    arg_metrics.add_counter("paths storage", "bytes", path_set.nbytes)
+    return path_set
+
+
+def _get_all_paths_formula(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts, arg_metrics):
+    """Compiled 1 - Π(1 - Π p) over all simple paths and PathSet of these paths (formula texts are made from it)"""
+    path_set = _get_path_set(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts, arg_metrics)
+    # (1 - p₀₋₁×p₁₋₂) (1 - p₀₋₂)... is compiled once, then it's calculated for {(0, 1): 0.5, ...} or for
+    # matrix (N scenarios × m edges) in one call
+    with arg_metrics.measure_stage("compilation"):
+        paths_formula_func = PathsFormulaEvaluator.from_path_set(path_set)
+    return paths_formula_func, path_set
+
+
+def _get_simple_paths_info(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts, arg_metrics):
+    all_result_data = {}
+    first_formula_func, path_set = _get_all_paths_formula(arg_defined_graph, first_node, last_node, arg_budget,
+                                                          arg_paths_and_cuts, arg_metrics)
+    dict_for_second_formula = path_set.get_amounts_by_length()
+    logger.debug("Simple paths by amount of edges: %s", dict_for_second_formula)
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    first_formula = FormulaText()
+    # text of every path is made only when it's shown
+    first_formula.add_line(f"{terminals_name} = 1 - ", MappedTerms(path_set, _get_path_term))
+    second_formula = FormulaText()
+    second_formula.add_line(f"{terminals_name} = 1 - ", [
+        f"(1 - p{get_superscript_number(the_key)})"
+        f"{get_superscript_number(dict_for_second_formula[the_key])}"
+        for the_key in sorted(dict_for_second_formula.keys())
+    ])
+
+    # if p₀₋₁ = p₁₋₂ = ... = pₘ₋ ₙ = p, only amounts of paths with equal amounts of edges are used
+    second_formula_func = UniformPathsFormula(dict_for_second_formula)
+
+    all_result_data["paths_amount"] = arg_budget.found_amount
+    all_result_data["path_set"] = path_set
+    all_result_data["first_formula"] = first_formula
+    all_result_data["second_formula"] = second_formula
+    all_result_data["first_formula_functions"] = [(first_formula_func, f"{terminals_name} ")]
+    all_result_data["second_formula_functions"] = [second_formula_func]
+    all_result_data["importance_functions"] = [(first_formula_func, "Formula")]
+    return all_result_data
+
+
+def _get_disjoint_minimum_cuts(all_minimum_cuts, all_edges, arg_edges_probabilities):
+    # families of disjoint cuts with maximum weight (the tightest upper bound) for probabilities of scenario and
+    # for several equal 'p', then every cut which is not used yet gets its own family
+    all_weights_variants = [
+        [get_cut_weight(len(one_minimum_cut), one_probability) for one_minimum_cut in all_minimum_cuts]
+        for one_probability in default_probabilities_levels
+    ]
+    if arg_edges_probabilities is not None:
+        all_weights_variants.insert(0, [get_scenario_cut_weight(one_minimum_cut, arg_edges_probabilities)
+                                        for one_minimum_cut in all_minimum_cuts])
+    disjoint_families_search = DisjointFamiliesSearch(all_minimum_cuts, all_edges)
+    disjoint_minimum_cuts = disjoint_families_search.get_families(all_weights_variants)
+    if not disjoint_families_search.search_is_complete:
+        logger.debug("Search of disjoint cuts is stopped after %s nodes", disjoint_families_search.search_nodes_amount)
+    return disjoint_minimum_cuts
+
+
+def _get_paths_group_term(all_edges_in_group):
+    # 1 - (1 - p₁₋₂×p₂₋₅)(1 - p₁₋₅) or p₁₋₂×p₂₋₅ for group with one path
+    if len(all_edges_in_group) > 1:
+        return "1 - " + "".join(_get_path_term(all_edges_in_path) for all_edges_in_path in all_edges_in_group)
+    return _get_path_product(all_edges_in_group[0])
+
+
+def _get_paths_group_uniform_term(all_edges_in_group):
+    # 1 - (1 - p²)(1 - p) or p² for group with one path
+    if len(all_edges_in_group) > 1:
+        return "1 - " + "".join(f"(1 - p{get_superscript_number(len(all_edges_in_path))})"
+                                for all_edges_in_path in all_edges_in_group)
+    return "p" + get_superscript_number(len(all_edges_in_group[0]))
+
+
+def _get_litvak_ushakov_info(arg_defined_graph, first_node, last_node, arg_budget, arg_cuts_budget,
+                             arg_paths_and_cuts, arg_metrics, arg_edges_probabilities):
+    all_result_data = {}
+    use_disjoint = (True, True)  # True, False
+    all_minimum_cuts = list(_iterate_minimal_cuts(arg_defined_graph, first_node, last_node, arg_cuts_budget,
+                                                  arg_paths_and_cuts, arg_metrics))
+    dict_for_first_formula2 = {}  # minimum cuts info and formulas (including disjoint cuts)
+    with arg_metrics.measure_stage("grouping"):
+        disjoint_paths = list(nx.edge_disjoint_paths(arg_defined_graph, first_node, last_node))
+    if not use_disjoint[0]:
+        disjoint_paths = []
+    disjoint_paths_families = []  # families of disjoint paths with maximum weight (besides 'disjoint_paths')
+
+    # group of disjoint paths (by networkx) goes first, then first found paths are kept for search of families
+    # of disjoint paths with maximum weight, every other path is a group with one path right away;
+    # groups are indices of paths of PathSet, the same path is kept once
+    path_set = PathSet(list(arg_defined_graph.edges))
+    path_groups = PathGroups(path_set)
+    disjoint_paths_indices = {tuple(one_path): path_set.add_path(one_path) for one_path in disjoint_paths}
+    if disjoint_paths_indices:
+        path_groups.add_group(disjoint_paths_indices.values())
+    paths_for_families = []  # indices of paths
+    all_found_paths = _iterate_simple_paths(arg_defined_graph, first_node, last_node, arg_budget,
+                                            arg_paths_and_cuts, arg_metrics)
+    with arg_metrics.measure_stage("paths storage"):
+        for one_path in all_found_paths:
+            one_path_ind = disjoint_paths_indices.get(tuple(one_path))
+            if one_path_ind is None:
+                one_path_ind = path_set.add_path(one_path)
+            if len(paths_for_families) < max_paths_in_families_search:
+                paths_for_families.append(one_path_ind)
+            else:
+                path_groups.add_group([one_path_ind])
+    arg_metrics.add_counter("paths storage", "bytes", path_set.nbytes)
+    with arg_metrics.measure_stage("grouping"):
+        paths_for_families_edges = [path_set[one_path_ind] for one_path_ind in paths_for_families]
+        disjoint_families_search = DisjointFamiliesSearch(paths_for_families_edges, list(arg_defined_graph.edges))
+        all_weights_variants = [
+            [get_path_weight(len(one_path_edges), one_probability) for one_path_edges in paths_for_families_edges]
+            for one_probability in default_probabilities_levels
+        ]
+        if arg_edges_probabilities is not None:
+            all_weights_variants.insert(0, [get_scenario_path_weight(one_path_edges, arg_edges_probabilities)
+                                            for one_path_edges in paths_for_families_edges])
+        all_paths_families = disjoint_families_search.get_families(all_weights_variants)
+        families_paths_indices = {tuple(one_path_edges): one_path_ind for one_path_edges, one_path_ind
+                                  in zip(paths_for_families_edges, paths_for_families)}
+        disjoint_paths_group = [path_set[one_path_ind] for one_path_ind in disjoint_paths_indices.values()]
+        for one_paths_family in all_paths_families:
+            if sorted(one_paths_family) != sorted(disjoint_paths_group):
+                disjoint_paths_families.append(one_paths_family)
+                path_groups.add_group([families_paths_indices[tuple(one_path_edges)]
+                                       for one_path_edges in one_paths_family])
+    if not disjoint_families_search.search_is_complete:
+        logger.debug("Search of disjoint paths is stopped after %s nodes", disjoint_families_search.search_nodes_amount)
+    arg_metrics.add_counter("grouping", "paths groups", len(path_groups))
+
+    # the same path can be inside several families, so it's kept once by compiled function
+    with arg_metrics.measure_stage("compilation"):
+        lower_bound_evaluator = PathGroupsEvaluator.from_matrices(path_set.edges_index, path_set.get_matrix(),
+                                                                  path_groups.get_matrix())
+    with arg_metrics.measure_stage("grouping"):
+        disjoint_minimum_cuts = _get_disjoint_minimum_cuts(all_minimum_cuts, list(arg_defined_graph.edges),
+                                                           arg_edges_probabilities)
+    arg_metrics.add_counter("grouping", "cuts groups", len(disjoint_minimum_cuts))
+    if not use_disjoint[1]:
+        disjoint_minimum_cuts = [[one_temp_cut] for one_temp_cut in all_minimum_cuts]
+    for one_minimum_cut_group_ind in range(len(disjoint_minimum_cuts)):
+        one_minimum_cut_group = disjoint_minimum_cuts[one_minimum_cut_group_ind]
+        if len(one_minimum_cut_group) > 1:
+            multiply_of_improbabilities = ""
+            for the_disjoint_minimum_cut in one_minimum_cut_group:
+                multiply_of_improbabilities += "(1 - " + "×".join([
+                    get_edge_probability_name(one_edge, "q") for one_edge in the_disjoint_minimum_cut
+                ]) + ")"
+            dict_for_first_formula2[one_minimum_cut_group_ind] = (
+                one_minimum_cut_group,
+                multiply_of_improbabilities
+            )
+        else:
+            one_minimum_cut = one_minimum_cut_group[0]
+            multiply_of_improbabilities = "1 - " + "×".join([
+                get_edge_probability_name(one_edge, "q") for one_edge in one_minimum_cut
+            ])
+            dict_for_first_formula2[one_minimum_cut_group_ind] = (
+                [one_minimum_cut],
+                multiply_of_improbabilities
+            )
+    logger.debug("Minimum cuts (including disjoint minimum cuts): %s", dict_for_first_formula2)
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    first_formula = FormulaText()
+    first_formula.add_line(f"{terminals_name} ≥ max( ", MappedTerms(path_groups, _get_paths_group_term), ", ", " )")
+    first_formula.add_line(f"{terminals_name}  ≤ min( ", [
+        the_one_min_cut_info[1] for the_one_min_cut_info in dict_for_first_formula2.values()
+    ], ", ", " )")
+    second_formula = FormulaText()
+    second_formula.add_line(f"{terminals_name} ≥ max( ", MappedTerms(path_groups, _get_paths_group_uniform_term),
+                            ", ", " )")
+    second_formula.add_line(f"{terminals_name}  ≤ min( ", [
+        "".join([f"(1 - q{get_superscript_number(len(temp_disjoint_cut))})"
+                 for temp_disjoint_cut in the_one_min_cut_info[0]])
+        if len(the_one_min_cut_info[0]) > 1 else
+        "1 - q" + get_superscript_number(len(the_one_min_cut_info[0][0]))
+        for the_one_min_cut_info in dict_for_first_formula2.values()
+    ], ", ", " )")
+
+    # max( 1 - (1 - p₁₋₂)(1 - p₁₋₃×p₃₋₂), p₁₋₄×p₄₋₂, ... ) and min( (1 - q₁₋₂×q₁₋₃)(...), ... ) are compiled once
+    # and are calculated for {(0, 1): 0.5, ...}, for matrix (N scenarios × m edges) or for array of equal 'p' values
+    with arg_metrics.measure_stage("compilation"):
+        bounds_evaluator = BoundsEvaluator(
+            lower_bound_evaluator,
+            CutGroupsEvaluator([one_min_cut_info[0] for one_min_cut_info in dict_for_first_formula2.values()],
+                               list(arg_defined_graph.edges))
+        )
+
+    all_result_data["paths_amount"] = arg_budget.found_amount
+    all_result_data["path_set"] = path_set
+    all_result_data["paths_groups"] = path_groups
+    all_result_data["all_minimum_cuts"] = all_minimum_cuts
+    all_result_data["disjoint_paths"] = disjoint_paths
+    all_result_data["disjoint_paths_families"] = disjoint_paths_families
+    all_result_data["disjoint_minimum_cuts"] = disjoint_minimum_cuts
+    all_result_data["first_formula"] = first_formula
+    all_result_data["second_formula"] = second_formula
+    all_result_data["bounds_evaluator"] = bounds_evaluator
+    all_result_data["first_formula_functions"] = [
+        (bounds_evaluator.lower_bound, "Range of values:"),
+        (bounds_evaluator.upper_bound, f" ≤ {terminals_name} ≤ ")
+    ]
+    all_result_data["second_formula_functions"] = [
+        bounds_evaluator.lower_bound.evaluate_uniform,
+        bounds_evaluator.upper_bound.evaluate_uniform
+    ]
+    all_result_data["importance_functions"] = [(bounds_evaluator.lower_bound, "Lower bound"),
+                                               (bounds_evaluator.upper_bound, "Upper bound")]
+    return all_result_data
+
+
+def _get_reliability_polynomial_formula(reliability_polynomial, terminals_name):
+    """Nᵢ and coefficients of powers of p, e.g. "P = 2×p² - p⁴" """
+    polynomial_formula = FormulaText()
+    polynomial_formula.add_line(f"{terminals_name} = Σ Nᵢ × pⁱ × qᵐ⁻ⁱ, Nᵢ - amount of states with i working edges, "
+                                f"where source and target are connected (m = {reliability_polynomial.edges_amount}):")
+    polynomial_formula.add_line("", [f"N{get_subscript_number(working_amount)} = {one_count}"
+                                     for working_amount, one_count in enumerate(reliability_polynomial.states_counts)],
+                                ", ")
+    powers_parts = polynomial_formula.add_line(f"{terminals_name} = ")
+    for one_power, one_coefficient in enumerate(reliability_polynomial.power_coefficients):
+        if one_coefficient == 0:
+            continue
+        sign_text = "- " if one_coefficient < 0 else ("+ " if powers_parts else "")
+        coefficient_text = "" if abs(one_coefficient) == 1 and one_power > 0 else str(abs(one_coefficient))
+        if one_power > 0:
+            coefficient_text += ("×" if coefficient_text else "") + "p" + (get_superscript_number(one_power)
+                                                                          if one_power > 1 else "")
+        powers_parts.append(sign_text + coefficient_text)
+    if not powers_parts:
+        powers_parts.append("0")
+    return polynomial_formula
+
+
+def _get_binary_decision_diagram_info(arg_defined_graph, first_node, last_node, arg_budget, arg_metrics):
+    all_result_data = {}
+    with arg_metrics.measure_stage("compilation"):
+        connectivity_diagram = get_connectivity_diagram(arg_defined_graph, first_node, last_node, arg_budget)
+    arg_metrics.add_counter("compilation", "diagram nodes", len(connectivity_diagram))
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    all_result_data["connectivity_diagram"] = connectivity_diagram
+    first_formula = FormulaText.from_text(
+        f"{terminals_name} = P(source and target are connected), exact value by binary decision diagram "
+        f"with {len(connectivity_diagram)} nodes")
+    first_formula.add_line("Order of edges: ", [get_edge_probability_name(one_edge)
+                                                for one_edge in connectivity_diagram.ordered_edges], ", ")
+    all_result_data["first_formula"] = first_formula
+    with arg_metrics.measure_stage("reliability polynomial"):
+        reliability_polynomial = connectivity_diagram.get_reliability_polynomial()
+    all_result_data["reliability_polynomial"] = reliability_polynomial
+    all_result_data["second_formula"] = _get_reliability_polynomial_formula(reliability_polynomial, terminals_name)
+    all_result_data["first_formula_functions"] = [(connectivity_diagram, f"{terminals_name} = ")]
+    all_result_data["second_formula_functions"] = [reliability_polynomial.evaluate_uniform]
+    all_result_data["importance_functions"] = [(connectivity_diagram, "Exact value")]
+    return all_result_data
+
+
+def _get_esary_proshan_info(arg_defined_graph, first_node, last_node, arg_budget, arg_cuts_budget,
+                            arg_paths_and_cuts, arg_metrics):
+    all_result_data = {}
+    # upper bound is the same as formula of "Simple paths": 1 - Π(1 - Π p) over all simple paths
+    upper_bound_evaluator, path_set = _get_all_paths_formula(arg_defined_graph, first_node, last_node, arg_budget,
+                                                             arg_paths_and_cuts, arg_metrics)
+    dict_of_paths_lengths = path_set.get_amounts_by_length()
+    # lower bound: Π(1 - Π q) over all minimal cuts
+    all_minimal_cuts = list(_iterate_minimal_cuts(arg_defined_graph, first_node, last_node, arg_cuts_budget,
+                                                  arg_paths_and_cuts, arg_metrics))
+    is_connected = _are_terminals_connected(arg_defined_graph, first_node, last_node)
+    with arg_metrics.measure_stage("compilation"):
+        if is_connected:
+            lower_bound_evaluator = CutGroupsEvaluator([all_minimal_cuts], list(arg_defined_graph.edges))
+        else:
+            # there is no cut, because there is no path: Π over empty list would be 1, lower bound is 0
+            lower_bound_evaluator = PathGroupsEvaluator([], list(arg_defined_graph.edges))
+    dict_of_cuts_lengths = {}
+    for one_minimal_cut in all_minimal_cuts:
+        dict_of_cuts_lengths[len(one_minimal_cut)] = dict_of_cuts_lengths.get(len(one_minimal_cut), 0) + 1
+    bounds_evaluator = BoundsEvaluator(lower_bound_evaluator, upper_bound_evaluator)
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    first_formula = FormulaText()
+    first_formula.add_line(f"{terminals_name} ≥ " + ("" if is_connected else "0"), [
+        "(1 - " + "×".join([get_edge_probability_name(one_edge, "q") for one_edge in one_minimal_cut]) + ")"
+        for one_minimal_cut in all_minimal_cuts
+    ])
+    first_formula.add_line(f"{terminals_name} ≤ 1 - ", MappedTerms(path_set, _get_path_term))
+    second_formula = FormulaText()
+    second_formula.add_line(f"{terminals_name} ≥ " + ("" if is_connected else "0"), [
+        f"(1 - q{get_superscript_number(the_key)}){get_superscript_number(dict_of_cuts_lengths[the_key])}"
+        for the_key in sorted(dict_of_cuts_lengths.keys())
+    ])
+    second_formula.add_line(f"{terminals_name} ≤ 1 - ", [
+        f"(1 - p{get_superscript_number(the_key)}){get_superscript_number(dict_of_paths_lengths[the_key])}"
+        for the_key in sorted(dict_of_paths_lengths.keys())
+    ])
+    all_result_data["paths_amount"] = arg_budget.found_amount
+    all_result_data["path_set"] = path_set
+    all_result_data["all_minimum_cuts"] = all_minimal_cuts
+    all_result_data["bounds_evaluator"] = bounds_evaluator
+    all_result_data["first_formula"] = first_formula
+    all_result_data["second_formula"] = second_formula
+    all_result_data["first_formula_functions"] = [
+        (bounds_evaluator.lower_bound, "Range of values:"),
+        (bounds_evaluator.upper_bound, f" ≤ {terminals_name} ≤ ")
+    ]
+    all_result_data["second_formula_functions"] = [
+        bounds_evaluator.lower_bound.evaluate_uniform,
+        bounds_evaluator.upper_bound.evaluate_uniform
+    ]
+    all_result_data["importance_functions"] = [(bounds_evaluator.lower_bound, "Lower bound"),
+                                               (bounds_evaluator.upper_bound, "Upper bound")]
+    return all_result_data
+
+
+def _get_exhaustive_search_info(arg_defined_graph, first_node, last_node, arg_metrics):
+    all_result_data = {}
+    with arg_metrics.measure_stage("compilation"):
+        exhaustive_search_evaluator = ExhaustiveSearchEvaluator(list(arg_defined_graph.edges), first_node, last_node)
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    used_edges_amount = len(exhaustive_search_evaluator.used_edges)
+    all_result_data["exhaustive_search_evaluator"] = exhaustive_search_evaluator
+    all_result_data["first_formula"] = FormulaText.from_text(
+        f"{terminals_name} = Σ Π p × Π q over all 2{get_superscript_number(used_edges_amount)} states of edges, "
+        f"where source and target are connected (p - working edges, q - failed edges)"
+    )
+    with arg_metrics.measure_stage("reliability polynomial"):
+        reliability_polynomial = exhaustive_search_evaluator.get_reliability_polynomial()
+    arg_metrics.add_counter("reliability polynomial", "states", 2 ** used_edges_amount)
+    all_result_data["reliability_polynomial"] = reliability_polynomial
+    all_result_data["second_formula"] = _get_reliability_polynomial_formula(reliability_polynomial, terminals_name)
+    all_result_data["first_formula_functions"] = [(exhaustive_search_evaluator, f"{terminals_name} = ")]
+    all_result_data["second_formula_functions"] = [reliability_polynomial.evaluate_uniform]
+    all_result_data["importance_functions"] = [(exhaustive_search_evaluator, "Exact value")]
+    return all_result_data
+
+
+def _get_monte_carlo_info(arg_defined_graph, first_node, last_node, arg_metrics):
+    all_result_data = {}
+    with arg_metrics.measure_stage("compilation"):
+        monte_carlo_evaluator = MonteCarloEvaluator(list(arg_defined_graph.edges), first_node, last_node)
+    arg_metrics.add_counter("compilation", "samples", monte_carlo_evaluator.samples_amount)
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    confidence_percents = f"{monte_carlo_evaluator.confidence * 100:g}%"
+    all_result_data["monte_carlo_evaluator"] = monte_carlo_evaluator
+    all_result_data["first_formula"] = FormulaText.from_text(
+        f"{terminals_name} ≈ (amount of samples, where source and target are connected) / N, "
+        f"N = {monte_carlo_evaluator.samples_amount} random samples of states of "
+        f"{len(monte_carlo_evaluator.used_edges)} edges (edge works if u < p, u is uniform in [0, 1))\n"
+        f"{confidence_percents} confidence interval is Wilson score interval"
+    )
+    all_result_data["second_formula"] = FormulaText.from_text(
+        f"{terminals_name}(p) is estimated by the same samples, "
+        f"lines of chart: estimate and ends of {confidence_percents} interval")
+    all_result_data["first_formula_functions"] = [
+        (monte_carlo_evaluator, f"{terminals_name} ≈"),
+        (monte_carlo_evaluator.lower_bound, f", {confidence_percents} confidence interval:"),
+        (monte_carlo_evaluator.upper_bound, " -")
+    ]
+    all_result_data["second_formula_functions"] = [
+        monte_carlo_evaluator.evaluate_uniform,
+        monte_carlo_evaluator.lower_bound.evaluate_uniform,
+        monte_carlo_evaluator.upper_bound.evaluate_uniform
+    ]
+    # the same random samples are used for pₑ = 1 and pₑ = 0, so difference has small variance
+    all_result_data["importance_functions"] = [(monte_carlo_evaluator, "Estimate")]
+    return all_result_data
+
+
+def _get_method_info(arg_defined_graph, arg_chosen_method, first_node, last_node, arg_budget, arg_cuts_budget,
+                     arg_paths_and_cuts, arg_metrics, arg_edges_probabilities=None):
+    if arg_chosen_method == "Simple paths":
+        return _get_simple_paths_info(arg_defined_graph, first_node, last_node, arg_budget, arg_paths_and_cuts,
+                                      arg_metrics)
+    if arg_chosen_method == "Esary-Proshan":
+        return _get_esary_proshan_info(arg_defined_graph, first_node, last_node, arg_budget, arg_cuts_budget,
+                                       arg_paths_and_cuts, arg_metrics)
+    if arg_chosen_method == "Litvak-Ushakov":
+        return _get_litvak_ushakov_info(arg_defined_graph, first_node, last_node, arg_budget, arg_cuts_budget,
+                                        arg_paths_and_cuts, arg_metrics, arg_edges_probabilities)
+    if arg_chosen_method == "Exhaustive search":
+        return _get_exhaustive_search_info(arg_defined_graph, first_node, last_node, arg_metrics)
+    if arg_chosen_method == "Binary decision diagram":
+        return _get_binary_decision_diagram_info(arg_defined_graph, first_node, last_node, arg_budget, arg_metrics)
+    if arg_chosen_method == "Monte Carlo":
+        return _get_monte_carlo_info(arg_defined_graph, first_node, last_node, arg_metrics)
+    raise ValueError(f"Unknown method of functional stability: {arg_chosen_method}")
+
+
+def _are_terminals_connected(arg_defined_graph, first_node, last_node):
+    if first_node == last_node:
+        return True
+    return first_node in arg_defined_graph and last_node in arg_defined_graph \
+        and nx.has_path(arg_defined_graph, first_node, last_node)
+
+
+def _get_disconnected_info(arg_defined_graph, first_node, last_node):
+    """There is no path between source and target: P = 0 for any probabilities, method isn't used"""
+    all_result_data = {}
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    # max over empty list of groups of paths is 0
+    zero_evaluator = PathGroupsEvaluator([], list(arg_defined_graph.edges))
+    reliability_polynomial = ReliabilityPolynomial([0])
+    all_result_data["paths_amount"] = 0
+    all_result_data["reliability_polynomial"] = reliability_polynomial
+    all_result_data["first_formula"] = FormulaText.from_text(
+        f"{terminals_name} = 0, there is no path between source and target")
+    all_result_data["second_formula"] = FormulaText.from_text(f"{terminals_name}(p) = 0")
+    all_result_data["first_formula_functions"] = [(zero_evaluator, f"{terminals_name} = ")]
+    all_result_data["second_formula_functions"] = [reliability_polynomial.evaluate_uniform]
+    all_result_data["importance_functions"] = [(zero_evaluator, "Exact value")]
+    return all_result_data
+
+
+def _get_blocks_method_info(arg_defined_graph, arg_chosen_method, first_node, last_node, arg_budget, arg_cuts_budget,
+                            arg_paths_and_cuts, arg_metrics, arg_edges_probabilities=None):
+    """Method for every block of path of block-cut tree (BlockDecomposition), then results are multiplied
+
+    Blocks are calculated one after another: they share budgets (limits, progress and cancel of window) and
+    metrics, exhaustive search of every block uses its own pool of processes.
+    """
+    with arg_metrics.measure_stage("block decomposition"):
+        block_decomposition = BlockDecomposition(list(arg_defined_graph.edges), first_node, last_node)
+    if block_decomposition.is_trivial:
+        return _get_method_info(arg_defined_graph, arg_chosen_method, first_node, last_node, arg_budget,
+                                arg_cuts_budget, arg_paths_and_cuts, arg_metrics, arg_edges_probabilities)
+    logger.debug("Graph is decomposed: %s", block_decomposition.get_summary())
+    arg_metrics.add_counter("block decomposition", "blocks", len(block_decomposition))
+    arg_metrics.add_counter("block decomposition", "bridges", block_decomposition.bridges_amount)
+    all_blocks_result_data = []
+    # enumeration of every block sets stop reason of budget again, so the first stop reason is kept
+    all_stop_states = {id(arg_budget): None, id(arg_cuts_budget): None}
+    for block_ind, (block_source, block_target) in enumerate(block_decomposition.all_blocks_terminals):
+        if block_decomposition.is_bridge(block_ind):
+            all_blocks_result_data.append(None)
+            continue
+        all_blocks_result_data.append(_get_method_info(block_decomposition.get_block_graph(block_ind),
+                                                       arg_chosen_method, block_source, block_target, arg_budget,
+                                                       arg_cuts_budget, arg_paths_and_cuts, arg_metrics,
+                                                       arg_edges_probabilities))
+        for one_budget in (arg_budget, arg_cuts_budget):
+            if one_budget.stop_reason is not None and all_stop_states[id(one_budget)] is None:
+                all_stop_states[id(one_budget)] = (one_budget.stop_reason, one_budget.elapsed_seconds)
+    for one_budget in (arg_budget, arg_cuts_budget):
+        if all_stop_states[id(one_budget)] is not None:
+            one_budget.stop_reason, one_budget.elapsed_seconds = all_stop_states[id(one_budget)]
+    all_result_data = _get_blocks_result_data(all_blocks_result_data, block_decomposition, first_node, last_node)
+    if any("paths_amount" in one_result_data for one_result_data in all_blocks_result_data if one_result_data):
+        all_result_data["paths_amount"] = arg_budget.found_amount
+    return all_result_data
+
+
+def _get_blocks_result_data(all_blocks_result_data, block_decomposition, first_node, last_node):
+    """Results of method for every block (None -> bridge) -> products of functions, formulas of blocks"""
+    all_solved_result_data = [one_result_data for one_result_data in all_blocks_result_data if one_result_data]
+    terminals_name = get_terminals_probability_name(first_node, last_node)
+    # texts of functions are the same for all blocks, name of the first block is replaced by name of graph
+    block_name = get_terminals_probability_name(*next(
+        block_terminals for block_terminals, one_result_data
+        in zip(block_decomposition.all_blocks_terminals, all_blocks_result_data) if one_result_data))
+    all_result_data = {"block_decomposition": block_decomposition, "blocks_result_data": all_blocks_result_data}
+    # the same function of block can be used by several lists, so product is made once
+    products_evaluators = {}
+
+    def get_product_evaluator(result_key, function_ind):
+        all_block_functions = [one_result_data[result_key][function_ind][0] if one_result_data else None
+                               for one_result_data in all_blocks_result_data]
+        functions_ids = tuple(id(one_function) for one_function in all_block_functions)
+        if functions_ids not in products_evaluators:
+            products_evaluators[functions_ids] = BlocksProductEvaluator(all_block_functions, block_decomposition)
+        return products_evaluators[functions_ids]
+
+    for result_key in ("first_formula_functions", "importance_functions"):
+        all_result_data[result_key] = [
+            (get_product_evaluator(result_key, function_ind), one_text.replace(block_name, terminals_name))
+            for function_ind, (_, one_text) in enumerate(all_solved_result_data[0][result_key])]
+    if "bounds_evaluator" in all_solved_result_data[0]:
+        all_result_data["bounds_evaluator"] = BoundsEvaluator(*[BlocksProductEvaluator(
+            [getattr(one_result_data["bounds_evaluator"], bound_name) if one_result_data else None
+             for one_result_data in all_blocks_result_data], block_decomposition)
+            for bound_name in ("lower_bound", "upper_bound")])
+    first_formula = FormulaText()
+    first_formula.add_line(f"{terminals_name} = ", [
+        get_edge_probability_name(block_decomposition.all_blocks_edges[block_ind][0]) if one_result_data is None
+        else get_terminals_probability_name(*block_decomposition.all_blocks_terminals[block_ind])
+        for block_ind, one_result_data in enumerate(all_blocks_result_data)
+    ], "×", f", blocks of graph are between articulation points "
+            f"{', '.join(str(block_source + 1) for block_source, _ in block_decomposition.all_blocks_terminals[1:])}")
+    second_formula = FormulaText()
+    second_formula.extend(first_formula)
+    for one_result_data in all_solved_result_data:
+        first_formula.extend(one_result_data["first_formula"])
+    if all("reliability_polynomial" in one_result_data for one_result_data in all_solved_result_data):
+        # product of polynomials of blocks is exact polynomial of graph
+        reliability_polynomial = block_decomposition.get_reliability_polynomial([
+            one_result_data["reliability_polynomial"] if one_result_data else None
+            for one_result_data in all_blocks_result_data])
+        all_result_data["reliability_polynomial"] = reliability_polynomial
+        second_formula.extend(_get_reliability_polynomial_formula(reliability_polynomial, terminals_name))
+        all_result_data["second_formula_functions"] = [reliability_polynomial.evaluate_uniform]
+    else:
+        for one_result_data in all_solved_result_data:
+            second_formula.extend(one_result_data["second_formula"])
+        all_result_data["second_formula_functions"] = [
+            BlocksUniformProduct([one_result_data["second_formula_functions"][function_ind] if one_result_data
+                                  else None for one_result_data in all_blocks_result_data])
+            for function_ind in range(len(all_solved_result_data[0]["second_formula_functions"]))]
+    all_result_data["first_formula"] = first_formula
+    all_result_data["second_formula"] = second_formula
+    return all_result_data
+
+
+def _get_reduced_result_data(reduced_result_data, graph_reduction, first_node, last_node):
+    """Results of method for reduced graph -> functions of original edges, formulas with legend of reduction"""
+    all_result_data = dict(reduced_result_data)
+    # the same function can be used by several lists, so it's wrapped once
+    reduced_evaluators = {}
+
+    def get_reduced_evaluator(one_function):
+        if id(one_function) not in reduced_evaluators:
+            reduced_evaluators[id(one_function)] = ReducedGraphEvaluator(one_function, graph_reduction)
+        return reduced_evaluators[id(one_function)]
+
+    all_result_data["first_formula_functions"] = [(get_reduced_evaluator(one_function), one_text)
+                                                  for one_function, one_text in reduced_result_data[
+                                                      "first_formula_functions"]]
+    all_result_data["importance_functions"] = [(get_reduced_evaluator(one_function), one_text)
+                                               for one_function, one_text in reduced_result_data[
+                                                   "importance_functions"]]
+    # edges of reduced graph have different probabilities for equal p of original edges, so formula of method
+    # for p₁ = p₂ = ... = p can't be used, chart is calculated by general formula
+    all_result_data["second_formula_functions"] = [one_function.evaluate_uniform for one_function, _
+                                                   in all_result_data["first_formula_functions"]]
+    if "bounds_evaluator" in reduced_result_data:
+        all_result_data["bounds_evaluator"] = BoundsEvaluator(
+            get_reduced_evaluator(reduced_result_data["bounds_evaluator"].lower_bound),
+            get_reduced_evaluator(reduced_result_data["bounds_evaluator"].upper_bound))
+    original_name = get_terminals_probability_name(first_node, last_node)
+    reduced_name = get_terminals_probability_name(graph_reduction.reduced_source, graph_reduction.reduced_target)
+    first_formula = graph_reduction.get_legend(get_edge_probability_name, original_name, reduced_name)
+    first_formula.extend(reduced_result_data["first_formula"])
+    second_formula = graph_reduction.get_legend(get_edge_probability_name, original_name, reduced_name, uniform=True)
+    second_formula.extend(reduced_result_data["first_formula"])
+    all_result_data["first_formula"] = first_formula
+    all_result_data["second_formula"] = second_formula
+    all_result_data["graph_reduction"] = graph_reduction
+    return all_result_data
+
+
+def _get_reduced_edges_probabilities(graph_reduction, arg_edges_probabilities):
+    # probabilities of original edges -> probabilities of edges of reduced graph (series, parallel...)
+    reduced_edges_index = get_edges_index(graph_reduction.reduced_graph.edges)
+    reduced_matrix, _ = graph_reduction.get_reduced_matrix(
+        get_probabilities_matrix(arg_edges_probabilities, graph_reduction.edges_index), reduced_edges_index)
+    return {one_edge: float(reduced_matrix[0, one_edge_ind]) for one_edge, one_edge_ind in reduced_edges_index.items()}
+
+
+def _get_budget_state(arg_budget):
+    return {one_name: getattr(arg_budget, one_name)
+            for one_name in ("found_amount", "estimated_memory_bytes", "elapsed_seconds", "stop_reason")}
+
+
+def get_all_info_by_method(arg_defined_graph, arg_chosen_method, arg_source=None, arg_target=None,
+                           arg_budget=None, arg_cuts_budget=None, arg_results_cache=None, arg_paths_and_cuts=None,
+                           arg_metrics=None, arg_reduce_graph=True, arg_fixed_edges_values=None,
+                           arg_decompose_blocks=True, arg_edges_probabilities=None):
+    """All info -> formulas and functions to calculate, not values
+
+    "first_formula" and "second_formula" are FormulaText (lines of terms), str() gives whole text.
+
+    arg_budget (EnumerationBudget) limits enumeration of simple paths, after calculation it shows whether
+    enumeration was complete ("paths_enumeration_stop_reason" of result is None) or partial.
+    arg_cuts_budget does the same for minimal cuts ("cuts_enumeration_stop_reason").
+    arg_results_cache (ResultsCache) gives results of the same graph, terminals, method and limits without
+    calculation.
+    arg_paths_and_cuts (IncrementalPathsAndCuts) gives paths and minimal cuts, which are kept after edits of graph,
+    they are used only if they are for the same graph and terminals (it's checked by can_use_paths_and_cuts:
+    kept sets aren't mapped to reduced graph or to blocks).
+    arg_metrics (RunMetrics) gets time, memory and counters of every stage (enumeration, grouping, compilation...).
+    arg_reduce_graph: methods of paths and cuts are used for reduced graph (GraphReduction: series, parallel...),
+    then functions are calculated for probabilities of original edges ("graph_reduction" of result).
+    arg_fixed_edges_values: {(0, 1): 1., ...}, edges with p = 0 are deleted and edges with p = 1 are contracted by
+    reduction, so functions of result are right only for these values of these edges ("importance_functions" are
+    calculated for graph without fixed edges, so importance of fixed edges isn't lost).
+    arg_decompose_blocks: method is used for every block of path of block-cut tree between source and target
+    (after reduction), then results of blocks are multiplied ("block_decomposition" of result).
+    arg_edges_probabilities: {(0, 1): 0.9, ...} of all edges (e.g. sliders of window), families of disjoint paths
+    and cuts of "Litvak-Ushakov" are chosen for these probabilities too (besides equal p of
+    default_probabilities_levels), functions of result are right for any probabilities.
+    """
+    if arg_budget is None:
+        arg_budget = EnumerationBudget()
+    if arg_cuts_budget is None:
+        arg_cuts_budget = EnumerationBudget(items_name="cuts")
+    if arg_metrics is None:
+        arg_metrics = RunMetrics()
+    if arg_source is None or arg_target is None:
+        first_node, last_node = get_default_terminals(arg_defined_graph)
+    if arg_source is not None:
+        first_node = arg_source
+    if arg_target is not None:
+        last_node = arg_target
+    is_reduced = arg_reduce_graph and arg_chosen_method in methods_with_graph_reduction
+    is_decomposed = arg_decompose_blocks and arg_chosen_method in methods_with_block_decomposition
+    get_method_info = _get_blocks_method_info if is_decomposed else _get_method_info
+    edges_probabilities = None  # other methods don't depend on it, so it isn't part of key of results
+    if arg_edges_probabilities is not None and arg_chosen_method in methods_with_disjoint_families:
+        edges_probabilities = {tuple(sorted(one_edge)): float(one_value)
+                               for one_edge, one_value in arg_edges_probabilities.items()}
+        if any(tuple(sorted(one_edge)) not in edges_probabilities for one_edge in arg_defined_graph.edges):
+            # e.g. sliders aren't made yet, then families are chosen by equal p only
+            logger.debug("Probabilities of some edges are not given, they aren't used by %s", arg_chosen_method)
+            edges_probabilities = None
+        else:  # other edges (e.g. of previous graph) aren't columns of functions
+            edges_probabilities = {tuple(sorted(one_edge)): edges_probabilities[tuple(sorted(one_edge))]
+                                   for one_edge in arg_defined_graph.edges}
+    fixed_edges_values = {}
+    if is_reduced and arg_fixed_edges_values:
+        fixed_edges_values = {tuple(sorted(one_edge)): float(one_value)
+                              for one_edge, one_value in arg_fixed_edges_values.items() if one_value in (0, 1)}
+    results_key = None
+    if arg_results_cache is not None:
+        results_key = get_results_key(arg_defined_graph, first_node, last_node, arg_chosen_method,
+                                      (arg_budget, arg_cuts_budget),
+                                      {"reduce_graph": is_reduced, "decompose_blocks": is_decomposed,
+                                       "fixed_edges": sorted([*one_edge, one_value]
+                                                             for one_edge, one_value in fixed_edges_values.items()),
+                                       "edges_probabilities": None if edges_probabilities is None else sorted(
+                                           [*one_edge, one_value]
+                                           for one_edge, one_value in edges_probabilities.items())})
+        with arg_metrics.measure_stage("results cache"):
+            cached_result_data = arg_results_cache.get(results_key)
+        if cached_result_data is not None:
+            logger.debug("Results of %s are taken from cache", arg_chosen_method)
+            arg_metrics.add_counter("results cache", "hits")
+            arg_budget.stop_reason = cached_result_data["paths_enumeration_stop_reason"]
+            arg_cuts_budget.stop_reason = cached_result_data["cuts_enumeration_stop_reason"]
+            return dict(cached_result_data)
+    graph_reduction = None
+    if is_reduced and first_node != last_node:
+        with arg_metrics.measure_stage("graph reduction"):
+            graph_reduction = GraphReduction(list(arg_defined_graph.edges), first_node, last_node, fixed_edges_values)
+        for one_name, one_amount in graph_reduction.reductions_amounts.items():
+            if one_amount:
+                arg_metrics.add_counter("graph reduction", one_name, one_amount)
+        if graph_reduction.is_trivial:
+            graph_reduction = None
+    if graph_reduction is None:
+        method_graph, method_source, method_target = arg_defined_graph, first_node, last_node
+    else:
+        method_graph = graph_reduction.reduced_graph
+        method_source, method_target = graph_reduction.reduced_source, graph_reduction.reduced_target
+    if not _are_terminals_connected(method_graph, method_source, method_target):
+        # e.g. bridge with p = 0 is deleted by reduction, then methods of paths and cuts have nothing to find
+        all_result_data = _get_disconnected_info(arg_defined_graph, first_node, last_node)
+    elif graph_reduction is None:
+        all_result_data = get_method_info(arg_defined_graph, arg_chosen_method, first_node, last_node, arg_budget,
+                                          arg_cuts_budget, arg_paths_and_cuts, arg_metrics, edges_probabilities)
+    else:
+        logger.debug("Graph is reduced from %s to %s edges: %s", arg_defined_graph.number_of_edges(),
+                     graph_reduction.reduced_graph.number_of_edges(), graph_reduction.get_summary())
+        if edges_probabilities is not None:
+            edges_probabilities = _get_reduced_edges_probabilities(graph_reduction, edges_probabilities)
+        all_result_data = _get_reduced_result_data(
+            get_method_info(graph_reduction.reduced_graph, arg_chosen_method, graph_reduction.reduced_source,
+                            graph_reduction.reduced_target, arg_budget, arg_cuts_budget, arg_paths_and_cuts,
+                            arg_metrics, edges_probabilities),
+            graph_reduction, first_node, last_node)
+    if fixed_edges_values:
+        # deleted and contracted edges aren't in functions of reduced graph, so their importance would be 0;
+        # importance is calculated by functions of the same graph without fixed edges (budgets are the same, so
+        # cancel still works; this calculation starts with their whole limits, then their state is restored)
+        budgets_states = [_get_budget_state(one_budget) for one_budget in (arg_budget, arg_cuts_budget)]
+        for one_budget in (arg_budget, arg_cuts_budget):
+            one_budget.reset_progress()
+        with arg_metrics.measure_stage("importance without fixed edges"):
+            unfixed_result_data = get_all_info_by_method(
+                arg_defined_graph, arg_chosen_method, first_node, last_node, arg_budget, arg_cuts_budget,
+                arg_results_cache, arg_paths_and_cuts, arg_metrics, arg_reduce_graph, None, arg_decompose_blocks,
+                arg_edges_probabilities)
+        for one_budget, one_budget_state in zip((arg_budget, arg_cuts_budget), budgets_states):
+            for one_name, one_value in one_budget_state.items():
+                setattr(one_budget, one_name, one_value)
+        all_result_data["importance_functions"] = unfixed_result_data["importance_functions"]
+    all_result_data["method_name"] = arg_chosen_method
+    all_result_data["source_node"] = first_node
+    all_result_data["target_node"] = last_node
+    all_result_data["fixed_edges_values"] = fixed_edges_values
+    all_result_data["all_edges"] = [tuple(sorted(one_edge)) for one_edge in arg_defined_graph.edges]
+    all_result_data["paths_enumeration_stop_reason"] = arg_budget.stop_reason
+    all_result_data["cuts_amount"] = arg_cuts_budget.found_amount
+    all_result_data["cuts_enumeration_stop_reason"] = arg_cuts_budget.stop_reason
+    if results_key is not None and not arg_budget.is_stopped_by_time and not arg_cuts_budget.is_stopped_by_time:
+        with arg_metrics.measure_stage("results cache"):
+            arg_results_cache.put(results_key, all_result_data)
+        all_result_data = dict(all_result_data)
+    logger.debug("Stages of %s:\n%s", arg_chosen_method, arg_metrics.get_summary())
+    return all_result_data
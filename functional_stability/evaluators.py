@@ -0,0 +1,236 @@
+"""Compiled (vectorized) functions to calculate formulas for many probability vectors at once"""
+import array
+
+import numpy as np
+import scipy.sparse
+
+from functional_stability.edge_bitmasks import EdgeBitmaskIndex
+
+
+def get_edges_index(all_edges):
+    # (0, 1) -> column of probabilities matrix
+    return {tuple(sorted(one_edge)): one_edge_ind for one_edge_ind, one_edge in enumerate(all_edges)}
+
+
+def get_probabilities_matrix(arg_all_edges_values, edges_index):
+    """{(0, 1): 0.5, ...} or array (m,) or array (N scenarios, m edges) -> array (N scenarios, m edges)"""
+    if isinstance(arg_all_edges_values, dict):
+        # every edge of graph must be given, otherwise its column would be taken from uninitialized memory
+        probabilities_matrix = np.full((1, len(edges_index)), np.nan)
+        for one_edge, one_edge_value in arg_all_edges_values.items():
+            one_edge_ind = edges_index.get(tuple(sorted(one_edge)))
+            if one_edge_ind is None:
+                raise ValueError(f"Edge {one_edge} is not in graph")
+            probabilities_matrix[0, one_edge_ind] = one_edge_value
+        missed_columns = np.flatnonzero(np.isnan(probabilities_matrix[0]))
+        if len(missed_columns):
+            columns_edges = {one_edge_ind: one_edge for one_edge, one_edge_ind in edges_index.items()}
+            raise ValueError(f"Probabilities of edges {[columns_edges[one_column] for one_column in missed_columns]} "
+                             f"are not given")
+        return probabilities_matrix
+    probabilities_matrix = np.asarray(arg_all_edges_values, dtype=float)
+    if probabilities_matrix.ndim == 1:
+        probabilities_matrix = probabilities_matrix[np.newaxis, :]
+    if probabilities_matrix.shape[1] != len(edges_index):
+        raise ValueError(f"Expected probabilities of {len(edges_index)} edges, "
+                         f"got {probabilities_matrix.shape[1]}")
+    return probabilities_matrix
+
+
+class IncidenceMatrixBuilder:
+    """Rows (paths or cuts) are added one by one, so list of all rows is never kept in memory"""
+
+    def __init__(self, edges_index):
+        self.edges_index = edges_index
+        self.all_columns = array.array("i")
+        self.all_offsets = array.array("q", [0])
+
+    def __len__(self):
+        return len(self.all_offsets) - 1
+
+    def add_edge_group(self, one_edge_group):
+        self.all_columns.extend(self.edges_index[tuple(sorted(one_edge))] for one_edge in one_edge_group)
+        self.all_offsets.append(len(self.all_columns))
+        return len(self) - 1
+
+    def get_matrix(self):
+        return scipy.sparse.csr_matrix(
+            (np.ones(len(self.all_columns)), np.frombuffer(self.all_columns, dtype=np.int32),
+             np.frombuffer(self.all_offsets, dtype=np.int64)),
+            shape=(len(self), len(self.edges_index))
+        )
+
+
+def get_incidence_matrix(all_edge_groups, edges_index):
+    """Rows -> edge groups (paths or cuts), columns -> edges; 1 if edge is inside group"""
+    incidence_matrix_builder = IncidenceMatrixBuilder(edges_index)
+    for one_edge_group in all_edge_groups:
+        incidence_matrix_builder.add_edge_group(one_edge_group)
+    return incidence_matrix_builder.get_matrix()
+
+
+def get_log_products(incidence_matrix, log_values_matrix):
+    """log(Π values) for every row of incidence matrix -> array (rows, N scenarios)"""
+    # sparse product uses only existing (edge in group) elements, so log(0) = -inf gives product 0
+    return np.asarray(incidence_matrix @ log_values_matrix.T)
+
+
+def return_like_input(arg_all_edges_values, calculated_values):
+    # dictionary of edges (as it is used by formula window) -> one number, matrix -> array of numbers
+    if isinstance(arg_all_edges_values, dict) or np.ndim(arg_all_edges_values) == 1:
+        return float(calculated_values[0])
+    return calculated_values
+
+
+def get_uniform_probabilities_matrix(arg_general_edge_values, edges_amount):
+    # p₀₋₁ = p₁₋₂ = ... = p for every value of 'p' -> array (values, m edges)
+    return np.repeat(np.reshape(arg_general_edge_values, (-1, 1)).astype(float), edges_amount, axis=1)
+
+
+class EdgeGroupsEvaluator:
+    """Base of compiled formulas: groups of edge groups (e.g. disjoint paths / disjoint cuts)
+
+    Every member (path or cut) is kept once in sparse member×edge matrix, every group is row of sparse
+    group×member matrix, so whole formula is calculated by two sparse products for many scenarios at once.
+    """
+    # maximum amount of (members × scenarios) values calculated at once
+    max_elements_in_chunk = 2 ** 22
+
+    def __init__(self, all_groups, all_edges, deduplicate_members=True):
+        # all_groups can be generator: groups are consumed one by one (e.g. right after path is found)
+        # deduplicate_members=False -> every member is inside only one group (e.g. simple paths), nothing to check
+        self.edges_index = get_edges_index(all_edges)
+        members_matrix_builder = IncidenceMatrixBuilder(self.edges_index)
+        edge_bitmask_index = EdgeBitmaskIndex(all_edges)
+        all_members_index = {}
+        all_groups_members = array.array("i")
+        all_groups_offsets = array.array("q", [0])
+        for one_group in all_groups:
+            for one_member in one_group:
+                if deduplicate_members:
+                    # bitmask of edges (bit i -> column i) is the same for equal members in any order of edges
+                    one_member_key = edge_bitmask_index.get_bitmask(one_member)
+                    if one_member_key not in all_members_index:
+                        all_members_index[one_member_key] = members_matrix_builder.add_edge_group(one_member)
+                    all_groups_members.append(all_members_index[one_member_key])
+                else:
+                    all_groups_members.append(members_matrix_builder.add_edge_group(one_member))
+            all_groups_offsets.append(len(all_groups_members))
+        self.members_incidence_matrix = members_matrix_builder.get_matrix()
+        self.groups_matrix = scipy.sparse.csr_matrix(
+            (np.ones(len(all_groups_members)), np.frombuffer(all_groups_members, dtype=np.int32),
+             np.frombuffer(all_groups_offsets, dtype=np.int64)),
+            shape=(len(all_groups_offsets) - 1, len(members_matrix_builder))
+        )
+
+    @classmethod
+    def from_matrices(cls, edges_index, members_incidence_matrix, groups_matrix):
+        """Compiled formula from ready matrices (e.g. of PathSet and PathGroups), members are not copied"""
+        new_evaluator = cls.__new__(cls)
+        new_evaluator.edges_index = edges_index
+        new_evaluator.members_incidence_matrix = members_incidence_matrix
+        new_evaluator.groups_matrix = groups_matrix
+        return new_evaluator
+
+    def _evaluate_groups(self, probabilities_matrix):
+        """Array (groups, N scenarios) of values of every group"""
+        raise NotImplementedError
+
+    def _combine_groups(self, groups_values):
+        """Array (groups, N scenarios) -> array (N scenarios)"""
+        raise NotImplementedError
+
+    def evaluate(self, probabilities_matrix):
+        scenarios_amount = probabilities_matrix.shape[0]
+        members_amount = max(self.members_incidence_matrix.shape[0], 1)
+        scenarios_in_chunk = max(1, self.max_elements_in_chunk // members_amount)
+        all_results = np.empty(scenarios_amount)
+        with np.errstate(divide="ignore"):
+            for chunk_start in range(0, scenarios_amount, scenarios_in_chunk):
+                chunk_slice = slice(chunk_start, chunk_start + scenarios_in_chunk)
+                groups_values = self._evaluate_groups(probabilities_matrix[chunk_slice])
+                all_results[chunk_slice] = self._combine_groups(groups_values)
+        return all_results
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.01) -> array of numbers"""
+        calculated_values = self.evaluate(get_uniform_probabilities_matrix(arg_general_edge_values,
+                                                                           len(self.edges_index)))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
+
+
+class PathGroupsEvaluator(EdgeGroupsEvaluator):
+    """max over groups of disjoint paths: 1 - Π(1 - Π p) (one path in group -> just Π p)"""
+
+    def _evaluate_groups(self, probabilities_matrix):
+        paths_probabilities = np.exp(get_log_products(self.members_incidence_matrix, np.log(probabilities_matrix)))
+        # Π(1 - Π p) -> exp(Σ log(1 - Π p))
+        return -np.expm1(np.asarray(self.groups_matrix @ np.log1p(-paths_probabilities)))
+
+    def _combine_groups(self, groups_values):
+        if groups_values.shape[0] == 0:  # there is no path at all
+            return np.zeros(groups_values.shape[1])
+        return groups_values.max(axis=0)
+
+
+class CutGroupsEvaluator(EdgeGroupsEvaluator):
+    """min over groups of disjoint cuts: Π(1 - Π q), q = 1 - p"""
+
+    def _evaluate_groups(self, probabilities_matrix):
+        cuts_improbabilities = np.exp(get_log_products(self.members_incidence_matrix,
+                                                       np.log1p(-probabilities_matrix)))
+        return np.exp(np.asarray(self.groups_matrix @ np.log1p(-cuts_improbabilities)))
+
+    def _combine_groups(self, groups_values):
+        if groups_values.shape[0] == 0:  # there is no cut at all
+            return np.ones(groups_values.shape[1])
+        return groups_values.min(axis=0)
+
+
+class PathsFormulaEvaluator(PathGroupsEvaluator):
+    """P = 1 - Π(1 - Π p) over all simple paths, for (N scenarios × m edges) probabilities matrix"""
+
+    def __init__(self, all_paths_edges, all_edges):
+        # all simple paths are different, so they can be consumed right from generator
+        super().__init__([all_paths_edges], all_edges, deduplicate_members=False)
+
+    @classmethod
+    def from_path_set(cls, path_set):
+        # arrays of PathSet are used by sparse matrix as they are
+        return cls.from_matrices(path_set.edges_index, path_set.get_matrix(), path_set.get_all_paths_group_matrix())
+
+
+class BoundsEvaluator:
+    """Lower and upper bounds of functional stability, calculated together for many scenarios"""
+
+    def __init__(self, lower_bound_evaluator, upper_bound_evaluator):
+        self.lower_bound = lower_bound_evaluator
+        self.upper_bound = upper_bound_evaluator
+
+    def evaluate(self, probabilities_matrix):
+        return self.lower_bound.evaluate(probabilities_matrix), self.upper_bound.evaluate(probabilities_matrix)
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        return (self.lower_bound.evaluate_uniform(arg_general_edge_values),
+                self.upper_bound.evaluate_uniform(arg_general_edge_values))
+
+
+class UniformPathsFormula:
+    """P = 1 - Π(1 - pᵏ)ⁿ, if p₀₋₁ = p₁₋₂ = ... = p (n - amount of simple paths with k edges)"""
+
+    def __init__(self, paths_amounts_by_length):
+        # e.g (1 - p₀₋₂×p₂₋₄) and (1 - p₀₋₃×p₃₋₄) are similar because their amounts of edges are equal
+        self.paths_amounts_by_length = dict(paths_amounts_by_length)
+
+    def __call__(self, arg_general_edge_val):
+        # arg_general_edge_val -> 0.5, 0.234, 1 ... -> 'p' value or np.arange(0, 1, 0.01) -> all values of chart
+        multiply_values = 1
+        for probability_amount, similar_path_amount in self.paths_amounts_by_length.items():
+            multiply_values *= pow(1 - pow(arg_general_edge_val, probability_amount), similar_path_amount)
+        return 1 - multiply_values
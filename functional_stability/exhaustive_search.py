@@ -0,0 +1,302 @@
+"""Exact functional stability by exhaustive (brute-force) search over all 2ᵐ states of edges"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from functional_stability.binary_decision_diagram import get_bfs_edges_order
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    get_uniform_probabilities_matrix,
+    return_like_input,
+)
+from functional_stability.paths_enumeration import CalculationCancelled, check_cancelled
+from functional_stability.reliability_polynomial import ReliabilityPolynomial
+
+
+class _ComponentsOfNodes:
+    """Union-find of nodes with rollback: union when edge starts to work, rollback of the last union when edge
+    stops to work (union by size without path compression, so find is O(log n) and every union can be undone)"""
+
+    def __init__(self, nodes_amount, all_working_edges=()):
+        self.parents = list(range(nodes_amount))
+        self.sizes = [1] * nodes_amount
+        # root, which was attached by every union (None -> nodes were connected already)
+        self.attached_roots = []
+        for first_node, second_node in all_working_edges:
+            self.union(first_node, second_node)
+
+    def find(self, one_node):
+        while self.parents[one_node] != one_node:
+            one_node = self.parents[one_node]
+        return one_node
+
+    def union(self, first_node, second_node):
+        first_root, second_root = self.find(first_node), self.find(second_node)
+        if first_root == second_root:
+            self.attached_roots.append(None)
+            return
+        if self.sizes[first_root] > self.sizes[second_root]:
+            first_root, second_root = second_root, first_root
+        self.parents[first_root] = second_root
+        self.sizes[second_root] += self.sizes[first_root]
+        self.attached_roots.append(first_root)
+
+    def rollback(self):
+        attached_root = self.attached_roots.pop()
+        if attached_root is not None:
+            self.sizes[self.parents[attached_root]] -= self.sizes[attached_root]
+            self.parents[attached_root] = attached_root
+
+
+def _get_low_states_weights(low_probabilities):
+    """(N scenarios, L edges) -> (N scenarios, 2ᴸ states) probabilities of every state of L edges"""
+    # bit j of state index -> edge j works
+    states_weights = np.ones((low_probabilities.shape[0], 1))
+    for one_edge_ind in range(low_probabilities.shape[1]):
+        one_edge_probabilities = low_probabilities[:, one_edge_ind:one_edge_ind + 1]
+        states_weights = np.concatenate([states_weights * (1 - one_edge_probabilities),
+                                         states_weights * one_edge_probabilities], axis=1)
+    return states_weights
+
+
+def _get_low_edges_components(components, low_edges, arg_source, arg_target):
+    """Components of source, target and ends of low edges, renamed to bits of one uint64 number
+
+    Only this tuple matters for low edges, so many states of high edges give the same tuple.
+    """
+    source_component = components.find(arg_source)
+    target_component = components.find(arg_target)
+    if source_component == target_component:
+        return None  # source and target are connected by high edges
+    components_bits = {source_component: 0, target_component: 1}
+    return tuple((components_bits.setdefault(components.find(first_node), len(components_bits)),
+                  components_bits.setdefault(components.find(second_node), len(components_bits)))
+                 for first_node, second_node in low_edges)
+
+
+def _get_connected_low_states(low_edges_components, low_states_bits):
+    """Boolean array (2ᴸ states): target is reachable from source, all states are checked together"""
+    if low_edges_components is None:
+        return np.ones(len(low_states_bits[0]) if low_states_bits else 1, dtype=bool)
+    low_edges_bits = [(np.uint64(first_bit), np.uint64(second_bit),
+                       np.uint64((1 << first_bit) | (1 << second_bit)))
+                      for first_bit, second_bit in low_edges_components]
+    reachable_components = np.ones(len(low_states_bits[0]) if low_states_bits else 1, dtype=np.uint64)
+    reachability_is_changed = True
+    while reachability_is_changed:
+        reachability_is_changed = False
+        for (first_bit, second_bit, both_bits), edge_works in zip(low_edges_bits, low_states_bits):
+            if first_bit == second_bit:
+                continue
+            edge_touches_reachable = ((reachable_components >> first_bit) | (reachable_components >> second_bit))
+            new_reachable_components = reachable_components | (
+                (edge_touches_reachable & np.uint64(1)).astype(bool) & edge_works) * both_bits
+            if not reachability_is_changed and np.any(new_reachable_components != reachable_components):
+                reachability_is_changed = True
+            reachable_components = new_reachable_components
+    return ((reachable_components >> np.uint64(1)) & np.uint64(1)).astype(bool)
+
+
+def _iterate_high_states(nodes_amount, high_edges, fixed_high_states):
+    """States of high edges (first edges are fixed) in order of binary counter and components of working edges
+
+    Next state of counter: trailing working edges stop to work, then one edge starts to work. Edges of lower bits
+    were the last unions, so they are removed by rollback in reverse order, and union-find is never built again
+    (2 operations per state on average).
+    """
+    fixed_amount = len(fixed_high_states)
+    high_states = list(fixed_high_states) + [0] * (len(high_edges) - fixed_amount)
+    components = _ComponentsOfNodes(nodes_amount, [high_edges[one_edge_ind]
+                                                   for one_edge_ind, one_state in enumerate(high_states) if one_state])
+    for one_step in range(2 ** (len(high_edges) - fixed_amount)):
+        # every state of high edges is checked together with 2ᴸ states of low edges, so check costs nothing
+        check_cancelled("Exhaustive search")
+        if one_step > 0:
+            # index of the lowest set bit of step number: lower bits are 1 -> 0, this bit is 0 -> 1
+            flipped_bit = (one_step & -one_step).bit_length() - 1
+            for one_bit in range(flipped_bit):
+                high_states[fixed_amount + one_bit] = 0
+                components.rollback()
+            high_states[fixed_amount + flipped_bit] = 1
+            components.union(*high_edges[fixed_amount + flipped_bit])
+        yield high_states, components
+
+
+def _get_low_states_bits(low_edges_amount):
+    low_states_indexes = np.arange(2 ** low_edges_amount, dtype=np.uint32)
+    return [((low_states_indexes >> one_edge_ind) & 1).astype(bool) for one_edge_ind in range(low_edges_amount)]
+
+
+def _calculate_states_shard(arg_shard_task):
+    """Sum of probabilities of connected states, where first high edges have fixed states (one shard)"""
+    (nodes_amount, high_edges, low_edges, arg_source, arg_target,
+     probabilities_matrix, high_columns, low_columns, fixed_high_states) = arg_shard_task
+    low_states_bits = _get_low_states_bits(len(low_edges))
+    low_states_weights = _get_low_states_weights(probabilities_matrix[:, low_columns])
+    high_probabilities = probabilities_matrix[:, high_columns]
+    # components of low edges -> probability, that low edges connect source and target
+    connected_low_states_weights = {}
+    all_results = np.zeros(probabilities_matrix.shape[0])
+    for high_states, components in _iterate_high_states(nodes_amount, high_edges, fixed_high_states):
+        high_states_weights = np.prod(np.where(high_states, high_probabilities, 1 - high_probabilities), axis=1)
+        low_edges_components = _get_low_edges_components(components, low_edges, arg_source, arg_target)
+        if low_edges_components not in connected_low_states_weights:
+            connected_low_states_weights[low_edges_components] = low_states_weights @ _get_connected_low_states(
+                low_edges_components, low_states_bits)
+        all_results += high_states_weights * connected_low_states_weights[low_edges_components]
+    return all_results
+
+
+def _count_states_shard(arg_shard_task):
+    """Nᵢ - amount of connected states with i working edges, where first high edges have fixed states"""
+    (nodes_amount, high_edges, low_edges, arg_source, arg_target, _, _, _, fixed_high_states) = arg_shard_task
+    low_states_bits = _get_low_states_bits(len(low_edges))
+    # amount of working low edges in every state of low edges
+    low_working_amounts = np.sum(low_states_bits, axis=0, dtype=np.int64) if low_edges else np.zeros(1, np.int64)
+    # components of low edges -> amounts of connected low states by amount of working low edges
+    connected_low_counts = {}
+    states_counts = np.zeros(len(high_edges) + len(low_edges) + 1, dtype=np.int64)
+    for high_states, components in _iterate_high_states(nodes_amount, high_edges, fixed_high_states):
+        low_edges_components = _get_low_edges_components(components, low_edges, arg_source, arg_target)
+        if low_edges_components not in connected_low_counts:
+            connected_low_counts[low_edges_components] = np.bincount(
+                low_working_amounts[_get_connected_low_states(low_edges_components, low_states_bits)],
+                minlength=len(low_edges) + 1)
+        high_working_amount = sum(high_states)
+        states_counts[high_working_amount:high_working_amount + len(low_edges) + 1] += \
+            connected_low_counts[low_edges_components]
+    return states_counts
+
+
+# pools of processes by amount of processes, they are started once and used by all evaluators (start of processes
+# is longer than calculation of small shards); processes are started by "spawn", because fork of process with
+# threads (e.g. worker thread of window) can copy locks, which are held by other threads
+_processes_pools = {}
+_processes_pools_lock = threading.Lock()
+# shards of pool are checked for cancel with this period
+_seconds_between_checks = 0.1
+
+
+def _map_by_processes(processes_amount, shard_function, all_shard_tasks):
+    with _processes_pools_lock:
+        if processes_amount not in _processes_pools:
+            _processes_pools[processes_amount] = ProcessPoolExecutor(
+                max_workers=processes_amount, mp_context=multiprocessing.get_context("spawn"))
+        processes_pool = _processes_pools[processes_amount]
+    try:
+        all_shard_futures = [processes_pool.submit(shard_function, one_task) for one_task in all_shard_tasks]
+        # processes don't know budgets of this thread, so cancel is checked while shards are waited for
+        not_done_futures = all_shard_futures
+        while not_done_futures:
+            check_cancelled("Exhaustive search")
+            _, not_done_futures = wait(not_done_futures, timeout=_seconds_between_checks)
+        return [one_future.result() for one_future in all_shard_futures]
+    except (BrokenProcessPool, CalculationCancelled):
+        # e.g. process is killed by system, the next call starts new pool; cancelled shards aren't waited for
+        with _processes_pools_lock:
+            if _processes_pools.get(processes_amount) is processes_pool:
+                del _processes_pools[processes_amount]
+        processes_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+class ExhaustiveSearchEvaluator:
+    """Exact value by checking all 2ᵐ states of edges (it's ground truth for all other methods)
+
+    Edges near source (L "low" edges) are checked together by numpy for all their 2ᴸ states, other edges
+    ("high" edges) are changed in order of binary counter, so connectivity of high edges is updated by union of
+    one edge and rollbacks of the last unions (union-find isn't built again). States of high edges are split into
+    shards, which are calculated by shared pool of processes.
+    """
+    max_edges_amount = 36
+    max_low_edges_amount = 16
+    # maximum amount of (scenarios × states of low edges) values calculated at once
+    max_elements_in_chunk = 2 ** 23
+    # there are no processes for small graphs, because starting of pool is longer than calculation
+    min_edges_amount_for_processes = 22
+
+    def __init__(self, all_edges, arg_source, arg_target, processes_amount=None):
+        self.all_edges = [tuple(sorted(one_edge)) for one_edge in all_edges]
+        self.edges_index = get_edges_index(self.all_edges)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        self.processes_amount = processes_amount or os.cpu_count() or 1
+        # edges which can't be reached from source don't change connectivity
+        self.used_edges = get_bfs_edges_order(self.all_edges, arg_source)
+        if len(self.used_edges) > self.max_edges_amount:
+            raise ValueError(f"Exhaustive search checks 2ᵐ states of edges, it's too long for "
+                             f"{len(self.used_edges)} edges (maximum is {self.max_edges_amount})")
+        all_used_nodes = {arg_source, arg_target}
+        for one_edge in self.used_edges:
+            all_used_nodes.update(one_edge)
+        self.nodes_index = {one_node: one_node_ind for one_node_ind, one_node in enumerate(sorted(all_used_nodes))}
+        low_edges_amount = min(len(self.used_edges), self.max_low_edges_amount)
+        # edges near source are low edges: reachability is spread from source by one pass over them
+        self.low_edges = self.used_edges[:low_edges_amount]
+        self.high_edges = self.used_edges[low_edges_amount:]
+
+    def _get_shard_tasks(self, probabilities_matrix):
+        use_processes = self.processes_amount > 1 and len(self.used_edges) >= self.min_edges_amount_for_processes
+        fixed_edges_amount = 0
+        if use_processes:
+            fixed_edges_amount = min(len(self.high_edges), math.ceil(math.log2(self.processes_amount * 4)))
+        high_edges = [(self.nodes_index[first_node], self.nodes_index[second_node])
+                      for first_node, second_node in self.high_edges]
+        low_edges = [(self.nodes_index[first_node], self.nodes_index[second_node])
+                     for first_node, second_node in self.low_edges]
+        high_columns = [self.edges_index[one_edge] for one_edge in self.high_edges]
+        low_columns = [self.edges_index[one_edge] for one_edge in self.low_edges]
+        all_shard_tasks = []
+        for one_shard_ind in range(2 ** fixed_edges_amount):
+            fixed_high_states = [(one_shard_ind >> one_bit) & 1 for one_bit in range(fixed_edges_amount)]
+            all_shard_tasks.append((len(self.nodes_index), high_edges, low_edges,
+                                    self.nodes_index[self.source_node], self.nodes_index[self.target_node],
+                                    probabilities_matrix, high_columns, low_columns, fixed_high_states))
+        return all_shard_tasks, use_processes
+
+    def evaluate(self, probabilities_matrix):
+        if self.source_node == self.target_node:
+            return np.ones(probabilities_matrix.shape[0])
+        scenarios_in_chunk = max(1, self.max_elements_in_chunk // 2 ** len(self.low_edges))
+        all_results = np.zeros(probabilities_matrix.shape[0])
+        for chunk_start in range(0, probabilities_matrix.shape[0], scenarios_in_chunk):
+            chunk_slice = slice(chunk_start, chunk_start + scenarios_in_chunk)
+            all_shard_tasks, use_processes = self._get_shard_tasks(probabilities_matrix[chunk_slice])
+            if use_processes:
+                all_shards_results = _map_by_processes(self.processes_amount, _calculate_states_shard,
+                                                       all_shard_tasks)
+            else:
+                all_shards_results = [_calculate_states_shard(one_task) for one_task in all_shard_tasks]
+            all_results[chunk_slice] = np.sum(all_shards_results, axis=0)
+        return all_results
+
+    def get_reliability_polynomial(self):
+        """Exact Nᵢ (amounts of connected states with i working edges) by the same search over all states"""
+        if self.source_node == self.target_node:
+            return ReliabilityPolynomial([math.comb(len(self.used_edges), working_amount)
+                                          for working_amount in range(len(self.used_edges) + 1)])
+        # probabilities are not used by counting
+        all_shard_tasks, use_processes = self._get_shard_tasks(np.empty((0, len(self.edges_index))))
+        if use_processes:
+            all_shards_counts = _map_by_processes(self.processes_amount, _count_states_shard, all_shard_tasks)
+        else:
+            all_shards_counts = [_count_states_shard(one_task) for one_task in all_shard_tasks]
+        return ReliabilityPolynomial(np.sum(all_shards_counts, axis=0).tolist())
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.01) -> array of numbers"""
+        calculated_values = self.evaluate(get_uniform_probabilities_matrix(arg_general_edge_values,
+                                                                           len(self.edges_index)))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
@@ -0,0 +1,114 @@
+"""Formula as lines of terms (e.g. one term for every simple path), text of whole formula isn't made by methods
+
+Formula with thousands of paths is shown by rows (prefix of line, then every term in its own row), so view asks
+only rows which are visible. Whole text is made only by str() or write_text (e.g. export to file).
+"""
+
+
+class MappedTerms:
+    """Terms which are made only when they are read: term i is get_item_term(all_items[i])
+
+    E.g. all_items is PathSet, so text of path isn't kept in memory (get_item_term must be module-level function,
+    then formula can be pickled by cache of results).
+    """
+
+    def __init__(self, all_items, get_item_term):
+        self.all_items = all_items
+        self.get_item_term = get_item_term
+
+    def __len__(self):
+        return len(self.all_items)
+
+    def __getitem__(self, term_ind):
+        return self.get_item_term(self.all_items[term_ind])
+
+    def __iter__(self):
+        for one_item in self.all_items:
+            yield self.get_item_term(one_item)
+
+
+class FormulaText:
+    """Lines of formula: line is prefix + separator.join(terms) + suffix, lines are joined by new line
+
+    Lists of terms can be filled after adding of line (terms are added while paths are found).
+    """
+
+    def __init__(self):
+        # [prefix, list of terms, separator, suffix] for every line
+        self.lines = []
+
+    @classmethod
+    def from_text(cls, formula_text):
+        """Short formula without terms, every line of text is one line (one row)"""
+        new_formula = cls()
+        for one_text_line in str(formula_text).split("\n"):
+            new_formula.add_line(one_text_line)
+        return new_formula
+
+    def add_line(self, line_prefix, all_terms=None, terms_separator=" ", line_suffix=""):
+        """Returns list of terms of new line, so terms can be appended later (all_terms can be MappedTerms)"""
+        all_terms = [] if all_terms is None else all_terms
+        self.lines.append([line_prefix, all_terms, terms_separator, line_suffix])
+        return all_terms
+
+    def extend(self, other_formula):
+        # lists of terms are shared, they aren't copied
+        self.lines.extend(other_formula.lines)
+
+    @property
+    def terms_amount(self):
+        return sum(len(one_line[1]) for one_line in self.lines)
+
+    def get_summary(self):
+        return f"{len(self.lines)} lines, {self.terms_amount} terms, {len(self)} rows"
+
+    def _get_line_rows_amount(self, one_line):
+        # prefix, every term, suffix (if it isn't empty)
+        return 1 + len(one_line[1]) + (1 if one_line[3] else 0)
+
+    def __len__(self):
+        return sum(self._get_line_rows_amount(one_line) for one_line in self.lines)
+
+    def get_row(self, row_ind):
+        """Text of one row: prefix of line or "  12: (1 - p₁₋₂×p₂₋₄)" for term (terms are numbered from 1)"""
+        for line_prefix, all_terms, _, line_suffix in self.lines:
+            line_rows_amount = self._get_line_rows_amount((line_prefix, all_terms, None, line_suffix))
+            if row_ind >= line_rows_amount:
+                row_ind -= line_rows_amount
+                continue
+            if row_ind == 0:
+                return line_prefix
+            if row_ind <= len(all_terms):
+                return f"  {row_ind}: {all_terms[row_ind - 1]}"
+            return line_suffix
+        raise IndexError("Row of formula is out of range")
+
+    def find_row(self, search_text, start_row=0):
+        """Index of the first row from start_row (then from beginning), which contains text (case is ignored)"""
+        search_text = search_text.lower()
+        if not search_text:
+            return None
+        rows_amount = len(self)
+        for one_row_ind in list(range(start_row, rows_amount)) + list(range(min(start_row, rows_amount))):
+            if search_text in self.get_row(one_row_ind).lower():
+                return one_row_ind
+        return None
+
+    def iterate_text_parts(self):
+        for one_line_ind, (line_prefix, all_terms, terms_separator, line_suffix) in enumerate(self.lines):
+            if one_line_ind > 0:
+                yield "\n"
+            yield line_prefix
+            for one_term_ind, one_term in enumerate(all_terms):
+                if one_term_ind > 0:
+                    yield terms_separator
+                yield one_term
+            yield line_suffix
+
+    def write_text(self, text_file):
+        # text goes to file by parts, whole text isn't kept in memory
+        for one_text_part in self.iterate_text_parts():
+            text_file.write(one_text_part)
+
+    def __str__(self):
+        return "".join(self.iterate_text_parts())
@@ -0,0 +1,97 @@
+"""Minimum cuts of all pairs of nodes by Gomory-Hu tree (n - 1 max-flow calculations instead of n²)"""
+import functools
+
+import networkx as nx
+
+
+class AllPairsMinimumCuts:
+    """Table of minimum edge cuts of all pairs of nodes (all edges have capacity 1)
+
+    Every edge (u, v) of Gomory-Hu tree splits tree into two sides, and edges of graph between these sides are
+    minimum u-v cut. Minimum x-y cut is the cut of the lightest tree edge on path between x and y.
+    """
+
+    def __init__(self, arg_defined_graph):
+        self.all_nodes = list(arg_defined_graph.nodes)
+        # node -> index of connected component (pairs of different components have empty cut)
+        self.nodes_components = {}
+        self.all_trees = []
+        # (u, v) edge of tree -> minimum cut (list of edges of graph)
+        self.tree_edges_cuts = {}
+        for component_ind, component_nodes in enumerate(nx.connected_components(arg_defined_graph)):
+            for one_node in component_nodes:
+                self.nodes_components[one_node] = component_ind
+            component_graph = nx.Graph()
+            component_graph.add_nodes_from(component_nodes)
+            # edges without 'capacity' have infinite capacity for networkx, so every edge gets capacity 1
+            component_graph.add_edges_from(arg_defined_graph.subgraph(component_nodes).edges, capacity=1)
+            if len(component_nodes) > 1:
+                component_tree = nx.gomory_hu_tree(component_graph)
+            else:
+                component_tree = component_graph
+            self.all_trees.append(component_tree)
+            for first_node, second_node in component_tree.edges:
+                first_side = self._get_tree_side(component_tree, first_node, second_node)
+                self.tree_edges_cuts[(first_node, second_node)] = [
+                    tuple(sorted(one_edge)) for one_edge in nx.edge_boundary(component_graph, first_side)
+                ]
+
+    @staticmethod
+    def _get_tree_side(component_tree, first_node, second_node):
+        # nodes of tree, which stay with first node after removing of tree edge (first node, second node)
+        first_side = {first_node}
+        nodes_stack = [first_node]
+        while nodes_stack:
+            one_node = nodes_stack.pop()
+            for another_node in component_tree.neighbors(one_node):
+                if another_node not in first_side and {one_node, another_node} != {first_node, second_node}:
+                    first_side.add(another_node)
+                    nodes_stack.append(another_node)
+        return first_side
+
+    def _get_tree_edge(self, first_node, second_node):
+        # the lightest edge of tree on path between nodes (None -> nodes are not connected)
+        if first_node == second_node or self.nodes_components[first_node] != self.nodes_components[second_node]:
+            return None
+        component_tree = self.all_trees[self.nodes_components[first_node]]
+        tree_path = nx.shortest_path(component_tree, first_node, second_node)
+        lightest_edge = min(zip(tree_path, tree_path[1:]),
+                            key=lambda one_tree_edge: component_tree.edges[one_tree_edge]["weight"])
+        return lightest_edge if lightest_edge in self.tree_edges_cuts else lightest_edge[::-1]
+
+    def get_minimum_cut_size(self, first_node, second_node):
+        tree_edge = self._get_tree_edge(first_node, second_node)
+        return 0 if tree_edge is None else len(self.tree_edges_cuts[tree_edge])
+
+    def get_minimum_cut(self, first_node, second_node):
+        tree_edge = self._get_tree_edge(first_node, second_node)
+        return [] if tree_edge is None else list(self.tree_edges_cuts[tree_edge])
+
+    def get_all_minimum_cuts(self, only_global_minimum=False):
+        """Different minimum cuts of all pairs of nodes (every such cut is cut of some edge of tree)"""
+        all_minimum_cuts = []
+        found_cuts = set()
+        for one_cut in self.tree_edges_cuts.values():
+            if frozenset(one_cut) not in found_cuts:
+                found_cuts.add(frozenset(one_cut))
+                all_minimum_cuts.append(list(one_cut))
+        if only_global_minimum and len(self.all_trees) > 1:
+            return [[]]  # graph is not connected, so global minimum cut is empty
+        if only_global_minimum and all_minimum_cuts:
+            global_minimum_size = min(len(one_cut) for one_cut in all_minimum_cuts)
+            all_minimum_cuts = [one_cut for one_cut in all_minimum_cuts if len(one_cut) == global_minimum_size]
+        return all_minimum_cuts
+
+
+@functools.lru_cache(maxsize=32)
+def _get_cached_all_pairs_minimum_cuts(all_nodes, all_edges):
+    cached_graph = nx.Graph()
+    cached_graph.add_nodes_from(all_nodes)
+    cached_graph.add_edges_from(all_edges)
+    return AllPairsMinimumCuts(cached_graph)
+
+
+def get_all_pairs_minimum_cuts(arg_defined_graph):
+    """Table is built once for graph (its nodes and edges), then it's taken from cache"""
+    all_edges = tuple(tuple(sorted(one_edge)) for one_edge in arg_defined_graph.edges)
+    return _get_cached_all_pairs_minimum_cuts(tuple(arg_defined_graph.nodes), all_edges)
@@ -0,0 +1,450 @@
+"""Reductions of graph before enumeration of paths and cuts, which keep two-terminal reliability
+
+P(source ~ target) of original graph = Ω × P(source' ~ target') of reduced graph, where Ω and probabilities of
+edges of reduced graph are functions of probabilities of original edges:
+- edges which aren't on any simple s-t path are removed (other components, dangling trees, blocks outside of s-t
+  part of block-cut tree): edge is on simple s-t path iff it's in one biconnected component with extra edge s-t;
+- edges with fixed p = 0 are deleted, edges with fixed p = 1 are contracted (e.g. sliders at 0 or 1);
+- parallel edges -> one edge with p = 1 - (1 - p₁)(1 - p₂);
+- series edges (node of degree 2, which isn't terminal) -> one edge with p = p₁×p₂;
+- terminal of degree 1 -> p of its edge goes to Ω, next node becomes terminal;
+- polygon to chain: triangle x-a-b, where terminal x has degree 2, is replaced by chain a-x-b with p₁', p₂' and
+  factor Ω, which give the same probabilities that x is connected with a only, with b only and with both.
+Every edge of reduced graph keeps its expression over original edges, so values are calculated for any matrix of
+probabilities of original edges, and formulas are shown with legend in original labels.
+"""
+import itertools
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    get_uniform_probabilities_matrix,
+    return_like_input,
+)
+from functional_stability.formula_text import FormulaText
+
+# names of reductions -> texts for summary of reduction
+all_reductions_names = OrderedDict([
+    ("removed", "edges aren't on any path between terminals"),
+    ("deleted", "edges with p = 0"),
+    ("contracted", "edges with p = 1"),
+    ("parallel", "parallel merges"),
+    ("series", "series merges"),
+    ("terminal", "terminal edges"),
+    ("polygon", "polygons to chains"),
+])
+
+
+def get_polygon_values(first_probabilities, second_probabilities, third_probabilities):
+    """x-a (p₁), x-b (p₂), a-b (p₃) -> p₁' of a-x, p₂' of x-b and Ω of chain a-x-b
+
+    Chain gives Ω p₁'p₂' = P(x ~ a and x ~ b), Ω p₁'(1 - p₂') = P(x ~ a only), Ω (1 - p₁')p₂' = P(x ~ b only).
+    """
+    both_connected = (first_probabilities * second_probabilities + first_probabilities * third_probabilities
+                      + second_probabilities * third_probabilities
+                      - 2 * first_probabilities * second_probabilities * third_probabilities)
+    only_first_connected = first_probabilities * (1 - second_probabilities) * (1 - third_probabilities)
+    only_second_connected = (1 - first_probabilities) * second_probabilities * (1 - third_probabilities)
+    is_both_possible = both_connected > 0
+    # if x can't be connected with both, only one of other probabilities isn't 0 and p' is 0 or 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first_chain_probabilities = np.where(is_both_possible,
+                                             both_connected / (both_connected + only_second_connected),
+                                             both_connected + only_first_connected > 0)
+        second_chain_probabilities = np.where(is_both_possible,
+                                              both_connected / (both_connected + only_first_connected),
+                                              both_connected + only_second_connected > 0)
+        chain_factors = np.where(is_both_possible, (both_connected + only_first_connected)
+                                 * (both_connected + only_second_connected) / both_connected,
+                                 both_connected + only_first_connected + only_second_connected)
+    return first_chain_probabilities.astype(float), second_chain_probabilities.astype(float), chain_factors
+
+
+class GraphReduction:
+    """Reduced graph (nx.Graph), its terminals and expressions of its edges and of factor Ω over original edges
+
+    Operations are ("edge", column of original edge), ("constant", value), ("series", i, j), ("parallel", i, j),
+    ("polygon first" / "polygon second" / "polygon factor", i, j, k), where i, j, k are indices of operations,
+    so every operation is calculated once for all scenarios.
+    fixed_edges_values: {(0, 1): 1., ...}, only values 0 and 1 are used (compiled functions keep them).
+    """
+
+    def __init__(self, all_edges, arg_source, arg_target, fixed_edges_values=None):
+        self.edges_index = get_edges_index(all_edges)
+        self.all_edges = list(self.edges_index)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        self.fixed_edges_values = {tuple(sorted(one_edge)): float(one_value)
+                                   for one_edge, one_value in (fixed_edges_values or {}).items()
+                                   if one_value in (0, 1) and tuple(sorted(one_edge)) in self.edges_index}
+        self.all_operations = []
+        self.factors_operations = []
+        self.reductions_amounts = dict.fromkeys(all_reductions_names, 0)
+        # edge id -> [first node, second node, operation], node -> ids of its edges
+        self.edges_info = {}
+        self.nodes_edges = {arg_source: set(), arg_target: set()}
+        self.new_edge_id = itertools.count()
+        self.reduced_source = arg_source
+        self.reduced_target = arg_target
+        contracted_edges = []
+        for one_edge, one_edge_ind in self.edges_index.items():
+            one_fixed_value = self.fixed_edges_values.get(one_edge)
+            if one_fixed_value == 0:
+                self.reductions_amounts["deleted"] += 1
+                continue
+            one_operation = (self._add_operation("constant", 1.) if one_fixed_value == 1 else
+                             self._add_operation("edge", one_edge_ind))
+            one_edge_id = self._add_edge(one_edge[0], one_edge[1], one_operation)
+            if one_fixed_value == 1:
+                contracted_edges.append(one_edge_id)
+        if arg_source != arg_target:
+            for one_edge_id in contracted_edges:
+                self._contract_edge(one_edge_id)
+            self._reduce()
+        self.reduced_graph = nx.Graph()
+        self.reduced_graph.add_nodes_from(self.nodes_edges)
+        # edge of reduced graph -> its operation
+        self.reduced_edges_operations = {}
+        for one_edge_id in sorted(self.edges_info):
+            first_node, second_node, one_operation = self.edges_info[one_edge_id]
+            self.reduced_graph.add_edge(first_node, second_node)
+            self.reduced_edges_operations[tuple(sorted((first_node, second_node)))] = one_operation
+
+    @property
+    def is_trivial(self):
+        """Nothing is reduced, so original graph can be used as it is"""
+        return not any(self.reductions_amounts.values())
+
+    def _add_operation(self, *one_operation):
+        self.all_operations.append(one_operation)
+        return len(self.all_operations) - 1
+
+    def _add_edge(self, first_node, second_node, one_operation):
+        one_edge_id = next(self.new_edge_id)
+        self.edges_info[one_edge_id] = [first_node, second_node, one_operation]
+        self.nodes_edges.setdefault(first_node, set()).add(one_edge_id)
+        self.nodes_edges.setdefault(second_node, set()).add(one_edge_id)
+        return one_edge_id
+
+    def _remove_edge(self, one_edge_id):
+        first_node, second_node, one_operation = self.edges_info.pop(one_edge_id)
+        self.nodes_edges[first_node].discard(one_edge_id)
+        self.nodes_edges[second_node].discard(one_edge_id)
+        return one_operation
+
+    def _remove_node_if_unused(self, one_node):
+        if not self.nodes_edges.get(one_node) and one_node not in (self.reduced_source, self.reduced_target):
+            self.nodes_edges.pop(one_node, None)
+
+    def _get_other_node(self, one_edge_id, one_node):
+        first_node, second_node, _ = self.edges_info[one_edge_id]
+        return second_node if first_node == one_node else first_node
+
+    def _contract_edge(self, one_edge_id):
+        if one_edge_id not in self.edges_info:
+            return  # it was parallel to other contracted edge
+        first_node, second_node, _ = self.edges_info[one_edge_id]
+        terminals = (self.reduced_source, self.reduced_target)
+        if first_node in terminals and second_node in terminals:
+            return  # source and target are connected for sure, edge with p = 1 stays
+        kept_node, merged_node = ((second_node, first_node) if second_node in terminals else
+                                  (first_node, second_node))
+        for another_edge_id in list(self.nodes_edges[merged_node]):
+            another_node = self._get_other_node(another_edge_id, merged_node)
+            another_operation = self._remove_edge(another_edge_id)
+            if another_node in (kept_node, merged_node):
+                continue  # loop doesn't change connectivity
+            self._add_edge(kept_node, another_node, another_operation)
+        del self.nodes_edges[merged_node]
+        self.reductions_amounts["contracted"] += 1
+
+    def _reduce(self):
+        is_changed = True
+        while is_changed:
+            is_changed = self._remove_irrelevant_edges()
+            is_changed = self._merge_parallel_edges() or is_changed
+            is_changed = self._merge_series_edges() or is_changed
+            is_changed = self._move_terminals() or is_changed
+            is_changed = self._replace_polygons() or is_changed
+
+    def _remove_irrelevant_edges(self):
+        simple_graph = nx.Graph()
+        simple_graph.add_nodes_from(self.nodes_edges)
+        simple_graph.add_edges_from(one_edge_info[:2] for one_edge_info in self.edges_info.values())
+        simple_graph.add_edge(self.reduced_source, self.reduced_target)
+        relevant_nodes = next(one_component for one_component in nx.biconnected_components(simple_graph)
+                              if self.reduced_source in one_component and self.reduced_target in one_component)
+        is_changed = False
+        for one_edge_id, (first_node, second_node, _) in list(self.edges_info.items()):
+            if first_node not in relevant_nodes or second_node not in relevant_nodes:
+                self._remove_edge(one_edge_id)
+                self.reductions_amounts["removed"] += 1
+                is_changed = True
+        for one_node in list(self.nodes_edges):
+            self._remove_node_if_unused(one_node)
+        return is_changed
+
+    def _merge_parallel_edges(self):
+        all_edges_ids = {}
+        for one_edge_id, (first_node, second_node, _) in self.edges_info.items():
+            all_edges_ids.setdefault(frozenset((first_node, second_node)), []).append(one_edge_id)
+        is_changed = False
+        for all_parallel_ids in all_edges_ids.values():
+            if len(all_parallel_ids) < 2:
+                continue
+            first_node, second_node, merged_operation = self.edges_info[all_parallel_ids[0]]
+            self._remove_edge(all_parallel_ids[0])
+            for one_edge_id in all_parallel_ids[1:]:
+                merged_operation = self._add_operation("parallel", merged_operation, self._remove_edge(one_edge_id))
+                self.reductions_amounts["parallel"] += 1
+            self._add_edge(first_node, second_node, merged_operation)
+            is_changed = True
+        return is_changed
+
+    def _merge_series_edges(self):
+        is_changed = False
+        for one_node in list(self.nodes_edges):
+            if one_node in (self.reduced_source, self.reduced_target) or len(self.nodes_edges.get(one_node, ())) != 2:
+                continue
+            first_edge_id, second_edge_id = self.nodes_edges[one_node]
+            first_node = self._get_other_node(first_edge_id, one_node)
+            second_node = self._get_other_node(second_edge_id, one_node)
+            if first_node == second_node:
+                continue  # parallel edges are merged first
+            series_operation = self._add_operation("series", self._remove_edge(first_edge_id),
+                                                   self._remove_edge(second_edge_id))
+            del self.nodes_edges[one_node]
+            self._add_edge(first_node, second_node, series_operation)
+            self.reductions_amounts["series"] += 1
+            is_changed = True
+        return is_changed
+
+    def _move_terminals(self):
+        # P(s ~ t) = p(s, a) × P(a ~ t), if s has only edge (s, a)
+        is_changed = False
+        for is_source in (True, False):
+            one_terminal = self.reduced_source if is_source else self.reduced_target
+            other_terminal = self.reduced_target if is_source else self.reduced_source
+            if len(self.nodes_edges[one_terminal]) != 1:
+                continue
+            (one_edge_id,) = self.nodes_edges[one_terminal]
+            next_node = self._get_other_node(one_edge_id, one_terminal)
+            if next_node == other_terminal:
+                continue  # the last edge between terminals
+            self.factors_operations.append(self._remove_edge(one_edge_id))
+            del self.nodes_edges[one_terminal]
+            if is_source:
+                self.reduced_source = next_node
+            else:
+                self.reduced_target = next_node
+            self.reductions_amounts["terminal"] += 1
+            is_changed = True
+        return is_changed
+
+    def _replace_polygons(self):
+        is_changed = False
+        for one_terminal in (self.reduced_source, self.reduced_target):
+            if len(self.nodes_edges[one_terminal]) != 2:
+                continue
+            first_edge_id, second_edge_id = self.nodes_edges[one_terminal]
+            first_node = self._get_other_node(first_edge_id, one_terminal)
+            second_node = self._get_other_node(second_edge_id, one_terminal)
+            third_edge_id = next((another_edge_id for another_edge_id in self.nodes_edges[first_node]
+                                  if self._get_other_node(another_edge_id, first_node) == second_node), None)
+            if first_node == second_node or third_edge_id is None:
+                continue
+            polygon_operations = (self._remove_edge(first_edge_id), self._remove_edge(second_edge_id),
+                                  self._remove_edge(third_edge_id))
+            self._add_edge(first_node, one_terminal, self._add_operation("polygon first", *polygon_operations))
+            self._add_edge(one_terminal, second_node, self._add_operation("polygon second", *polygon_operations))
+            self.factors_operations.append(self._add_operation("polygon factor", *polygon_operations))
+            self.reductions_amounts["polygon"] += 1
+            is_changed = True
+        return is_changed
+
+    def _get_operations_values(self, probabilities_matrix):
+        all_values = []
+        for one_operation in self.all_operations:
+            operation_kind = one_operation[0]
+            if operation_kind == "edge":
+                one_values = probabilities_matrix[:, one_operation[1]]
+            elif operation_kind == "constant":
+                one_values = np.full(probabilities_matrix.shape[0], one_operation[1])
+            elif operation_kind == "series":
+                one_values = all_values[one_operation[1]] * all_values[one_operation[2]]
+            elif operation_kind == "parallel":
+                one_values = 1 - (1 - all_values[one_operation[1]]) * (1 - all_values[one_operation[2]])
+            else:
+                polygon_values = get_polygon_values(*[all_values[one_ind] for one_ind in one_operation[1:]])
+                one_values = polygon_values[("polygon first", "polygon second", "polygon factor").index(operation_kind)]
+            all_values.append(one_values)
+        return all_values
+
+    def get_reduced_matrix(self, probabilities_matrix, reduced_edges_index):
+        """Array (N scenarios, m original edges) -> probabilities of reduced edges (in order of reduced_edges_index)
+        and array (N scenarios) of factor Ω"""
+        all_values = self._get_operations_values(probabilities_matrix)
+        reduced_matrix = np.empty((probabilities_matrix.shape[0], len(reduced_edges_index)))
+        for one_edge, one_edge_ind in reduced_edges_index.items():
+            reduced_matrix[:, one_edge_ind] = all_values[self.reduced_edges_operations[one_edge]]
+        all_factors = np.ones(probabilities_matrix.shape[0])
+        for one_operation in self.factors_operations:
+            all_factors = all_factors * all_values[one_operation]
+        return reduced_matrix, all_factors
+
+    def get_summary(self):
+        return ", ".join(f"{one_amount} {all_reductions_names[one_name]}"
+                         for one_name, one_amount in self.reductions_amounts.items() if one_amount)
+
+    def get_legend(self, get_edge_name, original_name, reduced_name, uniform=False):
+        """FormulaText: Ω and probabilities of reduced edges in original labels (in 'p', if uniform)"""
+        operations_texts = _OperationsTexts(self, get_edge_name, uniform)
+        legend_formula = FormulaText()
+        factors_texts = [operations_texts.get_factor_text(one_operation) for one_operation in self.factors_operations]
+        legend_formula.add_line(f"{original_name} = " + "".join(f"{one_text} × " for one_text in factors_texts)
+                                + f"{reduced_name}', {reduced_name}' - the same value for reduced graph of "
+                                  f"{len(self.reduced_edges_operations)} edges (reductions: {self.get_summary()})")
+        edges_terms = legend_formula.add_line("Edges of reduced graph: ", terms_separator=", ")
+        for one_edge, one_operation in self.reduced_edges_operations.items():
+            if not uniform and self.all_operations[one_operation] == ("edge", self.edges_index.get(one_edge)):
+                continue  # the same edge as in original graph
+            edges_terms.append(f"{get_edge_name(one_edge)} = {operations_texts.get_text(one_operation)}")
+        if not edges_terms:
+            edges_terms.append("the same as in original graph")
+        if operations_texts.polygons_names:
+            legend_formula.add_line("where ", operations_texts.get_polygons_terms(), ", ")
+        return legend_formula
+
+
+class _OperationsTexts:
+    """Texts of operations of GraphReduction, polygons get names A₁, B₁, C₁ (and Ω₁ for factor)"""
+    subscript_numbers = "₀₁₂₃₄₅₆₇₈₉"
+
+    def __init__(self, graph_reduction, get_edge_name, uniform):
+        self.graph_reduction = graph_reduction
+        self.get_edge_name = get_edge_name
+        self.uniform = uniform
+        self.polygons_names = {}  # operations of polygon (i, j, k) -> its number
+
+    def _get_polygon_number(self, polygon_operations):
+        if polygon_operations not in self.polygons_names:
+            self.polygons_names[polygon_operations] = "".join(
+                self.subscript_numbers[int(one_digit)] for one_digit in str(len(self.polygons_names) + 1))
+        return self.polygons_names[polygon_operations]
+
+    def _get_flat_operations(self, one_operation, operation_kind):
+        # series of series (parallel of parallel) -> list of all parts
+        if self.graph_reduction.all_operations[one_operation][0] != operation_kind:
+            return [one_operation]
+        return [one_part for one_child in self.graph_reduction.all_operations[one_operation][1:]
+                for one_part in self._get_flat_operations(one_child, operation_kind)]
+
+    @staticmethod
+    def _join_with_powers(all_parts_texts, parts_separator):
+        # equal parts are shown once with power: p×p×p -> p³, (1 - p)(1 - p) -> (1 - p)²
+        parts_amounts = OrderedDict()
+        for one_text in all_parts_texts:
+            parts_amounts[one_text] = parts_amounts.get(one_text, 0) + 1
+        superscript_numbers = "⁰¹²³⁴⁵⁶⁷⁸⁹"
+        return parts_separator.join(one_text + ("".join(superscript_numbers[int(one_digit)]
+                                                        for one_digit in str(one_amount)) if one_amount > 1 else "")
+                                    for one_text, one_amount in parts_amounts.items())
+
+    def get_text(self, one_operation):
+        operation_info = self.graph_reduction.all_operations[one_operation]
+        operation_kind = operation_info[0]
+        if operation_kind == "edge":
+            return "p" if self.uniform else self.get_edge_name(self.graph_reduction.all_edges[operation_info[1]])
+        if operation_kind == "constant":
+            return f"{operation_info[1]:g}"
+        if operation_kind == "series":
+            return self._join_with_powers([self.get_factor_text(one_part)
+                                           for one_part in self._get_flat_operations(one_operation, "series")], "×")
+        if operation_kind == "parallel":
+            return "1 - " + self._join_with_powers([self.get_complement_text(one_part) for one_part
+                                                    in self._get_flat_operations(one_operation, "parallel")], "")
+        polygon_number = self._get_polygon_number(operation_info[1:])
+        if operation_kind == "polygon first":
+            return f"A{polygon_number} / (A{polygon_number} + C{polygon_number})"
+        if operation_kind == "polygon second":
+            return f"A{polygon_number} / (A{polygon_number} + B{polygon_number})"
+        return f"Ω{polygon_number}"
+
+    def get_factor_text(self, one_operation):
+        # part of product: text of sum or fraction is inside brackets
+        one_text = self.get_text(one_operation)
+        if self.graph_reduction.all_operations[one_operation][0] in ("parallel", "polygon first", "polygon second"):
+            return f"({one_text})"
+        return one_text
+
+    def get_complement_text(self, one_operation):
+        # (1 - x)
+        one_text = self.get_text(one_operation)
+        if self.graph_reduction.all_operations[one_operation][0] in ("parallel", "polygon first", "polygon second"):
+            return f"(1 - ({one_text}))"
+        return f"(1 - {one_text})"
+
+    def get_polygons_terms(self):
+        """Definitions of A, B, C and Ω of every named polygon (x-a, x-b, a-b edges -> x, y, z)"""
+        all_terms = []
+        named_polygons = set()
+        while len(named_polygons) < len(self.polygons_names):
+            # texts of polygon can name other polygons, so loop goes until all names are defined
+            for polygon_operations, polygon_number in list(self.polygons_names.items()):
+                if polygon_operations in named_polygons:
+                    continue
+                named_polygons.add(polygon_operations)
+                x_text, y_text, z_text = [self.get_factor_text(one_part) for one_part in polygon_operations]
+                x_complement, y_complement, z_complement = [self.get_complement_text(one_part)
+                                                            for one_part in polygon_operations]
+                all_terms += [
+                    f"A{polygon_number} = {self._join_with_powers([x_text, y_text], '×')} + "
+                    f"{self._join_with_powers([x_text, z_text], '×')} + "
+                    f"{self._join_with_powers([y_text, z_text], '×')} - "
+                    f"2×{self._join_with_powers([x_text, y_text, z_text], '×')}",
+                    f"B{polygon_number} = {x_text}{y_complement}{z_complement}",
+                    f"C{polygon_number} = {x_complement}{y_text}{z_complement}",
+                    f"Ω{polygon_number} = (A{polygon_number} + B{polygon_number})(A{polygon_number} + "
+                    f"C{polygon_number}) / A{polygon_number}",
+                ]
+        return all_terms
+
+
+class ReducedGraphEvaluator:
+    """Function of reduced graph, which is calculated for probabilities of original edges: Ω × f(reduced p)"""
+
+    def __init__(self, reduced_evaluator, graph_reduction):
+        self.reduced_evaluator = reduced_evaluator
+        self.graph_reduction = graph_reduction
+        self.edges_index = graph_reduction.edges_index
+
+    @property
+    def processes_amount(self):
+        # processes of function of reduced graph (e.g. of exhaustive search)
+        return getattr(self.reduced_evaluator, "processes_amount", 1)
+
+    @processes_amount.setter
+    def processes_amount(self, new_processes_amount):
+        if hasattr(self.reduced_evaluator, "processes_amount"):
+            self.reduced_evaluator.processes_amount = new_processes_amount
+
+    def evaluate(self, probabilities_matrix):
+        reduced_matrix, all_factors = self.graph_reduction.get_reduced_matrix(probabilities_matrix,
+                                                                              self.reduced_evaluator.edges_index)
+        return all_factors * self.reduced_evaluator.evaluate(reduced_matrix)
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p of original edges (edges of reduced graph have other probabilities)"""
+        calculated_values = self.evaluate(get_uniform_probabilities_matrix(arg_general_edge_values,
+                                                                           len(self.edges_index)))
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
@@ -0,0 +1,28 @@
+"""Birnbaum importance of edges: ∂P/∂pₑ = P(pₑ = 1) - P(pₑ = 0) for every edge at once"""
+import numpy as np
+
+from functional_stability.evaluators import get_probabilities_matrix
+
+
+def get_birnbaum_importances(arg_evaluator, arg_all_edges_values):
+    """Array (m,) of importances of edges (in order of columns of evaluator) for one vector of probabilities
+
+    Evaluator with own derivatives (binary decision diagram) gives them in one pass, other evaluators get one
+    matrix of 2m scenarios (pₑ = 1 for every edge, then pₑ = 0 for every edge) and calculate it in one call.
+    """
+    probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, arg_evaluator.edges_index)[:1]
+    if hasattr(arg_evaluator, "get_birnbaum_importances"):
+        return arg_evaluator.get_birnbaum_importances(probabilities_matrix)[0]
+    edges_amount = probabilities_matrix.shape[1]
+    all_scenarios = np.repeat(probabilities_matrix, 2 * edges_amount, axis=0)
+    all_scenarios[np.arange(edges_amount), np.arange(edges_amount)] = 1.
+    all_scenarios[edges_amount + np.arange(edges_amount), np.arange(edges_amount)] = 0.
+    all_values = arg_evaluator.evaluate(all_scenarios)
+    return all_values[:edges_amount] - all_values[edges_amount:]
+
+
+def get_importance_ranking(all_edges, all_importances):
+    """[(edge, importance), ...] from the most important edge"""
+    edges_order = np.argsort(-np.asarray(all_importances), kind="stable")
+    return [(tuple(sorted(all_edges[one_edge_ind])), float(all_importances[one_edge_ind]))
+            for one_edge_ind in edges_order]
@@ -0,0 +1,244 @@
+"""Simple paths and minimal cuts of graph, which are updated after every edit of graph instead of full enumeration
+
+New edge (u, v) adds only paths through it: (path s..u without v) + (path v..t without nodes of first part),
+and deleted edge removes only paths with it. Every minimal cut is kept with its source side S (connected side of
+source, other side is connected too):
+- deleted edge between sides is removed from cut; deleted edge inside side keeps cut only if side stays connected;
+- new edge between sides is added to cut; new cuts appear only if new edge joins two parts of one side, and such
+  side is grown from end of new edge inside other side of old cut, which is crossed by new edge.
+Edits which change component of source (e.g. bridge is deleted) are followed by full enumeration.
+"""
+import functools
+import itertools
+import threading
+
+import networkx as nx
+
+from functional_stability.cuts_enumeration import get_side_cut, is_connected_without, iterate_source_sides
+from functional_stability.paths_enumeration import EnumerationBudget, iterate_with_budget
+
+
+def _with_lock(one_method):
+    # edits (thread of editor) and requests (worker thread of calculation) are done one by one
+    @functools.wraps(one_method)
+    def locked_method(self, *args):
+        with self.lock:
+            return one_method(self, *args)
+    return locked_method
+
+
+class IncrementalPathsAndCuts:
+    """Paths (tuples of nodes) and minimal cuts of the same graph, which is changed by add_edge / remove_edge ...
+
+    If enumeration was stopped by limits, sets are partial and they are not used ('is_complete' is False), then
+    next request of paths or cuts enumerates them again.
+    """
+
+    def __init__(self, arg_defined_graph, arg_source, arg_target, paths_limits=None, cuts_limits=None):
+        self.graph = nx.Graph()
+        self.graph.add_nodes_from(arg_defined_graph.nodes)
+        self.graph.add_edges_from(arg_defined_graph.edges)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        # keyword arguments of EnumerationBudget for full enumeration
+        self.paths_limits = dict(paths_limits or {})
+        self.cuts_limits = dict(cuts_limits or {}, items_name="cuts")
+        self.all_paths = {}  # id -> tuple of nodes
+        self.edges_paths = {}  # edge -> ids of paths with this edge
+        self.new_path_id = itertools.count()
+        self.all_cuts = {}  # source side (frozenset of nodes) -> cut
+        self.component_nodes = frozenset()
+        self.is_complete = False
+        self.needs_enumeration = True
+        self.lock = threading.RLock()
+
+    def _get_neighbours(self, arg_nodes=None):
+        if arg_nodes is None:
+            arg_nodes = self.component_nodes
+        return {one_node: [another_node for another_node in self.graph.neighbors(one_node) if another_node in arg_nodes]
+                for one_node in arg_nodes}
+
+    def _enumerate_all(self):
+        self.needs_enumeration = False
+        self.all_paths.clear()
+        self.edges_paths.clear()
+        self.all_cuts.clear()
+        self.is_complete = self.source_node in self.graph and self.target_node in self.graph
+        if not self.is_complete:
+            return  # source or target is deleted
+        self.component_nodes = frozenset(nx.node_connected_component(self.graph, self.source_node))
+        paths_budget = EnumerationBudget(**self.paths_limits)
+        for one_path in iterate_with_budget(nx.all_simple_paths(self.graph, self.source_node, self.target_node,
+                                                                cutoff=paths_budget.max_path_length),
+                                            paths_budget, lambda one_found_path: len(one_found_path) - 1):
+            self._add_path(one_path)
+        if self.target_node not in self.component_nodes or self.source_node == self.target_node:
+            self.is_complete = paths_budget.is_complete
+            return
+        cuts_budget = EnumerationBudget(**self.cuts_limits)
+        all_neighbours = self._get_neighbours()
+        for source_side in iterate_with_budget(iterate_source_sides(all_neighbours, self.source_node,
+                                                                    self.target_node), cuts_budget, len):
+            self.all_cuts[source_side] = get_side_cut(all_neighbours, source_side)
+        # limit of length of paths gives only part of paths, so it's not complete too
+        self.is_complete = (paths_budget.is_complete and cuts_budget.is_complete
+                            and paths_budget.max_path_length is None)
+
+    def _add_path(self, one_path):
+        one_path_id = next(self.new_path_id)
+        self.all_paths[one_path_id] = tuple(one_path)
+        for one_edge in zip(one_path, one_path[1:]):
+            self.edges_paths.setdefault(tuple(sorted(one_edge)), set()).add(one_path_id)
+
+    def _update_or_enumerate_all(self, update_function):
+        # sets are updated only if they are complete, otherwise they are enumerated again when they are needed
+        if self.needs_enumeration or not self.is_complete:
+            self.needs_enumeration = True
+            return
+        if not update_function():
+            self.needs_enumeration = True
+
+    @_with_lock
+    def matches(self, arg_defined_graph, arg_source, arg_target):
+        """Sets are for the same graph (nodes and undirected edges) and the same terminals"""
+        return (arg_source == self.source_node and arg_target == self.target_node
+                and set(arg_defined_graph.nodes) == set(self.graph.nodes)
+                and {frozenset(one_edge) for one_edge in arg_defined_graph.edges}
+                == {frozenset(one_edge) for one_edge in self.graph.edges})
+
+    @_with_lock
+    def get_paths(self):
+        """Paths (lists of nodes) or None, if they can't be found without limits"""
+        if self.needs_enumeration:
+            self._enumerate_all()
+        return [list(one_path) for one_path in self.all_paths.values()] if self.is_complete else None
+
+    @_with_lock
+    def get_cuts(self):
+        """Minimal cuts (canonical lists of edges) or None, if they can't be found without limits"""
+        if self.needs_enumeration:
+            self._enumerate_all()
+        return [list(one_cut) for one_cut in self.all_cuts.values()] if self.is_complete else None
+
+    @_with_lock
+    def add_node(self, one_node):
+        self.graph.add_node(one_node)  # node without edges changes nothing
+
+    @_with_lock
+    def remove_node(self, one_node):
+        if one_node not in self.graph:
+            return
+        for another_node in list(self.graph.neighbors(one_node)):
+            self.remove_edge(one_node, another_node)
+        self.graph.remove_node(one_node)
+        if one_node in (self.source_node, self.target_node):
+            self.needs_enumeration = True
+
+    @_with_lock
+    def add_edge(self, first_node, second_node):
+        if first_node == second_node or self.graph.has_edge(first_node, second_node):
+            return
+        first_is_used = first_node in self.component_nodes
+        second_is_used = second_node in self.component_nodes
+        self._update_or_enumerate_all(lambda: first_is_used == second_is_used)
+        if first_is_used and second_is_used and not self.needs_enumeration:
+            # paths and cuts are found in graph without new edge, then edge is added
+            new_paths = list(self._iterate_paths_through_edge(first_node, second_node))
+            new_cuts = self._get_cuts_after_adding(first_node, second_node)
+            self.graph.add_edge(first_node, second_node)
+            for one_path in new_paths:
+                self._add_path(one_path)
+            all_neighbours = self._get_neighbours()
+            # cuts of new sides and old cuts, which are crossed by new edge, are found again
+            self.all_cuts = {one_source_side: get_side_cut(all_neighbours, one_source_side)
+                             if one_cut is None or (first_node in one_source_side) != (second_node in one_source_side)
+                             else one_cut for one_source_side, one_cut in new_cuts.items()}
+        else:
+            self.graph.add_edge(first_node, second_node)
+
+    @_with_lock
+    def remove_edge(self, first_node, second_node):
+        if not self.graph.has_edge(first_node, second_node):
+            return
+        self.graph.remove_edge(first_node, second_node)
+        if first_node not in self.component_nodes:
+            return  # edge is not used by any path or cut
+        self._update_or_enumerate_all(
+            lambda: nx.has_path(self.graph, first_node, second_node))  # bridge changes component of source
+        if self.needs_enumeration:
+            return
+        removed_edge = tuple(sorted((first_node, second_node)))
+        for one_path_id in self.edges_paths.pop(removed_edge, ()):
+            for one_edge in zip(self.all_paths[one_path_id], self.all_paths[one_path_id][1:]):
+                if tuple(sorted(one_edge)) != removed_edge:
+                    self.edges_paths[tuple(sorted(one_edge))].discard(one_path_id)
+            del self.all_paths[one_path_id]
+        all_neighbours = self._get_neighbours()
+        for one_source_side in list(self.all_cuts):
+            first_in_side = first_node in one_source_side
+            if first_in_side != (second_node in one_source_side):
+                self.all_cuts[one_source_side] = [one_edge for one_edge in self.all_cuts[one_source_side]
+                                                  if one_edge != removed_edge]
+                continue
+            # both ends are inside one side, so this side must stay connected without edge
+            one_side_nodes = one_source_side if first_in_side else self.component_nodes - one_source_side
+            side_terminal = self.source_node if first_in_side else self.target_node
+            side_neighbours = {one_node: [another_node for another_node in all_neighbours[one_node]
+                                          if another_node in one_side_nodes] for one_node in one_side_nodes}
+            if not is_connected_without(side_neighbours, frozenset(), one_side_nodes, side_terminal):
+                del self.all_cuts[one_source_side]
+
+    def _iterate_paths_through_edge(self, first_node, second_node):
+        for start_node, end_node in ((first_node, second_node), (second_node, first_node)):
+            if start_node == self.target_node or end_node == self.source_node:
+                continue
+            # first part: source..start_node, it can't contain end_node and target
+            first_parts_graph = nx.restricted_view(self.graph, [end_node, self.target_node], [])
+            if start_node == self.source_node:
+                all_first_parts = [[self.source_node]]
+            else:
+                all_first_parts = nx.all_simple_paths(first_parts_graph, self.source_node, start_node)
+            for first_part in all_first_parts:
+                if end_node == self.target_node:
+                    yield first_part + [end_node]
+                    continue
+                second_parts_graph = nx.restricted_view(self.graph, first_part, [])
+                for second_part in nx.all_simple_paths(second_parts_graph, end_node, self.target_node):
+                    yield first_part + second_part
+
+    def _get_cuts_after_adding(self, first_node, second_node):
+        """Old sides (their cuts are updated later) and new sides, which were not connected without new edge"""
+        all_new_cuts = dict(self.all_cuts)
+        all_neighbours = self._get_neighbours()
+        for one_source_side in self.all_cuts:
+            if (first_node in one_source_side) == (second_node in one_source_side):
+                continue
+            source_end, target_end = ((first_node, second_node) if first_node in one_source_side
+                                      else (second_node, first_node))
+            target_side = self.component_nodes - one_source_side
+            # new source side: old side + connected part of target side, which is touched only by new edge
+            for new_part in self._iterate_side_parts(all_neighbours, one_source_side, target_side, target_end,
+                                                     self.target_node):
+                all_new_cuts[one_source_side | new_part] = None
+            # new target side: old target side + connected part of source side, touched only by new edge
+            for new_part in self._iterate_side_parts(all_neighbours, target_side, one_source_side, source_end,
+                                                     self.source_node):
+                all_new_cuts[one_source_side - new_part] = None
+        return all_new_cuts
+
+    @staticmethod
+    def _iterate_side_parts(all_neighbours, fixed_side, other_side, part_start, other_terminal):
+        # connected parts of other side with part_start and without terminal, not adjacent to fixed side,
+        # where rest of other side stays connected
+        if part_start == other_terminal:
+            return
+        fixed_side_neighbours = {another_node for one_node in fixed_side for another_node in all_neighbours[one_node]
+                                 if another_node in other_side}
+        if part_start in fixed_side_neighbours:
+            return
+        other_side_neighbours = {one_node: [another_node for another_node in all_neighbours[one_node]
+                                            if another_node in other_side] for one_node in other_side}
+        if not is_connected_without(other_side_neighbours, {part_start}, fixed_side_neighbours, other_terminal):
+            return
+        yield from iterate_source_sides(other_side_neighbours, part_start, other_terminal,
+                                        initial_excluded_nodes=fixed_side_neighbours)
@@ -0,0 +1,114 @@
+"""Wall time, peak memory and counters of stages of one calculation (enumeration, grouping, compilation, chart...)
+
+Stages can be inside other stages: time of inner stage isn't counted by outer stage again, e.g. paths are found
+by generator, which is read by compilation, so "compilation" has only its own time. Memory is traced only if it's
+asked (tracemalloc makes calculation several times slower).
+"""
+import contextlib
+import json
+import time
+import tracemalloc
+
+
+class RunMetrics:
+    """Stages of one run: name -> own seconds, calls, peak memory (bytes above memory at start) and counters"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        # [name, start time, seconds of inner stages, memory at start, peak memory] of every running stage
+        self._running_stages = []
+        self._is_tracing_started = False
+        self.start_time = time.perf_counter()
+        self.total_seconds = None
+
+    def _get_stage(self, stage_name):
+        if stage_name not in self.stages:
+            self.stages[stage_name] = {"seconds": 0., "calls": 0,
+                                       "peak_memory_bytes": 0 if self.trace_memory else None, "counters": {}}
+        return self.stages[stage_name]
+
+    def _start_stage(self, stage_name):
+        start_memory = peak_memory = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._is_tracing_started = True
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            if self._running_stages:
+                # peak is common for all process, so peak of outer stage is kept before reset
+                self._running_stages[-1][4] = max(self._running_stages[-1][4], peak_memory)
+            tracemalloc.reset_peak()
+            start_memory = peak_memory = current_memory
+        self._running_stages.append([stage_name, time.perf_counter(), 0., start_memory, peak_memory])
+
+    def _stop_stage(self):
+        stage_name, start_time, inner_seconds, start_memory, peak_memory = self._running_stages.pop()
+        stage_seconds = time.perf_counter() - start_time
+        one_stage = self._get_stage(stage_name)
+        one_stage["seconds"] += stage_seconds - inner_seconds
+        one_stage["calls"] += 1
+        if self.trace_memory:
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            one_stage["peak_memory_bytes"] = max(one_stage["peak_memory_bytes"], peak_memory - start_memory)
+        if self._running_stages:
+            self._running_stages[-1][2] += stage_seconds
+            if self.trace_memory:
+                self._running_stages[-1][4] = max(self._running_stages[-1][4], peak_memory)
+
+    @contextlib.contextmanager
+    def measure_stage(self, stage_name):
+        self._start_stage(stage_name)
+        try:
+            yield self._get_stage(stage_name)
+        finally:
+            self._stop_stage()
+
+    def iterate_stage(self, stage_name, all_items, counter_name=None):
+        """Items of generator, time of every next item is time of stage (time of reader of items isn't counted)"""
+        items_iterator = iter(all_items)
+        while True:
+            self._start_stage(stage_name)
+            try:
+                one_item = next(items_iterator)
+            except StopIteration:
+                return
+            finally:
+                self._stop_stage()
+            if counter_name is not None:
+                self.add_counter(stage_name, counter_name)
+            yield one_item
+
+    def add_counter(self, stage_name, counter_name, amount=1):
+        stage_counters = self._get_stage(stage_name)["counters"]
+        stage_counters[counter_name] = stage_counters.get(counter_name, 0) + amount
+
+    def finish(self):
+        """Total time of run, tracing of memory is stopped (if it was started by these metrics)"""
+        self.total_seconds = time.perf_counter() - self.start_time
+        if self._is_tracing_started:
+            tracemalloc.stop()
+            self._is_tracing_started = False
+
+    def to_dict(self):
+        return {"total_seconds": self.total_seconds, "trace_memory": self.trace_memory,
+                "stages": {stage_name: dict(one_stage, counters=dict(one_stage["counters"]))
+                           for stage_name, one_stage in self.stages.items()}}
+
+    def write_json(self, json_file_path):
+        with open(json_file_path, "w", encoding="utf-8") as json_file:
+            json.dump(self.to_dict(), json_file, ensure_ascii=False, indent=2)
+
+    def get_summary(self):
+        """One line for every stage, e.g. "paths enumeration: 0.120 s, 2.5 MB, paths = 1200" """
+        summary_lines = []
+        for stage_name, one_stage in self.stages.items():
+            stage_parts = [f"{one_stage['seconds']:.3f} s"]
+            if one_stage["peak_memory_bytes"] is not None:
+                stage_parts.append(f"{one_stage['peak_memory_bytes'] / 2 ** 20:.1f} MB")
+            stage_parts += [f"{counter_name} = {counter_value}"
+                            for counter_name, counter_value in one_stage["counters"].items()]
+            summary_lines.append(f"{stage_name}: " + ", ".join(stage_parts))
+        if self.total_seconds is not None:
+            summary_lines.append(f"total: {self.total_seconds:.3f} s")
+        return "\n".join(summary_lines)
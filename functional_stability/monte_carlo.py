@@ -0,0 +1,208 @@
+"""Estimation of functional stability by Monte Carlo sampling of edges states (for graphs of any size)"""
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.special
+
+from functional_stability.binary_decision_diagram import get_bfs_edges_order
+from functional_stability.evaluators import (
+    get_edges_index,
+    get_probabilities_matrix,
+    get_uniform_probabilities_matrix,
+    return_like_input,
+)
+from functional_stability.paths_enumeration import check_cancelled
+
+
+def get_wilson_interval(connected_amounts, samples_amount, confidence):
+    """Confidence interval of probability by amounts of successes (it stays inside [0, 1] even near 0 and 1)"""
+    z_value = scipy.special.ndtri(0.5 + confidence / 2)
+    estimates = connected_amounts / samples_amount
+    denominator = 1 + z_value ** 2 / samples_amount
+    center = (estimates + z_value ** 2 / (2 * samples_amount)) / denominator
+    half_width = z_value * np.sqrt(estimates * (1 - estimates) / samples_amount
+                                   + z_value ** 2 / (4 * samples_amount ** 2)) / denominator
+    return np.clip(center - half_width, 0., 1.), np.clip(center + half_width, 0., 1.)
+
+
+class MonteCarloEvaluator:
+    """Estimate of P(source and target are connected) with confidence interval
+
+    Samples are uniform numbers u (one for every edge), edge works if u < p. The same samples (fixed seed) are
+    used for every scenario, so estimates of different scenarios (e.g. points of chart) are comparable and smooth.
+    Samples are checked in batches: all samples of batch are copies of graph in one block-diagonal sparse graph,
+    connectivity of all copies is found by one call of 'connected_components'.
+    If p₀₋₁ = p₁₋₂ = ... = p, sample connects source and target for p > (minimax of u over s-t paths), and it's
+    maximum of u on path of minimum spanning tree, so all values of chart are given by one pass over samples.
+    """
+    samples_amount = 10000
+    confidence = 0.95
+    # maximum amount of (samples × edges) values of one batch
+    max_elements_in_chunk = 2 ** 22
+
+    def __init__(self, all_edges, arg_source, arg_target, samples_amount=None, confidence=None, seed=0):
+        self.all_edges = [tuple(sorted(one_edge)) for one_edge in all_edges]
+        self.edges_index = get_edges_index(self.all_edges)
+        self.source_node = arg_source
+        self.target_node = arg_target
+        if samples_amount is not None:
+            self.samples_amount = samples_amount
+        if confidence is not None:
+            self.confidence = confidence
+        self.seed = seed
+        # edges which can't be reached from source don't change connectivity, so they are not sampled
+        self.used_edges = get_bfs_edges_order(self.all_edges, arg_source)
+        all_used_nodes = {arg_source, arg_target}
+        for one_edge in self.used_edges:
+            all_used_nodes.update(one_edge)
+        nodes_index = {one_node: one_node_ind for one_node_ind, one_node in enumerate(sorted(all_used_nodes))}
+        self.nodes_amount = len(nodes_index)
+        self.source_index = nodes_index[arg_source]
+        self.target_index = nodes_index[arg_target]
+        self.first_nodes = np.array([nodes_index[one_edge[0]] for one_edge in self.used_edges], dtype=np.int64)
+        self.second_nodes = np.array([nodes_index[one_edge[1]] for one_edge in self.used_edges], dtype=np.int64)
+        self.used_columns = np.array([self.edges_index[one_edge] for one_edge in self.used_edges], dtype=np.int64)
+        self.samples_in_batch = max(1, self.max_elements_in_chunk // max(len(self.used_edges) + self.nodes_amount, 1))
+        self.lower_bound = _IntervalEndEvaluator(self, 1)
+        self.upper_bound = _IntervalEndEvaluator(self, 2)
+        # (kind of input, input, results) of the last calculation: evaluator can be shared by threads (e.g. by
+        # ResultsCache), so it's replaced and read as one tuple, input and results of other calls aren't mixed
+        self._last_calculation = None
+
+    def _iterate_samples_batches(self):
+        random_generator = np.random.default_rng(self.seed)
+        for batch_start in range(0, self.samples_amount, self.samples_in_batch):
+            check_cancelled("Sampling of Monte Carlo")
+            batch_size = min(self.samples_in_batch, self.samples_amount - batch_start)
+            yield random_generator.random((batch_size, len(self.used_edges)))
+
+    def _get_batch_edges(self, batch_size):
+        # nodes of copy k of graph are shifted by k × n
+        nodes_shifts = (np.arange(batch_size, dtype=np.int64) * self.nodes_amount)[:, np.newaxis]
+        return self.first_nodes[np.newaxis, :] + nodes_shifts, self.second_nodes[np.newaxis, :] + nodes_shifts
+
+    def _get_connected_amounts(self, probabilities_matrix):
+        connected_amounts = np.zeros(probabilities_matrix.shape[0])
+        used_probabilities = probabilities_matrix[:, self.used_columns]
+        for samples_batch in self._iterate_samples_batches():
+            batch_size = samples_batch.shape[0]
+            batch_first_nodes, batch_second_nodes = self._get_batch_edges(batch_size)
+            batch_sources = np.arange(batch_size) * self.nodes_amount + self.source_index
+            batch_targets = np.arange(batch_size) * self.nodes_amount + self.target_index
+            for scenario_ind, scenario_probabilities in enumerate(used_probabilities):
+                working_edges = samples_batch < scenario_probabilities
+                batch_graph = scipy.sparse.csr_matrix(
+                    (np.ones(np.count_nonzero(working_edges), dtype=np.int8),
+                     (batch_first_nodes[working_edges], batch_second_nodes[working_edges])),
+                    shape=(batch_size * self.nodes_amount, batch_size * self.nodes_amount)
+                )
+                _, nodes_labels = scipy.sparse.csgraph.connected_components(batch_graph, directed=False)
+                connected_amounts[scenario_ind] += np.count_nonzero(nodes_labels[batch_sources]
+                                                                    == nodes_labels[batch_targets])
+        return connected_amounts
+
+    def _get_critical_values(self):
+        """For every sample: minimum equal 'p', with which sample connects source and target (inf -> never)"""
+        all_critical_values = []
+        for samples_batch in self._iterate_samples_batches():
+            batch_size = samples_batch.shape[0]
+            batch_first_nodes, batch_second_nodes = self._get_batch_edges(batch_size)
+            batch_sources = np.arange(batch_size) * self.nodes_amount + self.source_index
+            batch_targets = np.arange(batch_size) * self.nodes_amount + self.target_index
+            root_node = batch_size * self.nodes_amount
+            # weights are shifted by 1, because zero weight means "no edge" for sparse graph;
+            # extra root node is joined with sources, so tree of every copy is searched from its source
+            spanning_tree = scipy.sparse.csgraph.minimum_spanning_tree(scipy.sparse.csr_matrix(
+                (samples_batch.ravel() + 1, (batch_first_nodes.ravel(), batch_second_nodes.ravel())),
+                shape=(root_node + 1, root_node + 1)
+            ))
+            spanning_tree = (spanning_tree + spanning_tree.T + scipy.sparse.csr_matrix(
+                (np.ones(batch_size), (np.full(batch_size, root_node), batch_sources)),
+                shape=(root_node + 1, root_node + 1)
+            )).tocsr()
+            _, tree_parents = scipy.sparse.csgraph.breadth_first_order(spanning_tree, root_node, directed=False,
+                                                                       return_predecessors=True)
+            # maximum of weights on path from every node to source of its copy, by pointer jumping:
+            # after k steps 'path_maximums' covers 2ᵏ edges of path
+            all_nodes = np.arange(root_node + 1)
+            is_in_tree = (tree_parents >= 0) & (tree_parents != root_node)
+            upper_nodes = np.where(is_in_tree, tree_parents, all_nodes)
+            path_maximums = np.zeros(root_node + 1)
+            path_maximums[is_in_tree] = np.asarray(spanning_tree[all_nodes[is_in_tree],
+                                                                 tree_parents[is_in_tree]]).ravel() - 1
+            while np.any(upper_nodes[upper_nodes] != upper_nodes):
+                path_maximums = np.maximum(path_maximums, path_maximums[upper_nodes])
+                upper_nodes = upper_nodes[upper_nodes]
+            critical_values = np.where(upper_nodes[batch_targets] == batch_sources, path_maximums[batch_targets],
+                                       np.inf)
+            all_critical_values.append(critical_values)
+        return np.concatenate(all_critical_values)
+
+    def _get_results(self, connected_amounts):
+        estimates = connected_amounts / self.samples_amount
+        lower_values, upper_values = get_wilson_interval(connected_amounts, self.samples_amount, self.confidence)
+        return estimates, lower_values, upper_values
+
+    def evaluate_with_interval(self, probabilities_matrix):
+        """(N scenarios × m edges) -> estimates, lower and upper ends of confidence interval (arrays (N,))"""
+        if self.source_node == self.target_node:
+            return (np.ones(probabilities_matrix.shape[0]),) * 3
+        # estimate and ends of interval are asked one by one (e.g. three lines of chart), samples are checked once
+        last_calculation = self._last_calculation
+        if last_calculation is not None and last_calculation[0] == "matrix" \
+                and np.array_equal(last_calculation[1], probabilities_matrix):
+            return last_calculation[2]
+        calculated_results = self._get_results(self._get_connected_amounts(probabilities_matrix))
+        self._last_calculation = ("matrix", np.array(probabilities_matrix), calculated_results)
+        return calculated_results
+
+    def evaluate_uniform_with_interval(self, arg_general_edge_values):
+        if self.source_node == self.target_node:
+            return (np.ones(np.size(arg_general_edge_values)),) * 3
+        general_edge_values = np.reshape(arg_general_edge_values, -1).astype(float)
+        last_calculation = self._last_calculation
+        if last_calculation is not None and last_calculation[0] == "uniform" \
+                and np.array_equal(last_calculation[1], general_edge_values):
+            return last_calculation[2]
+        critical_values = np.sort(self._get_critical_values())
+        connected_amounts = np.searchsorted(critical_values, general_edge_values, side="left").astype(float)
+        calculated_results = self._get_results(connected_amounts)
+        self._last_calculation = ("uniform", general_edge_values, calculated_results)
+        return calculated_results
+
+    def evaluate(self, probabilities_matrix):
+        return self.evaluate_with_interval(probabilities_matrix)[0]
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.01) -> array of numbers"""
+        calculated_values = self.evaluate_uniform_with_interval(arg_general_edge_values)[0]
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values, self.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
+
+
+class _IntervalEndEvaluator:
+    """Lower or upper end of confidence interval of Monte Carlo estimate, as separate function of probabilities"""
+
+    def __init__(self, monte_carlo_evaluator, result_ind):
+        self.monte_carlo_evaluator = monte_carlo_evaluator
+        self.result_ind = result_ind
+
+    def evaluate(self, probabilities_matrix):
+        return self.monte_carlo_evaluator.evaluate_with_interval(probabilities_matrix)[self.result_ind]
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        calculated_values = self.monte_carlo_evaluator.evaluate_uniform_with_interval(
+            arg_general_edge_values)[self.result_ind]
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values[0])
+        return calculated_values
+
+    def __call__(self, arg_all_edges_values):
+        probabilities_matrix = get_probabilities_matrix(arg_all_edges_values,
+                                                        self.monte_carlo_evaluator.edges_index)
+        return return_like_input(arg_all_edges_values, self.evaluate(probabilities_matrix))
@@ -0,0 +1,114 @@
+"""Simple paths in compact CSR layout: edge ids of all paths in one flat int32 array and offsets of paths
+
+Path isn't kept as list of nodes, list of edges or text: edges of path i are all_edge_ids[offsets[i]:offsets[i + 1]]
+(in order of path), first node of every path is kept in parallel array, so direction of every edge (p₁₋₂ or p₂₋₁
+in formula) is restored by walk from first node. Compiled functions use the same array of edge ids as sparse matrix,
+and text of path is made only when it's shown: one path takes 16 bytes (int64 offset and int64 first node) + 4 bytes
+(int32 edge id) for every its edge, compiled function adds float64 value for every edge and int32 offset for every
+path (see estimated_bytes_per_path of EnumerationBudget).
+"""
+import array
+
+import numpy as np
+import scipy.sparse
+
+from functional_stability.evaluators import IncidenceMatrixBuilder, get_edges_index
+
+
+class PathSet(IncidenceMatrixBuilder):
+    """Paths of one graph, path i -> list of its edges (u, v) in order of path by path_set[i]"""
+
+    def __init__(self, all_edges):
+        super().__init__(get_edges_index(all_edges))
+        self.all_edges = list(self.edges_index)  # edge id -> (u, v) with u < v
+        # metadata of paths in parallel arrays: first node of every path
+        self.all_start_nodes = array.array("q")
+
+    @property
+    def all_edge_ids(self):
+        return self.all_columns
+
+    def add_path(self, one_path):
+        """List of nodes -> index of new path"""
+        self.all_start_nodes.append(one_path[0])
+        return self.add_edge_group(zip(one_path, one_path[1:]))
+
+    def get_edge_ids(self, path_ind):
+        return self.all_edge_ids[self.all_offsets[path_ind]:self.all_offsets[path_ind + 1]]
+
+    def __getitem__(self, path_ind):
+        if path_ind < 0:
+            path_ind += len(self)
+        if not 0 <= path_ind < len(self):
+            raise IndexError("Path index is out of range")
+        current_node = self.all_start_nodes[path_ind]
+        all_edges_in_path = []
+        for one_edge_id in self.get_edge_ids(path_ind):
+            first_node, second_node = self.all_edges[one_edge_id]
+            next_node = second_node if first_node == current_node else first_node
+            all_edges_in_path.append((current_node, next_node))
+            current_node = next_node
+        return all_edges_in_path
+
+    def __iter__(self):
+        for path_ind in range(len(self)):
+            yield self[path_ind]
+
+    def get_lengths(self):
+        # amount of edges of every path
+        return np.diff(np.frombuffer(self.all_offsets, dtype=np.int64))
+
+    def get_amounts_by_length(self):
+        """{amount of edges: amount of paths}"""
+        lengths_counts = np.bincount(self.get_lengths()) if len(self) else np.zeros(0, dtype=np.int64)
+        return {one_length: int(one_count) for one_length, one_count in enumerate(lengths_counts) if one_count}
+
+    def get_all_paths_group_matrix(self):
+        # one group with all paths (1 × paths), e.g. for formula 1 - Π(1 - Π p)
+        return scipy.sparse.csr_matrix((np.ones(len(self)), np.arange(len(self), dtype=np.int32),
+                                        np.array([0, len(self)], dtype=np.int64)), shape=(1, len(self)))
+
+    @property
+    def nbytes(self):
+        return sum(one_array.itemsize * len(one_array)
+                   for one_array in (self.all_columns, self.all_offsets, self.all_start_nodes))
+
+
+class PathGroups:
+    """Groups of paths of PathSet (e.g. families of disjoint paths) in the same layout: flat array of indices of
+    paths and offsets of groups; group i -> lists of edges of its paths by path_groups[i]"""
+
+    def __init__(self, path_set):
+        self.path_set = path_set
+        self.all_path_indices = array.array("i")
+        self.all_offsets = array.array("q", [0])
+
+    def __len__(self):
+        return len(self.all_offsets) - 1
+
+    def add_group(self, all_path_indices):
+        self.all_path_indices.extend(all_path_indices)
+        self.all_offsets.append(len(self.all_path_indices))
+        return len(self) - 1
+
+    def get_path_indices(self, group_ind):
+        return self.all_path_indices[self.all_offsets[group_ind]:self.all_offsets[group_ind + 1]]
+
+    def __getitem__(self, group_ind):
+        if group_ind < 0:
+            group_ind += len(self)
+        if not 0 <= group_ind < len(self):
+            raise IndexError("Group index is out of range")
+        return [self.path_set[path_ind] for path_ind in self.get_path_indices(group_ind)]
+
+    def __iter__(self):
+        for group_ind in range(len(self)):
+            yield self[group_ind]
+
+    def get_matrix(self):
+        """Rows -> groups, columns -> paths of PathSet"""
+        return scipy.sparse.csr_matrix(
+            (np.ones(len(self.all_path_indices)), np.frombuffer(self.all_path_indices, dtype=np.int32),
+             np.frombuffer(self.all_offsets, dtype=np.int64)),
+            shape=(len(self), len(self.path_set))
+        )
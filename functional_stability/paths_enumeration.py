@@ -0,0 +1,145 @@
+"""Streaming enumeration of simple paths with limits (amount of paths, path length, time and memory)"""
+import array
+import contextlib
+import threading
+import time
+
+import networkx as nx
+
+
+class CalculationCancelled(Exception):
+    """Calculation is stopped by user (e.g. by 'cancel' of budget from other thread)"""
+
+
+class EnumerationBudget:
+    """Limits of one enumeration stage (simple paths or minimal cuts) and its progress; 'None' means 'without limit'
+
+    After enumeration 'stop_reason' is None if all paths (cuts) were found, otherwise it explains which limit
+    stopped the stage (results are partial then: e.g. formula contains only found paths).
+    """
+    # memory which is kept for every path and every its edge, by types of arrays of PathSet, PathGroups and
+    # compiled functions (cuts are compiled into the same layout, so it's the lowest estimate for them):
+    # edge of path -> edge id ("i") + value of sparse matrix ("d"), compiled matrix shares array of edge ids;
+    # path -> offset ("q") + first node ("q") + offset of compiled matrix (scipy keeps it as int32, "i") +
+    # index of path in group ("i") + value of groups matrix ("d") + offset of group ("q", group of one path)
+    estimated_bytes_per_path_edge = array.array("i").itemsize + array.array("d").itemsize
+    estimated_bytes_per_path = (3 * array.array("q").itemsize + 2 * array.array("i").itemsize
+                                + array.array("d").itemsize)
+
+    def __init__(self, max_paths_amount=None, max_path_length=None, max_seconds=None, max_memory_bytes=None,
+                 progress_callback=None, progress_step=1000, items_name="paths"):
+        self.max_paths_amount = max_paths_amount
+        self.max_path_length = max_path_length
+        self.max_seconds = max_seconds
+        self.max_memory_bytes = max_memory_bytes
+        # progress_callback(found_amount, elapsed_seconds) is called after every 'progress_step' found paths
+        self.progress_callback = progress_callback
+        self.progress_step = progress_step
+        # "paths" or "cuts", it's used by text of stop reason
+        self.items_name = items_name
+        self.found_amount = 0
+        self.estimated_memory_bytes = 0
+        self.elapsed_seconds = 0.
+        self.stop_reason = None
+        # it's set by other thread (e.g. Cancel button), then enumeration raises CalculationCancelled
+        self.is_cancelled = False
+
+    @property
+    def is_complete(self):
+        return self.stop_reason is None
+
+    @property
+    def is_stopped_by_time(self):
+        # such partial result depends on speed of computer, so it can't be reused
+        return self.stop_reason is not None and self.max_seconds is not None \
+            and self.elapsed_seconds >= self.max_seconds
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def reset_progress(self):
+        # limits and cancel are kept, e.g. for other calculation with the same limits
+        self.found_amount = 0
+        self.estimated_memory_bytes = 0
+        self.elapsed_seconds = 0.
+        self.stop_reason = None
+
+    def get_limits(self):
+        return [self.max_paths_amount, self.max_path_length, self.max_seconds, self.max_memory_bytes]
+
+    def _get_stop_reason(self):
+        if self.max_paths_amount is not None and self.found_amount >= self.max_paths_amount:
+            return f"limit of {self.max_paths_amount} {self.items_name} is reached"
+        if self.max_seconds is not None and self.elapsed_seconds >= self.max_seconds:
+            return f"limit of {self.max_seconds} seconds is reached"
+        if self.max_memory_bytes is not None and self.estimated_memory_bytes >= self.max_memory_bytes:
+            return f"limit of {self.max_memory_bytes} bytes of memory is reached"
+        return None
+
+
+# budgets of calculation of every thread (see cancellation_scope)
+_thread_budgets = threading.local()
+
+
+@contextlib.contextmanager
+def cancellation_scope(*all_budgets):
+    """Cancel of any of budgets stops long stages of this thread, which don't get budget as argument
+
+    Exhaustive search over states and samples of Monte Carlo call check_cancelled between their parts (in processes
+    of pool there are no budgets, so shards are stopped between shards by thread, which waits for them).
+    """
+    previous_budgets = getattr(_thread_budgets, "all_budgets", ())
+    _thread_budgets.all_budgets = previous_budgets + tuple(one_budget for one_budget in all_budgets
+                                                           if one_budget is not None)
+    try:
+        yield
+    finally:
+        _thread_budgets.all_budgets = previous_budgets
+
+
+def check_cancelled(stage_name):
+    if any(one_budget.is_cancelled for one_budget in getattr(_thread_budgets, "all_budgets", ())):
+        raise CalculationCancelled(f"{stage_name} is cancelled")
+
+
+def iterate_with_budget(all_found_items, arg_budget, get_edges_amount):
+    """Items (paths or cuts) of any generator are counted by budget, generator is stopped by limits of budget
+
+    Cancel and limits are checked before the first item and after every item, so only yielded items are bounded:
+    while generator itself searches next item (e.g. nx.all_simple_paths in big graph), neither limit of seconds nor
+    cancel is seen. Time of this stage is added to elapsed_seconds of budget, so budget of several stages (e.g.
+    blocks of graph) limits their total time and amount of items.
+    """
+    previous_elapsed_seconds = arg_budget.elapsed_seconds
+    start_time = time.perf_counter()
+
+    def check_budget():
+        arg_budget.elapsed_seconds = previous_elapsed_seconds + time.perf_counter() - start_time
+        if arg_budget.is_cancelled:
+            raise CalculationCancelled(f"Enumeration of {arg_budget.items_name} is cancelled")
+        arg_budget.stop_reason = arg_budget._get_stop_reason()
+        return arg_budget.stop_reason is None
+
+    if check_budget():
+        for one_item in all_found_items:
+            arg_budget.found_amount += 1
+            arg_budget.estimated_memory_bytes += arg_budget.estimated_bytes_per_path
+            arg_budget.estimated_memory_bytes += arg_budget.estimated_bytes_per_path_edge * get_edges_amount(one_item)
+            yield one_item
+            if arg_budget.progress_callback is not None and arg_budget.found_amount % arg_budget.progress_step == 0:
+                arg_budget.progress_callback(arg_budget.found_amount,
+                                             previous_elapsed_seconds + time.perf_counter() - start_time)
+            if not check_budget():
+                break
+    arg_budget.elapsed_seconds = previous_elapsed_seconds + time.perf_counter() - start_time
+    if arg_budget.progress_callback is not None:
+        arg_budget.progress_callback(arg_budget.found_amount, arg_budget.elapsed_seconds)
+
+
+def iterate_simple_paths(arg_defined_graph, arg_source, arg_target, arg_budget=None):
+    """Generator of simple paths (lists of nodes), nothing is kept in memory by enumeration itself"""
+    if arg_budget is None:
+        arg_budget = EnumerationBudget()
+    all_paths_generator = nx.all_simple_paths(arg_defined_graph, arg_source, arg_target,
+                                              cutoff=arg_budget.max_path_length)
+    yield from iterate_with_budget(all_paths_generator, arg_budget, lambda one_path: len(one_path) - 1)
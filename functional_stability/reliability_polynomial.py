@@ -0,0 +1,86 @@
+"""Reliability polynomial P(p) of equal probabilities of edges (p₁ = p₂ = ... = p) by its exact coefficients
+
+P(p) = Σ Nᵢ × pⁱ × qᵐ⁻ⁱ, where Nᵢ is amount of states with i working edges (of m used edges), where source and
+target are connected. Coefficients are found once by exact method (integers, without rounding), then any amount of
+points of chart is calculated by one np.polyval call.
+"""
+import math
+
+import numpy as np
+
+
+def get_states_counts(power_coefficients):
+    """a₀ + a₁p + ... + aₘpᵐ -> N₀ ... Nₘ: Σ Nᵢ tⁱ = Σ aⱼ tʲ (1 + t)ᵐ⁻ʲ, where t = p / q"""
+    edges_amount = len(power_coefficients) - 1
+    states_counts = [0] * (edges_amount + 1)
+    for power_ind, one_coefficient in enumerate(power_coefficients):
+        if one_coefficient:
+            for working_amount in range(power_ind, edges_amount + 1):
+                states_counts[working_amount] += one_coefficient * math.comb(edges_amount - power_ind,
+                                                                             working_amount - power_ind)
+    return states_counts
+
+
+def get_power_coefficients(states_counts):
+    """N₀ ... Nₘ -> a₀ ... aₘ of P(p) = a₀ + a₁p + ... + aₘpᵐ: qᵐ⁻ⁱ = Σ C(m-i, k) (-p)ᵏ"""
+    edges_amount = len(states_counts) - 1
+    power_coefficients = [0] * (edges_amount + 1)
+    for working_amount, one_count in enumerate(states_counts):
+        if one_count:
+            for failed_power in range(edges_amount - working_amount + 1):
+                power_coefficients[working_amount + failed_power] += (
+                    one_count * math.comb(edges_amount - working_amount, failed_power) * (-1) ** failed_power)
+    return power_coefficients
+
+
+class ReliabilityPolynomial:
+    """Exact integer coefficients of P(p) and its fast evaluation for arrays of p
+
+    Coefficients aⱼ of powers of p have different signs and they grow as C(m, j), so np.polyval over them loses
+    precision for big m. Values are calculated by Horner scheme over Nᵢ (all of them are not negative):
+    P = qᵐ × Σ Nᵢ tⁱ for t = p / q ≤ 1 (p ≤ 0.5), and P = pᵐ × Σ Nᵢ tᵐ⁻ⁱ for t = q / p (p > 0.5).
+    """
+
+    def __init__(self, states_counts):
+        # Nᵢ, i = 0 ... m (Python integers)
+        self.states_counts = [int(one_count) for one_count in states_counts]
+        self.edges_amount = len(self.states_counts) - 1
+        # aⱼ of P(p) = a₀ + a₁p + ... + aₘpᵐ (Python integers)
+        self.power_coefficients = get_power_coefficients(self.states_counts)
+        # highest power is the first for np.polyval
+        self._counts_by_working = np.array([float(one_count) for one_count in reversed(self.states_counts)])
+        self._counts_by_failed = self._counts_by_working[::-1].copy()
+
+    @classmethod
+    def from_power_coefficients(cls, power_coefficients):
+        return cls(get_states_counts([int(one_coefficient) for one_coefficient in power_coefficients]))
+
+    def evaluate_uniform(self, arg_general_edge_values):
+        """If p₀₋₁ = p₁₋₂ = ... = p: 0.5 -> one number, np.arange(0, 1, 0.0001) -> array of numbers"""
+        p_values = np.asarray(arg_general_edge_values, dtype=float)
+        q_values = 1 - p_values
+        calculated_values = np.empty(p_values.shape)
+        is_low_p = p_values <= 0.5
+        with np.errstate(divide="ignore", invalid="ignore"):
+            low_p, low_q = p_values[is_low_p], q_values[is_low_p]
+            calculated_values[is_low_p] = low_q ** self.edges_amount * np.polyval(self._counts_by_working,
+                                                                                 low_p / low_q)
+            high_p, high_q = p_values[~is_low_p], q_values[~is_low_p]
+            calculated_values[~is_low_p] = high_p ** self.edges_amount * np.polyval(self._counts_by_failed,
+                                                                                   high_q / high_p)
+        if np.ndim(arg_general_edge_values) == 0:
+            return float(calculated_values)
+        return calculated_values
+
+    def __mul__(self, other_polynomial):
+        """P₁(p) × P₂(p) of parts without common edges (e.g. blocks of graph): Σ Nᵢpⁱqᵐ¹⁻ⁱ × Σ Mⱼpʲqᵐ²⁻ʲ has
+        Σ NᵢMⱼ over i + j = k working edges of m₁ + m₂ edges"""
+        states_counts = [0] * (self.edges_amount + other_polynomial.edges_amount + 1)
+        for first_amount, first_count in enumerate(self.states_counts):
+            if first_count:
+                for second_amount, second_count in enumerate(other_polynomial.states_counts):
+                    states_counts[first_amount + second_amount] += first_count * second_count
+        return ReliabilityPolynomial(states_counts)
+
+    def __repr__(self):
+        return f"ReliabilityPolynomial({self.states_counts})"
@@ -0,0 +1,154 @@
+"""Cache of structural results of methods (paths, cuts, groups, compiled functions) in memory and on disk
+
+Key is sha256 of canonical description of graph (nodes, edges in their order, because order of edges is order of
+columns of compiled functions), source, target, method and limits of enumeration, so any change of graph gives
+another key, and old results are never used for changed graph.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# it's changed, when results of methods are changed, so results of old versions are not used
+cache_format_version = 8
+
+
+def get_results_key(arg_defined_graph, arg_source, arg_target, arg_method, arg_budgets=(), arg_options=None):
+    # arg_options: other settings of calculation, which change results (any JSON value)
+    canonical_description = {
+        "version": cache_format_version,
+        "nodes": sorted(arg_defined_graph.nodes),
+        "edges": [sorted(one_edge) for one_edge in arg_defined_graph.edges],
+        "source": arg_source,
+        "target": arg_target,
+        "method": arg_method,
+        "limits": [one_budget.get_limits() for one_budget in arg_budgets],
+        "options": arg_options,
+    }
+    return hashlib.sha256(json.dumps(canonical_description, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultsCache:
+    """Least recently used results in memory, then pickled results on disk (the oldest files are removed, when
+    total size of files is more than limit); 'None' directory -> only memory is used
+
+    Cache can be used by several threads (e.g. workers of windows), every operation is done under lock.
+    """
+    max_memory_items = 16
+    max_disk_bytes = 512 * 2 ** 20
+
+    def __init__(self, cache_directory=None, max_memory_items=None, max_disk_bytes=None):
+        self.cache_directory = cache_directory
+        if max_memory_items is not None:
+            self.max_memory_items = max_memory_items
+        if max_disk_bytes is not None:
+            self.max_disk_bytes = max_disk_bytes
+        self.memory_items = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits_amount = 0
+        self.misses_amount = 0
+
+    def _get_file_path(self, results_key):
+        return os.path.join(self.cache_directory, results_key + ".pickle")
+
+    def get(self, results_key):
+        with self.lock:
+            return self._get(results_key)
+
+    def _get(self, results_key):
+        if results_key in self.memory_items:
+            self.memory_items.move_to_end(results_key)
+            self.hits_amount += 1
+            return self.memory_items[results_key]
+        if self.cache_directory is not None and os.path.exists(self._get_file_path(results_key)):
+            try:
+                with open(self._get_file_path(results_key), "rb") as cache_file:
+                    results_data = pickle.load(cache_file)
+                os.utime(self._get_file_path(results_key))  # file is used recently, so it's removed later
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as cache_error:
+                logger.warning("Broken cache file %s is removed: %s", results_key, cache_error)
+                self._remove_file(self._get_file_path(results_key))
+            else:
+                self._put_to_memory(results_key, results_data)
+                self.hits_amount += 1
+                return results_data
+        self.misses_amount += 1
+        return None
+
+    def put(self, results_key, results_data):
+        with self.lock:
+            self._put(results_key, results_data)
+
+    def _put(self, results_key, results_data):
+        self._put_to_memory(results_key, results_data)
+        if self.cache_directory is None:
+            return
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            temporary_path = self._get_file_path(results_key) + f".{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as cache_file:
+                pickle.dump(results_data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            # file is replaced at once, so other process never reads half-written file
+            os.replace(temporary_path, self._get_file_path(results_key))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as cache_error:
+            logger.warning("Results %s are not saved to cache: %s", results_key, cache_error)
+            return
+        self._remove_old_files()
+
+    def clear(self):
+        with self.lock:
+            self.memory_items.clear()
+            if self.cache_directory is not None and os.path.isdir(self.cache_directory):
+                for one_file_name in os.listdir(self.cache_directory):
+                    if one_file_name.endswith(".pickle"):
+                        self._remove_file(os.path.join(self.cache_directory, one_file_name))
+
+    def _put_to_memory(self, results_key, results_data):
+        self.memory_items[results_key] = results_data
+        self.memory_items.move_to_end(results_key)
+        while len(self.memory_items) > self.max_memory_items:
+            self.memory_items.popitem(last=False)
+
+    def _remove_old_files(self):
+        all_files_info = []
+        for one_file_name in os.listdir(self.cache_directory):
+            if one_file_name.endswith(".pickle"):
+                one_file_path = os.path.join(self.cache_directory, one_file_name)
+                try:
+                    one_file_stat = os.stat(one_file_path)
+                except OSError:
+                    continue
+                all_files_info.append((one_file_stat.st_mtime, one_file_stat.st_size, one_file_path))
+        total_size = sum(one_file_size for _, one_file_size, _ in all_files_info)
+        for _, one_file_size, one_file_path in sorted(all_files_info):
+            if total_size <= self.max_disk_bytes:
+                break
+            self._remove_file(one_file_path)
+            total_size -= one_file_size
+
+    @staticmethod
+    def _remove_file(one_file_path):
+        try:
+            os.remove(one_file_path)
+        except OSError:
+            pass
+
+
+_default_results_cache = None
+
+
+def get_default_results_cache():
+    """Cache shared by all windows of application, files are in user's cache directory"""
+    global _default_results_cache
+    if _default_results_cache is None:
+        cache_directory = os.environ.get("FUNCTIONAL_STABILITY_CACHE_DIR")
+        if cache_directory is None:
+            cache_directory = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                           "functional_stability")
+        _default_results_cache = ResultsCache(cache_directory)
+    return _default_results_cache
@@ -1,3 +1,4 @@
+import logging
 import sys
 import random
 from PyQt5 import QtWidgets, QtCore, QtGui
@@ -6,16 +7,23 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.patches import Rectangle
 import networkx as nx
-import igraph
 from netgraph import EditableGraph
 from netgraph._artists import NodeArtist
 import numpy as np
 from itertools import combinations
+import functional_stability
+from calculation_worker import MethodCalculationThread
+from edge_importance_window import EdgeImportanceWindow
+from formula_view import FormulaView
+
+logger = logging.getLogger(__name__)
 
 
 class MyEditableGraph(EditableGraph):
     def __init__(self, *args, **kwargs):
         self.defined_general_node_label_fontdict = dict(size=14)
+        # simple paths and minimal cuts between default terminals, they are updated by every edit of graph
+        self.paths_and_cuts = None
         given_graph_data = args[0]
         defined_node_label = {}
         for one_node in given_graph_data.nodes:
@@ -24,6 +32,37 @@ class MyEditableGraph(EditableGraph):
                          node_label_fontdict=self.defined_general_node_label_fontdict,
                          node_labels=defined_node_label)
 
+    def get_paths_and_cuts(self, arg_graph_info, paths_limits, cuts_limits):
+        first_node, last_node = functional_stability.get_default_terminals(arg_graph_info)
+        if not functional_stability.can_use_paths_and_cuts(arg_graph_info, first_node, last_node):
+            self.paths_and_cuts = None
+            return None
+        if self.paths_and_cuts is None or not self.paths_and_cuts.matches(arg_graph_info, first_node, last_node):
+            self.paths_and_cuts = functional_stability.IncrementalPathsAndCuts(
+                arg_graph_info, first_node, last_node, paths_limits, cuts_limits)
+        return self.paths_and_cuts
+
+    def _add_node(self, event):
+        super()._add_node(event)
+        if self.paths_and_cuts is not None and self.nodes:
+            self.paths_and_cuts.add_node(self.nodes[-1])
+
+    def _delete_node(self, node):
+        super()._delete_node(node)
+        if self.paths_and_cuts is not None:
+            self.paths_and_cuts.remove_node(node)
+
+    def _add_edge(self, edge, edge_properties=None):
+        super()._add_edge(edge, edge_properties)
+        if self.paths_and_cuts is not None:
+            self.paths_and_cuts.add_edge(*edge)
+
+    def _delete_edge(self, edge):
+        super()._delete_edge(edge)
+        # edge (v, u) can be kept, when (u, v) is deleted, then undirected edge is kept too
+        if self.paths_and_cuts is not None and (edge[1], edge[0]) not in self.edges:
+            self.paths_and_cuts.remove_edge(*edge)
+
     def add_node_by_position(self, new_node_position):
         # create node ID; use smallest unused int
         node = 0
@@ -46,6 +85,8 @@ class MyEditableGraph(EditableGraph):
         self.emphasizeable_artists.append(artist)
         self._base_alpha[artist] = artist.get_alpha()
         self.nodes.append(node)
+        if self.paths_and_cuts is not None:
+            self.paths_and_cuts.add_node(node)
         self.node_positions[node] = pos
         self.node_artists[node] = artist
         self.ax.add_patch(artist)
@@ -72,7 +113,7 @@ class MyEditableGraph(EditableGraph):
         the_selected_nodes = [self._reverse_node_artists[artist] for artist in self._selected_artists if
                               isinstance(artist, NodeArtist)]
         if len(the_selected_nodes) < 2:
-            print("You must choose at least two nodes!")
+            logger.warning("You must choose at least two nodes!")
         else:
             all_defined_edges = combinations(the_selected_nodes, 2)
             for one_defined_edge in all_defined_edges:
@@ -308,7 +349,11 @@ class MyMainWindow(QtWidgets.QMainWindow):
         the_current_graph_info = nx.Graph()
         the_current_graph_info.add_nodes_from(the_current_graph.nodes)
         the_current_graph_info.add_edges_from(the_current_graph.edges)
-        self.formula_window = FormulaCalcWindow(the_current_graph_info)
+        the_paths_and_cuts = the_current_graph.get_paths_and_cuts(the_current_graph_info,
+                                                                  FormulaCalcWindow.paths_enumeration_limits,
+                                                                  FormulaCalcWindow.cuts_enumeration_limits)
+        self.formula_window = FormulaCalcWindow(the_current_graph_info, the_paths_and_cuts,
+                                                dict(the_current_graph.node_positions))
         self.formula_window.show()
 
     def delete_selected_elements(self):
@@ -354,16 +399,24 @@ class MyMainWindow(QtWidgets.QMainWindow):
 
 
 class FormulaCalcWindow(QtWidgets.QWidget):
-    all_methods_for_functional_stability = [
-        "Simple paths",
-        # "Ezari-Proshan", # is omitted!
-        "Litvak-Ushakov"
-        # "Exhaustive search",  # another name: "brute-force search", is omitted too!
-    ]
-
-    def __init__(self, chosen_graph_info):
+    all_methods_for_functional_stability = functional_stability.all_methods_for_functional_stability
+    # enumeration of simple paths is stopped after one of these limits (formulas use only found paths then)
+    paths_enumeration_limits = dict(max_paths_amount=100000, max_seconds=60, max_memory_bytes=500 * 2 ** 20)
+    cuts_enumeration_limits = dict(max_paths_amount=100000, max_seconds=60, items_name="cuts")
+
+    def __init__(self, chosen_graph_info, chosen_paths_and_cuts=None, chosen_node_positions=None):
         super().__init__()
         self.chosen_graph_data = chosen_graph_info
+        # paths and cuts are kept by editor (they are used only while graph of editor is the same)
+        self.chosen_paths_and_cuts = chosen_paths_and_cuts
+        # positions of nodes in editor, the same picture of graph is used by window of edges importance
+        self.chosen_node_positions = chosen_node_positions
+        self.method_result_data = None
+        # RunMetrics of last calculation (evaluations by button are added to it)
+        self.run_metrics = None
+        self.edge_importance_window = None
+        # thread of current calculation of method (window is not hung, calculation can be cancelled)
+        self.calculation_thread = None
         self.setGeometry(0, 0, 700, 900)
         self._center_formula_window()
         self.setWindowIcon(QtGui.QIcon(f"all_images/formula_window_images/formula_window_icon.png"))
@@ -446,6 +499,21 @@ class FormulaCalcWindow(QtWidgets.QWidget):
         self.layout_choose_method.addWidget(self.label_select_method)
         self.layout_choose_method.addWidget(self.list_of_methods)
         self.layout_choose_method.addWidget(self.button_to_define_method)
+        self.button_to_cancel_method = QtWidgets.QPushButton()
+        self.button_to_cancel_method.setText("Cancel")
+        self.button_to_cancel_method.setStyleSheet(self.button_to_define_method.styleSheet())
+        self.button_to_cancel_method.clicked.connect(self.cancel_functional_stability_method)
+        self.button_to_cancel_method.hide()
+        self.layout_choose_method.addWidget(self.button_to_cancel_method)
+        # stage of calculation and amounts of found paths and cuts
+        self.calculation_progress_label = QtWidgets.QLabel()
+        self.calculation_progress_label.setFont(QtGui.QFont("Arial", 10))
+        self.calculation_progress_label.hide()
+        self.layout_choose_method.addWidget(self.calculation_progress_label)
+        # tracemalloc makes calculation slower, so peak memory of stages is measured only if it's asked
+        self.trace_memory_checkbox = QtWidgets.QCheckBox("Trace memory")
+        self.trace_memory_checkbox.setFont(QtGui.QFont("Arial", 10))
+        self.layout_choose_method.addWidget(self.trace_memory_checkbox)
         # show name of selected method
         self.label1_defined_chosen_method = QtWidgets.QLabel("Selected method is: ")
         self.label1_defined_chosen_method.setAlignment(Qt.AlignRight)
@@ -460,12 +528,11 @@ class FormulaCalcWindow(QtWidgets.QWidget):
         self.defined_chosen_method_layout = QtWidgets.QHBoxLayout()
         self.defined_chosen_method_layout.addWidget(self.label1_defined_chosen_method)
         self.defined_chosen_method_layout.addWidget(self.label2_defined_chosen_method)
-        # formulas of graph path
-        self.formulas_area = QtWidgets.QScrollArea()
-        self.formulas_area.setMinimumHeight(110)
-        self.formulas_area.setWidgetResizable(True)  # is necessary if we want to change data of scroll area!
-        self.formulas_area.setStyleSheet("""
-                QScrollArea {
+        # formulas of graph path: rows of terms by pages with search and export (long formulas aren't one label)
+        self.formulas_area = FormulaView()
+        self.formulas_area.setMinimumHeight(160)
+        self.formulas_area.rows_view.setStyleSheet("""
+                QListView {
                     border: 2px dashed #654321;
                 }
                 QScrollBar:vertical {
@@ -490,17 +557,15 @@ class FormulaCalcWindow(QtWidgets.QWidget):
                     subcontrol-position: top;
                     subcontrol-origin: margin;
                 }""")
-
-        self.formulas_area_widget = QtWidgets.QWidget()
-        self.formulas_area.setWidget(self.formulas_area_widget)
-        # self.formulas_area_widget must be added!
-        self.layout_selection = QtWidgets.QVBoxLayout(self.formulas_area_widget)
-        # self.formulas_area.setLayout(self.layout_selection)
-        self.formulas_main_label = QtWidgets.QLabel()
-        self.formulas_main_label.setWordWrap(True)
-        self.formulas_main_label.setFont(QtGui.QFont("", 12))
-        self.layout_selection.addWidget(self.formulas_main_label)
-        self.formulas_area.setWidget(self.formulas_area_widget)
+        # status area: time, memory and counters of stages of last calculation
+        self.run_metrics_label = QtWidgets.QLabel()
+        self.run_metrics_label.setFont(QtGui.QFont("Arial", 9))
+        self.button_to_export_metrics = QtWidgets.QPushButton("Export metrics...")
+        self.button_to_export_metrics.setMaximumWidth(160)
+        self.button_to_export_metrics.clicked.connect(self.export_run_metrics)
+        self.layout_run_metrics = QtWidgets.QHBoxLayout()
+        self.layout_run_metrics.addWidget(self.run_metrics_label)
+        self.layout_run_metrics.addWidget(self.button_to_export_metrics)
         # chart
         self.the_chart_canvas = AdditionalChartCanvas()
         # node selection
@@ -622,8 +687,16 @@ class FormulaCalcWindow(QtWidgets.QWidget):
         self.calculate_nodes_label.setFont(QtGui.QFont("", 12))
         # self.calculate_nodes_label.resize(300, 300)
         self.layout_calculate_info = QtWidgets.QHBoxLayout(self.choose_method_widget)
+        self.button_to_calculate.clicked.connect(self.demonstrate_calculated_info)
         self.layout_calculate_info.addWidget(self.button_to_calculate)
         self.layout_calculate_info.addWidget(self.calculate_nodes_label)
+        # ∂P/∂pₑ of every edge for current probabilities (values of sliders)
+        self.button_to_show_importance = QtWidgets.QPushButton()
+        self.button_to_show_importance.setText("Importance of edges")
+        self.button_to_show_importance.setMaximumWidth(260)
+        self.button_to_show_importance.setStyleSheet(self.button_to_calculate.styleSheet())
+        self.button_to_show_importance.clicked.connect(self.show_edges_importance)
+        self.layout_calculate_info.addWidget(self.button_to_show_importance)
         # self.layout_calculate_info.addWidget(self.button_to_define_method)
         # add whole content to main layout
         self.main_vertical_layout = QtWidgets.QVBoxLayout(self)
@@ -631,6 +704,7 @@ class FormulaCalcWindow(QtWidgets.QWidget):
         self.main_vertical_layout.addWidget(self.choose_method_widget)
         self.main_vertical_layout.addLayout(self.defined_chosen_method_layout)
         self.main_vertical_layout.addWidget(self.formulas_area)
+        self.main_vertical_layout.addLayout(self.layout_run_metrics)
         self.main_vertical_layout.addWidget(self.the_chart_canvas)
         self.main_vertical_layout.addWidget(self.node_selection_area)
         self.main_vertical_layout.addLayout(self.layout_calculate_info)
@@ -638,10 +712,96 @@ class FormulaCalcWindow(QtWidgets.QWidget):
         self.label1_defined_chosen_method.hide()
         self.label2_defined_chosen_method.hide()
         self.formulas_area.hide()
+        self.run_metrics_label.hide()
+        self.button_to_export_metrics.hide()
         self.the_chart_canvas.hide()
         self.node_selection_area.hide()
         self.button_to_calculate.hide()
         self.calculate_nodes_label.hide()
+        self.button_to_show_importance.hide()
+
+    def get_edges_probabilities(self):
+        # values of sliders -> {(0, 1): 0.5, ...}
+        all_given_edges = list(self.chosen_graph_data.edges)
+        all_edges_probabilities = {}
+        for one_node_ind in range(len(all_given_edges)):
+            one_widget_edge_info = self.layout_selection.itemAt(one_node_ind).layout().itemAt(1).widget()
+            if isinstance(one_widget_edge_info, QtWidgets.QSlider):
+                all_edges_probabilities[
+                    tuple(sorted(all_given_edges[one_node_ind]))] = one_widget_edge_info.value() / 100
+        return all_edges_probabilities
+
+    def show_paths_progress(self, found_amount):
+        self.calculation_progress_label.setText(f"Simple paths found: {found_amount}")
+
+    def show_cuts_progress(self, found_amount):
+        self.calculation_progress_label.setText(f"Minimal cuts found: {found_amount}")
+
+    def cancel_functional_stability_method(self):
+        if self.calculation_thread is not None:
+            self.calculation_progress_label.setText("Cancelling...")
+            self.calculation_thread.cancel()
+
+    def show_calculation_cancelled(self):
+        self.calculation_progress_label.setText("Calculation is cancelled")
+
+    def show_method_error(self, method_error_text):
+        self.calculation_progress_label.hide()
+        QtWidgets.QMessageBox.warning(self, self.chosen_method_by_user, method_error_text)
+
+    def finish_calculation(self):
+        self.button_to_define_method.setEnabled(True)
+        self.button_to_cancel_method.hide()
+
+    def get_fixed_edges_values(self):
+        # sliders at 0 or 1 -> {(0, 1): 1.0, ...}
+        return {one_edge: one_value for one_edge, one_value in self.get_edges_probabilities().items()
+                if one_value in (0., 1.)}
+
+    def demonstrate_calculated_info(self):
+        if self.method_result_data is None:
+            return
+        if self.method_result_data["method_name"] in functional_stability.methods_with_graph_reduction \
+                and self.get_fixed_edges_values() != self.method_result_data["fixed_edges_values"]:
+            self.calculate_nodes_label.setText("Edges with p = 0 or p = 1 are changed, formulas are calculated "
+                                               "again, then press the button again")
+            self.define_functional_stability_method()
+            return
+        all_edges_probabilities = self.get_edges_probabilities()
+        calculated_result = ""
+        with self.run_metrics.measure_stage("evaluation"):
+            for one_defined_first_function, str_before_answer in self.method_result_data["first_formula_functions"]:
+                calculated_result += str_before_answer + " " + str(one_defined_first_function(all_edges_probabilities))
+        self.run_metrics.add_counter("evaluation", "evaluations",
+                                     len(self.method_result_data["first_formula_functions"]))
+        self.calculate_nodes_label.setText(calculated_result)
+        self.run_metrics_label.setText(self.run_metrics.get_summary())
+
+    def export_run_metrics(self):
+        if self.run_metrics is None:
+            return
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export metrics", "run_metrics.json",
+                                                             "JSON files (*.json)")
+        if not file_path:
+            return
+        try:
+            self.run_metrics.write_json(file_path)
+        except OSError as export_error:
+            QtWidgets.QMessageBox.warning(self, "Export metrics", str(export_error))
+
+    def closeEvent(self, event):
+        # results of working thread are not needed anymore
+        if self.calculation_thread is not None and self.calculation_thread.isRunning():
+            self.calculation_thread.cancel()
+        super().closeEvent(event)
+
+    def show_edges_importance(self):
+        if self.method_result_data is None:
+            return
+        self.edge_importance_window = EdgeImportanceWindow(self.chosen_graph_data, self.method_result_data,
+                                                           self.get_edges_probabilities(),
+                                                           self.chosen_node_positions)
+        self.edge_importance_window.show()
 
     def _center_formula_window(self):
         frame_geometry = self.frameGeometry()
@@ -650,412 +810,69 @@ class FormulaCalcWindow(QtWidgets.QWidget):
 
     @staticmethod
     def get_superscript_number(arg_integer):
-        subscript_numbers = "⁰¹²³⁴⁵⁶⁷⁸⁹"
-        return "".join([subscript_numbers[int(one_digit_str)] for one_digit_str in str(arg_integer)])
+        return functional_stability.get_superscript_number(arg_integer)
 
     @staticmethod
     def get_subscript_number(arg_integer):
-        subscript_numbers = "₀₁₂₃₄₅₆₇₈₉"
-        return "".join([subscript_numbers[int(one_digit_str)] for one_digit_str in str(arg_integer)])
-
-    def _get_minimum_cuts(self, arg_main_graph, arg_source, arg_target, selected_variant_of_search):
-        all_minimum_cuts = []
-        all_minimum_cuts = []
-        all_existing_nodes = list(arg_main_graph.nodes)
-        if selected_variant_of_search == 1:
-            # using NetworkX function 'minimum_edge_cut' and check for all nodes
-            for one_defined_node in all_existing_nodes:
-                for another_defined_node in all_existing_nodes:
-                    if one_defined_node == another_defined_node:
-                        continue
-                    defined_minimum_cut = nx.minimum_edge_cut(arg_main_graph, one_defined_node, another_defined_node)
-                    # defined_minimum_cut = nx.algorithms.connectivity.minimum_st_edge_cut(arg_defined_graph,
-                    #                                                                      one_defined_node,
-                    #                                                                      another_defined_node)
-                    improved_minimum_cut = [tuple(sorted(one_temp_edge)) for one_temp_edge in defined_minimum_cut]
-                    if improved_minimum_cut not in all_minimum_cuts and improved_minimum_cut:
-                        # 'if improved_minimum_cut' check if (...) is not empty because of disconnected graph
-                        all_minimum_cuts.append(improved_minimum_cut)
-
-        elif selected_variant_of_search == 2:
-            # using NetworkX function 'minimum_st_edge_cut' and check for all nodes
-            # link: https://stackoverflow.com/questions/73018718
-            all_cuts = []
-            for n in all_existing_nodes:
-                for k in all_existing_nodes:
-                    if n == k:
-                        continue
-                    all_cuts.append(nx.algorithms.connectivity.minimum_st_edge_cut(arg_main_graph, n, k))
-            all_minimum_cuts = [frozenset([tuple(sorted(i)) for i in j]) for j in
-                                [frozenset(cut) for cut in all_cuts if len(cut) == len(min(all_cuts, key=len))]]
-            all_minimum_cuts = [set(s) for s in set(all_minimum_cuts)]
-            all_minimum_cuts = [list(one_min_cut) for one_min_cut in all_minimum_cuts]
-
-        elif selected_variant_of_search in [3, 4]:
-            # using Igraph function
-            # 'all_st_cuts' / 'all_st_mincuts'
-            # to find
-            # all possible / only minimum
-            # cuts
-            all_existing_edges = list(arg_main_graph.edges)
-            all_directed_graph_edges = []
-            for one_edge in all_existing_edges:
-                all_directed_graph_edges.extend([one_edge, tuple(reversed(one_edge))])
-            all_found_cuts = []
-            igraph_created_graph = igraph.Graph(edges=all_directed_graph_edges, directed=True)
-            all_cuts_objects = []
-            if selected_variant_of_search == 3:
-                all_cuts_objects = igraph_created_graph.all_st_cuts(source=arg_source, target=arg_target)
-            elif selected_variant_of_search == 4:
-                all_cuts_objects = igraph_created_graph.all_st_mincuts(source=arg_source, target=arg_target)
-            for one_edge_group in [found_cut.cut for found_cut in all_cuts_objects]:
-                all_found_cuts.append([all_directed_graph_edges[one_edge_id] for one_edge_id in one_edge_group])
-            all_minimum_cuts = all_found_cuts.copy()
-        return all_minimum_cuts
-
-    def _get_all_info_by_method(self, arg_chosen_method_ind, arg_defined_graph):
-        """All info -> formulas and functions to calculate, not values"""
-        all_result_data = {}
-        first_node = list(arg_defined_graph.nodes)[0]
-        last_node = list(arg_defined_graph.nodes)[-1]
-        if arg_chosen_method_ind == 0:  # Simple paths
-            all_paths = list(nx.all_simple_paths(arg_defined_graph, first_node, last_node))
-            dict_for_first_formula = {}
-            dict_for_second_formula = {}
-            all_paths_probabilities = "All simple paths:\n"
-            for one_path_ind in range(len(all_paths)):
-                one_path = all_paths[one_path_ind]
-                all_edges_in_path = list(zip(one_path, one_path[1:]))
-                multiply_of_probabilities = "×".join([
-                    "p" + self.get_subscript_number(one_edge[0] + 1) + "₋" + self.get_subscript_number(one_edge[1] + 1)
-                    for one_edge in all_edges_in_path
-                ])
-                all_paths_probabilities += f" {one_path_ind}. {tuple(one_path)} -> {multiply_of_probabilities}\n"
-                dict_for_first_formula[one_path_ind] = (
-                    [tuple(sorted(one_temp_edge)) for one_temp_edge in all_edges_in_path],
-                    multiply_of_probabilities
-                )
-                amount_probabilities = len(one_path) - 1
-                if amount_probabilities not in dict_for_second_formula:
-                    dict_for_second_formula[amount_probabilities] = 1
-                else:
-                    dict_for_second_formula[amount_probabilities] += 1
-            print(all_paths_probabilities)
-            print(dict_for_first_formula)
-            print(dict_for_second_formula)
-            first_formula = (f"P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)}"
-                             f" = 1 - ")
-            first_formula += " ".join([
-                f"(1 - {the_one_path_info[1]})"
-                for the_one_path_info in dict_for_first_formula.values()
-            ])
-            second_formula = (f"P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)}"
-                              f" = 1 - ")
-            second_formula += " ".join([
-                f"(1 - p{self.get_superscript_number(the_key)})"
-                f"{self.get_superscript_number(dict_for_second_formula[the_key])}"
-                for the_key in sorted(dict_for_second_formula.keys())
-            ])
-            print(first_formula)
-            print(second_formula)
-
-            def first_formula_func(arg_all_edges_values):  # arg_all_edges_values -> {(0, 1): 2}...
-                multiply_values = 1  # (1 - p₀₋₁×p₁₋₂) (1 - p₀₋₂)...
-                improved_edges_values = {}  # replace (1, 0) with (0, 1), just sort keys-edges
-                for one_edge_to_sort, one_edge_value in arg_all_edges_values.items():
-                    improved_edges_values[tuple(sorted(one_edge_to_sort))] = one_edge_value
-                for one_path_info in dict_for_first_formula.values():
-                    one_path_all_edges = one_path_info[0]
-                    one_path_all_edges_values = [improved_edges_values[tuple(sorted(one_edge))]
-                                                 for one_edge in one_path_all_edges]
-                    multiply_values *= (1 - np.prod(one_path_all_edges_values))
-
-                return 1 - multiply_values
-
-            # if p₀₋₁ = p₁₋₂ = ... = pₘ₋ ₙ = p
-            def second_formula_func(arg_general_edge_val):  # arg_general_edge_val -> 0.5, 0.234, 1 ... -> 'p' value
-                multiply_values = 1
-                # probability_amount -> p₀₋₂×p₂₋₃×....
-                # similar_path_amount -> e.g (1 - p₀₋₂×p₂₋₄) and (1 - p₀₋₃×p₃₋₄) are similar because their
-                # probability amounts are equal
-                for probability_amount, similar_path_amount in dict_for_second_formula.items():
-                    multiply_values *= pow(1 - pow(arg_general_edge_val, probability_amount), similar_path_amount)
-                return 1 - multiply_values
-
-            all_result_data["first_formula"] = first_formula
-            all_result_data["second_formula"] = second_formula
-            all_result_data["first_formula_functions"] = [
-                (first_formula_func,
-                 f"P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} ")
-            ]
-            all_result_data["second_formula_functions"] = [second_formula_func]
-        elif arg_chosen_method_ind == 1:  # "Litvak-Ushakov"
-            use_disjoint = (True, True)  # True, False
-            all_paths = list(nx.all_simple_paths(arg_defined_graph, first_node, last_node))
-            all_minimum_cuts = self._get_minimum_cuts(arg_defined_graph, first_node, last_node, 3)
-            print(all_minimum_cuts)
-            print("\n".join(map(str, all_minimum_cuts)))
-            dict_for_first_formula = {}  # simple paths info and formulas (including disjoint paths)
-            dict_for_first_formula2 = {}  # minimum cuts info and formulas (including disjoint cuts)
-            print("\nAll edge disjoint paths:")
-            disjoint_paths = list(nx.edge_disjoint_paths(arg_defined_graph, first_node, last_node))
-            print(disjoint_paths)
-            if not use_disjoint[0]:
-                disjoint_paths = []
-            all_paths_probabilities = "\nAll simple paths (including disjoint paths):\n"
-            for one_path_ind in range(len(all_paths)):
-                one_path = all_paths[one_path_ind]
-                if one_path in disjoint_paths:
-                    if one_path == disjoint_paths[0]:
-                        multiply_of_probabilities = "1 - "
-                        one_disjoint_path_group = []
-                        for one_disjoint_path in disjoint_paths:
-                            all_edges_in_disjoint_path = list(zip(one_disjoint_path, one_disjoint_path[1:]))
-                            one_disjoint_path_edges = [tuple(sorted(one_temp_edge)) for one_temp_edge in
-                                                       all_edges_in_disjoint_path]
-                            multiply_of_probabilities += "(1 - "
-                            multiply_of_probabilities += "×".join(
-                                "p" + self.get_subscript_number(one_edge[0] + 1) + "₋" + self.get_subscript_number(
-                                    one_edge[1] + 1)
-                                for one_edge in all_edges_in_disjoint_path
-                            )
-                            multiply_of_probabilities += ")"
-                            one_disjoint_path_group.append(one_disjoint_path_edges)
-                        dict_for_first_formula[one_path_ind] = (
-                            one_disjoint_path_group,
-                            multiply_of_probabilities
-                        )
-                        all_paths_probabilities += (f" {one_path_ind}. {tuple(one_disjoint_path_group)} "
-                                                    f"-> {multiply_of_probabilities}\n")
-                        print("first path")
-                    else:
-                        continue
-                else:
-                    all_edges_in_path = list(zip(one_path, one_path[1:]))
-                    one_path_edges = [tuple(sorted(one_temp_edge)) for one_temp_edge in all_edges_in_path]
-                    multiply_of_probabilities = "×".join([
-                        "p" + self.get_subscript_number(one_edge[0] + 1) + "₋" + self.get_subscript_number(
-                            one_edge[1] + 1)
-                        for one_edge in all_edges_in_path
-                    ])
-                    dict_for_first_formula[one_path_ind] = (
-                        [list(one_path_edges)],
-                        multiply_of_probabilities
-                    )
-                    all_paths_probabilities += f" {one_path_ind}. {tuple(one_path)} -> {multiply_of_probabilities}\n"
-            print("\nAll edge disjoint minimum cuts:")
-            disjoint_minimum_cuts = []
-            for one_minimum_cut_ind in range(len(all_minimum_cuts)):
-                if one_minimum_cut_ind == 0:
-                    disjoint_minimum_cuts.append([all_minimum_cuts[one_minimum_cut_ind]])
-                else:
-                    minimum_cut_is_added = False
-                    for one_already_added_group in disjoint_minimum_cuts:
-                        cut_is_disjoint = True
-                        for one_already_added_cut in one_already_added_group:
-                            if not set(all_minimum_cuts[one_minimum_cut_ind]).isdisjoint(one_already_added_cut):
-                                cut_is_disjoint = False
-                                break
-                        if cut_is_disjoint:
-                            minimum_cut_is_added = True
-                            one_already_added_group.append(all_minimum_cuts[one_minimum_cut_ind])
-                    if not minimum_cut_is_added:
-                        disjoint_minimum_cuts.append([all_minimum_cuts[one_minimum_cut_ind]])
-            print("\n".join(map(str, disjoint_minimum_cuts)))
-            if not use_disjoint[1]:
-                disjoint_minimum_cuts = [[one_temp_cut] for one_temp_cut in all_minimum_cuts]
-            all_minimum_cuts_probabilities = "All minimum cuts (including disjoint minimum cuts):\n"
-            for one_minimum_cut_group_ind in range(len(disjoint_minimum_cuts)):
-                one_minimum_cut_group = disjoint_minimum_cuts[one_minimum_cut_group_ind]
-                if len(one_minimum_cut_group) > 1:
-                    multiply_of_improbabilities = ""
-                    for the_disjoint_minimum_cut in one_minimum_cut_group:
-                        multiply_of_improbabilities += "(1 - " + "×".join([
-                            "q" + self.get_subscript_number(one_edge[0] + 1) + "₋" + self.get_subscript_number(
-                                one_edge[1] + 1)
-                            for one_edge in the_disjoint_minimum_cut
-                        ]) + ")"
-
-                    all_minimum_cuts_probabilities += (
-                        f" {one_minimum_cut_group_ind}. {one_minimum_cut_group}"
-                        f" -> {multiply_of_improbabilities}\n")
-
-                    dict_for_first_formula2[one_minimum_cut_group_ind] = (
-                        one_minimum_cut_group,
-                        multiply_of_improbabilities
-                    )
-                else:
-                    one_minimum_cut = one_minimum_cut_group[0]
-
-                    multiply_of_improbabilities = "1 - " + "×".join([
-                        "q" + self.get_subscript_number(one_edge[0] + 1) + "₋" + self.get_subscript_number(
-                            one_edge[1] + 1)
-                        for one_edge in one_minimum_cut
-                    ])
-                    all_minimum_cuts_probabilities += (f" {one_minimum_cut_group_ind}. {tuple(one_minimum_cut)}"
-                                                       f" -> {multiply_of_improbabilities}\n")
-                    dict_for_first_formula2[one_minimum_cut_group_ind] = (
-                        [one_minimum_cut],
-                        multiply_of_improbabilities
-                    )
-            print(all_paths_probabilities)
-            print(all_minimum_cuts_probabilities)
-            print(dict_for_first_formula)
-            print(dict_for_first_formula2)
-            first_formula = f"P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} ≥ max( "
-            first_formula += ", ".join([
-                the_one_path_info[1] for the_one_path_info in dict_for_first_formula.values()
-            ])
-            first_formula += (
-                f" )\nP{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} "
-                f" ≤ min( ")
-            first_formula += ", ".join([  # .replace("p", "q")
-                the_one_min_cut_info[1] for the_one_min_cut_info in dict_for_first_formula2.values()
-            ])
-            first_formula += " )"
-            second_formula = f"P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} ≥ max( "
-            second_formula += ", ".join(
-                ["1 - " + "".join([f"(1 - p{self.get_superscript_number(len(temp_disjoint_path))})"
-                                   for temp_disjoint_path in the_one_path_info[0]])
-                 if len(the_one_path_info[0]) > 1 else
-                 "p" + self.get_superscript_number(len(the_one_path_info[0][0]))
-                 for the_one_path_info in dict_for_first_formula.values()]
-            )
-            second_formula += (
-                f" )\nP{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} "
-                f" ≤ min( ")
-            second_formula += ", ".join([  # .replace("p", "q")
-                "".join([f"(1 - q{self.get_superscript_number(len(temp_disjoint_cut))})"
-                         for temp_disjoint_cut in the_one_min_cut_info[0]])
-                if len(the_one_min_cut_info[0]) > 1 else
-                "1 - q" + self.get_superscript_number(len(the_one_min_cut_info[0][0]))
-                for the_one_min_cut_info in dict_for_first_formula2.values()
-            ])
-            second_formula += " )"
-            print(first_formula)
-            print(second_formula)
-
-            def first_formula_func1(arg_all_edges_values):  # arg_all_edges_values -> {(0, 1): 2}...
-                # multiply_values = 1  # (1 - p₀₋₁×p₁₋₂) (1 - p₀₋₂)...
-                all_path_edges_values = []
-                improved_edges_values = {}  # replace (1, 0) with (0, 1), just sort keys-edges
-                for one_edge_to_sort, one_edge_value in arg_all_edges_values.items():
-                    improved_edges_values[tuple(sorted(one_edge_to_sort))] = one_edge_value
-                for one_path_group_info in dict_for_first_formula.values():
-                    one_path_group = one_path_group_info[0]
-                    if len(one_path_group) > 1:
-                        multiply_result = 1
-                        for the_disjoint_path in one_path_group:
-                            one_path_group_all_edges_values = [improved_edges_values[tuple(sorted(one_edge))]
-                                                               for one_edge in the_disjoint_path]
-                            multiply_result *= 1 - np.prod(one_path_group_all_edges_values)
-                        all_path_edges_values.append(1 - multiply_result)
-                    else:
-                        one_path_group_all_edges = one_path_group[0]
-                        one_path_group_all_edges_values = [improved_edges_values[tuple(sorted(one_edge))]
-                                                           for one_edge in one_path_group_all_edges]
-                        all_path_edges_values.append(np.prod(one_path_group_all_edges_values))
-                return max(all_path_edges_values)
-
-            def first_formula_func2(arg_all_edges_values):  # arg_all_edges_values -> {(0, 1): 0.5}...
-                all_min_cuts_edges_values = []
-                improved_edges_values = {}  # replace (1, 0) with (0, 1), just sort keys-edges
-                for one_edge_to_sort, one_edge_value in arg_all_edges_values.items():
-                    improved_edges_values[tuple(sorted(one_edge_to_sort))] = one_edge_value
-                for one_minimum_cut_group_info in dict_for_first_formula2.values():
-                    one_cut_group = one_minimum_cut_group_info[0]
-                    if len(one_cut_group) > 1:
-                        multiply_result = 1
-                        for the_disjoint_min_cut in one_cut_group:
-                            one_min_cut_all_edges_values = [1 - improved_edges_values[tuple(sorted(one_edge))]
-                                                            # q = 1 - p!
-                                                            for one_edge in the_disjoint_min_cut]
-                            multiply_result *= 1 - np.prod(one_min_cut_all_edges_values)
-                        all_min_cuts_edges_values.append(multiply_result)
-                    else:
-                        one_min_cut_all_edges = one_cut_group[0]
-                        one_min_cut_all_edges_values = [1 - improved_edges_values[tuple(sorted(one_edge))]  # q = 1 - p!
-                                                        for one_edge in one_min_cut_all_edges]
-                        all_min_cuts_edges_values.append(1 - np.prod(one_min_cut_all_edges_values))
-                return min(all_min_cuts_edges_values)
-
-            def second_formula_func1(arg_general_edge_val):  # arg_general_edge_val -> 1, 0, 0.23, 0.6...
-                generated_edge_values = {}
-                for the_one_generated_edge in self.chosen_graph_data.edges:
-                    generated_edge_values[the_one_generated_edge] = arg_general_edge_val
-                return first_formula_func1(generated_edge_values)
-
-            def second_formula_func2(arg_general_edge_val):  # arg_general_edge_val -> 1, 0, 0.23, 0.6...
-                generated_edge_values = {}
-                for the_one_generated_edge in self.chosen_graph_data.edges:
-                    generated_edge_values[the_one_generated_edge] = arg_general_edge_val
-                return first_formula_func2(generated_edge_values)
-
-            random_generated_edge_values = {}
-            for one_defined_edge in self.chosen_graph_data.edges:
-                random_generated_edge_values[one_defined_edge] = random.random()
-            print(random_generated_edge_values)
-            print(first_formula_func2(random_generated_edge_values))
-            for one_defined_edge in self.chosen_graph_data.edges:
-                random_generated_edge_values[one_defined_edge] = 0.5
-            print(random_generated_edge_values)
-            print(first_formula_func2(random_generated_edge_values))
-            for one_defined_edge in self.chosen_graph_data.edges:
-                random_generated_edge_values[one_defined_edge] = 1
-            print(random_generated_edge_values)
-            print(first_formula_func2(random_generated_edge_values))
-            # first_formula_func({(0, 1): 0.5, (0, 2): 0.4})
-            all_result_data["first_formula"] = first_formula
-            all_result_data["second_formula"] = second_formula
-            all_result_data["first_formula_functions"] = [
-                (first_formula_func1, "Range of values:"),
-                (first_formula_func2,
-                 f" ≤ P{self.get_subscript_number(first_node + 1)}₋{self.get_subscript_number(last_node + 1)} ≤ ")
-            ]
-            all_result_data["second_formula_functions"] = [
-                second_formula_func1,
-                second_formula_func2
-            ]
-        return all_result_data
+        return functional_stability.get_subscript_number(arg_integer)
 
     def define_functional_stability_method(self):
         if self.chosen_method_by_user == "":
             self.label1_defined_chosen_method.show()
             self.label2_defined_chosen_method.show()
             self.formulas_area.show()
+            self.run_metrics_label.show()
+            self.button_to_export_metrics.show()
             self.the_chart_canvas.show()
             self.node_selection_area.show()
             self.button_to_calculate.show()
             self.calculate_nodes_label.show()
+            self.button_to_show_importance.show()
         self.chosen_method_by_user = self.list_of_methods.currentText()
-        self.label2_defined_chosen_method.setText(self.chosen_method_by_user)
-        method_result_data = self._get_all_info_by_method(self.list_of_methods.currentIndex(), self.chosen_graph_data)
-        self.formulas_main_label.setText("General formula:\n" + method_result_data["first_formula"]
-                                         + "\nFormula, if p₁ = p₂ = ... = p:\n" + method_result_data["second_formula"])
-        first_functions_info = method_result_data["first_formula_functions"]
-
-        def demonstrate_calculated_info():
-            all_given_edges = list(self.chosen_graph_data.edges)
-            all_edges_probabilities = {}
-            for one_node_ind in range(len(all_given_edges)):
-                one_widget_edge_info = self.layout_selection.itemAt(one_node_ind).layout().itemAt(1).widget()
-                if isinstance(one_widget_edge_info, QtWidgets.QSlider):
-                    all_edges_probabilities[
-                        tuple(sorted(all_given_edges[one_node_ind]))] = one_widget_edge_info.value() / 100
-            calculated_result = ""
-            for one_defined_first_function, str_before_answer in first_functions_info:
-                calculated_result += str_before_answer + " " + str(one_defined_first_function(all_edges_probabilities))
-                # one_first_formula
-            self.calculate_nodes_label.setText(calculated_result)
-
-        self.button_to_calculate.clicked.connect(demonstrate_calculated_info)
+        if self.calculation_thread is not None and self.calculation_thread.isRunning():
+            return  # previous method is still calculated (it can be cancelled)
+        # enumeration, formulas and chart are calculated by other thread, results are shown by show_method_results
+        self.calculation_thread = MethodCalculationThread(self.chosen_graph_data, self.chosen_method_by_user,
+                                                          self.paths_enumeration_limits,
+                                                          self.cuts_enumeration_limits, self.chosen_paths_and_cuts,
+                                                          self.trace_memory_checkbox.isChecked(),
+                                                          self.get_fixed_edges_values(),
+                                                          self.get_edges_probabilities())
+        self.calculation_thread.stage_changed.connect(self.calculation_progress_label.setText)
+        self.calculation_thread.paths_found.connect(self.show_paths_progress)
+        self.calculation_thread.cuts_found.connect(self.show_cuts_progress)
+        self.calculation_thread.calculation_finished.connect(self.show_method_results)
+        self.calculation_thread.calculation_failed.connect(self.show_method_error)
+        self.calculation_thread.calculation_cancelled.connect(self.show_calculation_cancelled)
+        self.calculation_thread.finished.connect(self.finish_calculation)
+        self.button_to_define_method.setEnabled(False)
+        self.button_to_cancel_method.show()
+        self.calculation_progress_label.show()
+        self.calculation_thread.start()
+
+    def show_method_results(self, method_result_data, chart_x_values, all_chart_values):
+        self.calculation_progress_label.hide()
+        self.label2_defined_chosen_method.setText(method_result_data["method_name"])
+        # formulas are joined without copying of terms, rows are made only when they are shown
+        all_formulas_text = functional_stability.FormulaText()
+        if method_result_data["cuts_enumeration_stop_reason"] is not None:
+            all_formulas_text.add_line(f"Only {method_result_data['cuts_amount']} minimal cuts are used "
+                                       f"({method_result_data['cuts_enumeration_stop_reason']})")
+        if method_result_data["paths_enumeration_stop_reason"] is not None:
+            all_formulas_text.add_line(f"Only {method_result_data['paths_amount']} simple paths are used "
+                                       f"({method_result_data['paths_enumeration_stop_reason']})")
+        all_formulas_text.add_line("General formula:")
+        all_formulas_text.extend(method_result_data["first_formula"])
+        all_formulas_text.add_line("Formula, if p₁ = p₂ = ... = p:")
+        all_formulas_text.extend(method_result_data["second_formula"])
+        self.formulas_area.set_formula_text(all_formulas_text)
+        self.method_result_data = method_result_data
+        self.run_metrics = self.calculation_thread.run_metrics
+        self.run_metrics_label.setText(self.run_metrics.get_summary())
         self.the_chart_canvas.ax.cla()
-        x_values = np.arange(0, 1, 0.01)
-        for one_defined_second_function in method_result_data["second_formula_functions"]:
-            print([one_defined_second_function(one_x_value) for one_x_value in x_values])
-            self.the_chart_canvas.ax.plot(
-                x_values, [one_defined_second_function(one_x_value) for one_x_value in x_values]
-            )
+        for one_chart_values in all_chart_values:
+            # all values of chart were calculated by thread of calculation
+            self.the_chart_canvas.ax.plot(chart_x_values, one_chart_values)
         self.the_chart_canvas.ax.set_title("Equal probability of functional stability (p₁ = p₂ = ... = p)")
         self.the_chart_canvas.ax.grid()
         self.the_chart_canvas.draw()
@@ -1118,6 +935,9 @@ class AdditionalChartCanvas(FigureCanvasQTAgg):
 
 
 def main():
+    # debug messages (stages of methods, time of processing) are shown only with "--debug"
+    logging.basicConfig(level=logging.DEBUG if "--debug" in sys.argv else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
     app = QtWidgets.QApplication(sys.argv)
     w = MyMainWindow()
     w.show()
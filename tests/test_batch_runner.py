@@ -0,0 +1,96 @@
+"""Batch mode: rows of scenarios table -> rows of results table, in order of rows and by pool of processes"""
+import csv
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+from functional_stability import batch_runner
+from functional_stability.batch_runner import get_edge_column_name, run_batch
+
+# two blocks (cycles 0-1-2-3 and 3-4-5) with bridge 5-6
+blocks_graph = nx.Graph([(0, 1), (1, 2), (2, 3), (0, 3), (1, 3), (3, 4), (4, 5), (3, 5), (5, 6)])
+
+
+def write_scenarios(scenarios_file_path, all_probabilities):
+    all_edges = list(blocks_graph.edges)
+    with open(scenarios_file_path, "w", newline="", encoding="utf-8") as scenarios_file:
+        scenarios_writer = csv.writer(scenarios_file)
+        scenarios_writer.writerow(["name"] + [get_edge_column_name(one_edge) for one_edge in all_edges])
+        for one_row_ind, one_row_probabilities in enumerate(all_probabilities):
+            scenarios_writer.writerow([f"scenario {one_row_ind}"] + [repr(float(one_value))
+                                                                     for one_value in one_row_probabilities])
+
+
+def read_results(results_file_path):
+    with open(results_file_path, newline="", encoding="utf-8") as results_file:
+        return list(csv.DictReader(results_file))
+
+
+def get_expected_values(all_probabilities):
+    method_result_data = functional_stability.get_all_info_by_method(blocks_graph, "Binary decision diagram", 0, 6)
+    return method_result_data["first_formula_functions"][0][0].evaluate(np.array(all_probabilities))
+
+
+@pytest.mark.parametrize("processes_amount", [1, 2])
+def test_rows_are_calculated_in_order(tmp_path, processes_amount):
+    all_probabilities = np.random.default_rng(0).uniform(0., 1., (11, blocks_graph.number_of_edges()))
+    write_scenarios(tmp_path / "scenarios.csv", all_probabilities)
+    calculated_rows_amount = run_batch(blocks_graph, str(tmp_path / "scenarios.csv"), str(tmp_path / "results.csv"),
+                                       "Exhaustive search", 0, 6, processes_amount=processes_amount, rows_in_task=2)
+    all_results = read_results(tmp_path / "results.csv")
+    assert calculated_rows_amount == len(all_results) == 11
+    # the first line of table is header
+    assert [int(one_result["row"]) for one_result in all_results] == list(range(2, 13))
+    assert [one_result["name"] for one_result in all_results] == [f"scenario {one_ind}" for one_ind in range(11)]
+    assert [float(one_result["value"]) for one_result in all_results] == pytest.approx(
+        get_expected_values(all_probabilities))
+
+
+def test_pool_gets_only_several_tasks_at_once(tmp_path, monkeypatch):
+    all_probabilities = np.full((40, blocks_graph.number_of_edges()), 0.5)
+    write_scenarios(tmp_path / "scenarios.csv", all_probabilities)
+    all_submitted_tasks = []
+    all_not_written_amounts = []
+
+    class CountedProcessPool(batch_runner.ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            all_submitted_tasks.append(super().submit(*args, **kwargs))
+            return all_submitted_tasks[-1]
+
+    original_iterate_rows_tasks = batch_runner.iterate_rows_tasks
+
+    def iterate_counted_tasks(all_numbered_rows, edges_columns, rows_in_task):
+        for one_rows_task in original_iterate_rows_tasks(all_numbered_rows, edges_columns, rows_in_task):
+            # result of task is written only after its end
+            all_not_written_amounts.append(sum(not one_task.done() for one_task in all_submitted_tasks))
+            yield one_rows_task
+
+    monkeypatch.setattr(batch_runner, "ProcessPoolExecutor", CountedProcessPool)
+    monkeypatch.setattr(batch_runner, "iterate_rows_tasks", iterate_counted_tasks)
+    run_batch(blocks_graph, str(tmp_path / "scenarios.csv"), str(tmp_path / "results.csv"), "Binary decision diagram",
+              0, 6, processes_amount=2, rows_in_task=1)
+    assert len(all_submitted_tasks) == 40
+    assert max(all_not_written_amounts) <= 2 * batch_runner.tasks_in_flight_per_process
+    assert len(read_results(tmp_path / "results.csv")) == 40
+
+
+def test_exhaustive_search_inside_blocks_gets_one_process():
+    method_result_data = functional_stability.get_all_info_by_method(blocks_graph, "Exhaustive search", 0, 6)
+    blocks_evaluator = method_result_data["first_formula_functions"][0][0]
+    all_inner_evaluators = [one_evaluator for one_evaluator in blocks_evaluator.all_block_evaluators
+                            if one_evaluator is not None]
+    for one_evaluator in all_inner_evaluators:
+        one_evaluator.processes_amount = 4
+    assert blocks_evaluator.processes_amount == 4
+    blocks_evaluator.processes_amount = 1
+    assert [one_evaluator.processes_amount for one_evaluator in all_inner_evaluators] == [1] * len(
+        all_inner_evaluators)
+
+
+def test_wrong_probability_is_rejected(tmp_path):
+    write_scenarios(tmp_path / "scenarios.csv", [[0.5] * (blocks_graph.number_of_edges() - 1) + [1.5]])
+    with pytest.raises(ValueError, match="Row 2"):
+        run_batch(blocks_graph, str(tmp_path / "scenarios.csv"), str(tmp_path / "results.csv"),
+                  "Binary decision diagram", 0, 6, processes_amount=1)
@@ -0,0 +1,49 @@
+"""Blocks of block-cut tree between source and target: product of functions of blocks and of their polynomials"""
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+from functional_stability.block_decomposition import BlockDecomposition, BlocksProductEvaluator
+
+# triangle 0-1-2, bridge 2-3, square 3-4-5-6 and triangle 7-8-9 outside of path between 0 and 5
+blocks_graph = nx.Graph([(0, 1), (1, 2), (0, 2), (2, 3), (3, 4), (4, 5), (5, 6), (3, 6), (6, 7), (7, 8), (8, 9),
+                         (7, 9)])
+
+
+def test_blocks_of_path_between_terminals():
+    block_decomposition = BlockDecomposition(list(blocks_graph.edges), 0, 5)
+    assert block_decomposition.all_blocks_terminals == [(0, 2), (2, 3), (3, 5)]
+    assert [len(all_block_edges) for all_block_edges in block_decomposition.all_blocks_edges] == [3, 1, 4]
+    assert block_decomposition.bridges_amount == 1 and not block_decomposition.is_trivial
+    # one block
+    assert BlockDecomposition(list(blocks_graph.edges), 3, 5).is_trivial
+    assert len(BlockDecomposition([(0, 1), (2, 3)], 0, 3)) == 0
+
+
+def test_product_of_blocks_functions():
+    block_decomposition = BlockDecomposition(list(blocks_graph.edges), 0, 5)
+    all_block_diagrams = [None if block_decomposition.is_bridge(block_ind) else
+                          functional_stability.get_connectivity_diagram(
+                              block_decomposition.get_block_graph(block_ind),
+                              *block_decomposition.all_blocks_terminals[block_ind])
+                          for block_ind in range(len(block_decomposition))]
+    blocks_evaluator = BlocksProductEvaluator(all_block_diagrams, block_decomposition)
+    probabilities_matrix = np.random.default_rng(0).uniform(0., 1., (6, blocks_graph.number_of_edges()))
+    original_diagram = functional_stability.get_connectivity_diagram(blocks_graph, 0, 5)
+    assert blocks_evaluator.evaluate(probabilities_matrix) == pytest.approx(
+        original_diagram.evaluate(probabilities_matrix))
+    product_polynomial = block_decomposition.get_reliability_polynomial([
+        None if one_diagram is None else one_diagram.get_reliability_polynomial()
+        for one_diagram in all_block_diagrams])
+    # edges outside of blocks don't change polynomial
+    assert product_polynomial.edges_amount == 8
+    assert product_polynomial.evaluate_uniform(np.linspace(0, 1, 5)) == pytest.approx(
+        original_diagram.evaluate_uniform(np.linspace(0, 1, 5)))
+
+
+def test_blocks_method_is_used_by_engine():
+    method_result_data = functional_stability.get_all_info_by_method(blocks_graph, "Binary decision diagram", 0, 5,
+                                                                     arg_reduce_graph=False)
+    assert method_result_data["block_decomposition"].all_blocks_terminals == [(0, 2), (2, 3), (3, 5)]
+    assert isinstance(method_result_data["first_formula_functions"][0][0], BlocksProductEvaluator)
@@ -0,0 +1,72 @@
+"""Minimal s-t cuts of own enumerator and of variants of search against check of all sets of edges"""
+import itertools
+
+import networkx as nx
+import pytest
+
+from functional_stability.cuts_enumeration import get_canonical_cut, iterate_minimal_cuts
+from functional_stability.engine import get_minimum_cuts
+from functional_stability.paths_enumeration import EnumerationBudget
+
+
+def separates(arg_defined_graph, arg_source, arg_target, one_cut):
+    cut_graph = arg_defined_graph.copy()
+    cut_graph.remove_edges_from(one_cut)
+    return not nx.has_path(cut_graph, arg_source, arg_target)
+
+
+def get_all_minimal_cuts(arg_defined_graph, arg_source, arg_target):
+    # every set of edges, which separates source and target, while no set without one its edge does it
+    all_edges = [tuple(sorted(one_edge)) for one_edge in arg_defined_graph.edges]
+    all_minimal_cuts = set()
+    for cut_size in range(1, len(all_edges) + 1):
+        for one_cut in itertools.combinations(all_edges, cut_size):
+            if separates(arg_defined_graph, arg_source, arg_target, one_cut) and not any(
+                    separates(arg_defined_graph, arg_source, arg_target, one_cut[:one_ind] + one_cut[one_ind + 1:])
+                    for one_ind in range(cut_size)):
+                all_minimal_cuts.add(tuple(get_canonical_cut(one_cut)))
+    return all_minimal_cuts
+
+
+def get_random_graph(seed):
+    # all these graphs are connected
+    return nx.gnm_random_graph(6, 9, seed=seed)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_enumerator_gives_every_minimal_cut_once(seed):
+    defined_graph = get_random_graph(seed)
+    all_found_cuts = [tuple(one_cut) for one_cut in iterate_minimal_cuts(defined_graph, 0, 5)]
+    assert len(all_found_cuts) == len(set(all_found_cuts))
+    assert set(all_found_cuts) == get_all_minimal_cuts(defined_graph, 0, 5)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_variants_of_search(seed):
+    defined_graph = get_random_graph(seed)
+    all_minimal_cuts = get_all_minimal_cuts(defined_graph, 0, 5)
+    # variant 3 (igraph, doubled edges) and variant 5 (own enumerator) give all minimal cuts
+    for selected_variant in [3, 5]:
+        all_found_cuts = [tuple(one_cut) for one_cut in get_minimum_cuts(defined_graph, 0, 5, selected_variant)]
+        assert sorted(all_found_cuts) == sorted(all_minimal_cuts)
+    # variant 4 gives minimal cuts of minimum size
+    minimum_size = min(len(one_cut) for one_cut in all_minimal_cuts)
+    assert sorted(tuple(one_cut) for one_cut in get_minimum_cuts(defined_graph, 0, 5, 4)) == sorted(
+        one_cut for one_cut in all_minimal_cuts if len(one_cut) == minimum_size)
+    # variants 1 and 2 give minimum cuts of pairs of nodes, variant 2 - only of global minimum size
+    all_pairs_cuts = get_minimum_cuts(defined_graph, 0, 5, 1)
+    assert all(not nx.is_connected(nx.restricted_view(defined_graph, [], one_cut)) for one_cut in all_pairs_cuts)
+    assert {len(one_cut) for one_cut in get_minimum_cuts(defined_graph, 0, 5, 2)} == {
+        nx.edge_connectivity(defined_graph)}
+
+
+def test_limit_of_cuts_amount():
+    enumeration_budget = EnumerationBudget(max_paths_amount=3, items_name="cuts")
+    assert len(list(iterate_minimal_cuts(nx.complete_graph(5), 0, 4, enumeration_budget))) == 3
+    assert enumeration_budget.stop_reason == "limit of 3 cuts is reached"
+
+
+def test_nothing_to_cut():
+    defined_graph = nx.Graph([(0, 1), (2, 3)])
+    assert list(iterate_minimal_cuts(defined_graph, 0, 3)) == []
+    assert list(iterate_minimal_cuts(defined_graph, 0, 0)) == []
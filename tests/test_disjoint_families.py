@@ -0,0 +1,89 @@
+"""Families of pairwise edge-disjoint cuts (paths) with maximum weight against check of all sets of members"""
+import itertools
+import math
+import random
+
+import networkx as nx
+import pytest
+
+import functional_stability
+from functional_stability.cuts_enumeration import iterate_minimal_cuts
+from functional_stability.disjoint_families import DisjointFamiliesSearch, get_cut_weight
+from functional_stability.edge_bitmasks import iterate_bits
+
+
+def is_disjoint_family(one_family):
+    all_family_edges = [tuple(sorted(one_edge)) for one_member in one_family for one_edge in one_member]
+    return len(all_family_edges) == len(set(all_family_edges))
+
+
+def get_best_weight(all_members, all_weights):
+    # the heaviest of all sets of pairwise disjoint members
+    best_weight = 0.
+    for family_size in range(1, len(all_members) + 1):
+        for family_indices in itertools.combinations(range(len(all_members)), family_size):
+            if is_disjoint_family([all_members[one_ind] for one_ind in family_indices]):
+                best_weight = max(best_weight, sum(all_weights[one_ind] for one_ind in family_indices))
+    return best_weight
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_family_of_cuts_has_maximum_weight(seed):
+    defined_graph = nx.gnm_random_graph(6, 10, seed=seed)
+    all_minimal_cuts = list(iterate_minimal_cuts(defined_graph, 0, 5))[:14]
+    random_generator = random.Random(seed)
+    all_weights = [random_generator.uniform(0.1, 1.) for _ in all_minimal_cuts]
+    disjoint_families_search = DisjointFamiliesSearch(all_minimal_cuts, list(defined_graph.edges))
+    best_family = [all_minimal_cuts[one_ind] for one_ind in iterate_bits(disjoint_families_search.get_best_family(
+        all_weights))]
+    assert disjoint_families_search.search_is_complete
+    assert is_disjoint_family(best_family)
+    assert sum(all_weights[all_minimal_cuts.index(one_cut)] for one_cut in best_family) == pytest.approx(
+        get_best_weight(all_minimal_cuts, all_weights))
+
+
+def test_families_cover_all_members():
+    defined_graph = nx.gnm_random_graph(7, 13, seed=1)
+    all_minimal_cuts = list(iterate_minimal_cuts(defined_graph, 0, 6))
+    all_weights_variants = [[get_cut_weight(len(one_cut), one_probability) for one_cut in all_minimal_cuts]
+                            for one_probability in (0.1, 0.9)]
+    all_families = DisjointFamiliesSearch(all_minimal_cuts, list(defined_graph.edges)).get_families(
+        all_weights_variants)
+    assert all(is_disjoint_family(one_family) for one_family in all_families)
+    assert {tuple(one_cut) for one_family in all_families for one_cut in one_family} == {
+        tuple(one_cut) for one_cut in all_minimal_cuts}
+    # without covering there is one family for every variant of weights at most
+    assert len(DisjointFamiliesSearch(all_minimal_cuts, list(defined_graph.edges)).get_families(
+        all_weights_variants, cover_all_members=False)) <= 2
+
+
+def test_limited_search_gives_greedy_family():
+    all_members = [[(0, 1)], [(0, 1), (1, 2)], [(1, 2)]]
+    disjoint_families_search = DisjointFamiliesSearch(all_members, [(0, 1), (1, 2)])
+    disjoint_families_search.max_search_nodes = 0
+    # the heaviest member goes first, other members have common edge with it
+    assert list(iterate_bits(disjoint_families_search.get_best_family([1., 1.5, 1.]))) == [1]
+    assert not disjoint_families_search.search_is_complete
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_families_of_paths_tighten_lower_bound(seed):
+    # lower bound is maximum over groups of disjoint paths, so it isn't lower than bound of paths of networkx
+    defined_graph = nx.gnm_random_graph(7, 13, seed=seed)
+    edges_probabilities = {tuple(sorted(one_edge)): random.Random(seed + one_ind).uniform(0.1, 0.9)
+                           for one_ind, one_edge in enumerate(defined_graph.edges)}
+    method_result_data = functional_stability.get_all_info_by_method(
+        defined_graph, "Litvak-Ushakov", 0, 6, arg_reduce_graph=False, arg_decompose_blocks=False,
+        arg_edges_probabilities=edges_probabilities)
+    lower_bound = method_result_data["first_formula_functions"][0][0]
+    # families are lists of edges of paths
+    networkx_paths_family = [list(nx.utils.pairwise(one_path))
+                             for one_path in nx.edge_disjoint_paths(defined_graph, 0, 6)]
+    assert method_result_data["disjoint_paths_families"]
+    assert all(is_disjoint_family(one_family) for one_family in method_result_data["disjoint_paths_families"])
+    networkx_paths_bound = 1 - math.prod(
+        1 - math.prod(edges_probabilities[tuple(sorted(one_edge))] for one_edge in one_path_edges)
+        for one_path_edges in networkx_paths_family)
+    assert lower_bound(edges_probabilities) >= networkx_paths_bound - 1e-12
+    assert lower_bound(edges_probabilities) <= method_result_data["first_formula_functions"][1][0](
+        edges_probabilities) + 1e-12
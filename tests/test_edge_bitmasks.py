@@ -0,0 +1,23 @@
+"""Edge sets as bitmasks: order and direction of edges, packed rows of more than 64 edges"""
+import numpy as np
+
+from functional_stability.edge_bitmasks import EdgeBitmaskIndex, get_disjoint_rows, iterate_bits
+
+
+def test_order_and_direction_of_edges_are_not_important():
+    bitmask_index = EdgeBitmaskIndex([(0, 1), (2, 1), (0, 2)])
+    assert bitmask_index.get_bitmask([(1, 0), (0, 2)]) == bitmask_index.get_bitmask([(0, 2), (0, 1)]) == 0b101
+    assert bitmask_index.get_bitmask([]) == 0
+    assert list(iterate_bits(0b101)) == [0, 2]
+
+
+def test_long_bitmask_and_packed_rows():
+    # edges of path 0-1-...-100, bitmask is longer than one word
+    bitmask_index = EdgeBitmaskIndex([(one_node, one_node + 1) for one_node in range(100)])
+    assert bitmask_index.words_amount == 2
+    long_bitmask = bitmask_index.get_bitmask([(3, 4), (70, 71), (99, 100)])
+    assert list(iterate_bits(long_bitmask)) == [3, 70, 99]
+    packed_rows = np.array([bitmask_index.get_packed_row(one_bitmask)
+                            for one_bitmask in (long_bitmask, 1 << 70, 1 << 5)])
+    assert packed_rows[0].tolist() == [1 << 3, (1 << 6) | (1 << 35)]
+    assert get_disjoint_rows(packed_rows, bitmask_index.get_packed_row(1 << 70)).tolist() == [False, False, True]
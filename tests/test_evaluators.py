@@ -0,0 +1,59 @@
+"""Compiled formulas of paths and cuts: probabilities as dictionary, vector or matrix of scenarios"""
+import numpy as np
+import pytest
+
+from functional_stability.evaluators import (
+    CutGroupsEvaluator,
+    PathGroupsEvaluator,
+    PathsFormulaEvaluator,
+    get_probabilities_matrix,
+)
+
+triangle_edges = [(0, 1), (1, 2), (0, 2)]
+# simple paths of triangle from 0 to 2
+triangle_paths = [[(0, 2)], [(0, 1), (1, 2)]]
+
+
+def test_dictionary_gives_one_scenario_in_columns_of_edges():
+    probabilities_matrix = get_probabilities_matrix({(2, 1): 0.2, (0, 1): 0.1, (0, 2): 0.3},
+                                                    {(0, 1): 0, (1, 2): 1, (0, 2): 2})
+    assert probabilities_matrix.tolist() == [[0.1, 0.2, 0.3]]
+
+
+def test_dictionary_without_edge_is_rejected():
+    with pytest.raises(ValueError, match=r"\(0, 2\)"):
+        get_probabilities_matrix({(0, 1): 0.5, (1, 2): 0.5}, {(0, 1): 0, (1, 2): 1, (0, 2): 2})
+
+
+def test_dictionary_with_unknown_edge_is_rejected():
+    with pytest.raises(ValueError, match=r"\(2, 3\)"):
+        get_probabilities_matrix({(0, 1): 0.5, (1, 2): 0.5, (0, 2): 0.5, (2, 3): 0.5},
+                                 {(0, 1): 0, (1, 2): 1, (0, 2): 2})
+
+
+def test_matrix_with_other_amount_of_edges_is_rejected():
+    with pytest.raises(ValueError):
+        get_probabilities_matrix(np.full((4, 2), 0.5), {(0, 1): 0, (1, 2): 1, (0, 2): 2})
+
+
+def test_paths_formula_for_dictionary_vector_and_matrix():
+    paths_evaluator = PathsFormulaEvaluator(triangle_paths, triangle_edges)
+    # 1 - (1 - p₀₋₂)(1 - p₀₋₁×p₁₋₂)
+    expected_value = 1 - (1 - 0.3) * (1 - 0.1 * 0.2)
+    assert paths_evaluator({(0, 1): 0.1, (1, 2): 0.2, (0, 2): 0.3}) == pytest.approx(expected_value)
+    assert paths_evaluator(np.array([0.1, 0.2, 0.3])) == pytest.approx(expected_value)
+    all_values = paths_evaluator(np.array([[0.1, 0.2, 0.3], [1., 1., 0.], [0., 0., 0.]]))
+    assert all_values == pytest.approx([expected_value, 1., 0.])
+    with pytest.raises(ValueError):
+        paths_evaluator({(0, 1): 0.1, (1, 2): 0.2})
+
+
+def test_groups_of_paths_and_cuts():
+    # max over groups of disjoint paths and min over groups of disjoint cuts
+    paths_evaluator = PathGroupsEvaluator([[triangle_paths[0]], triangle_paths], triangle_edges)
+    cuts_evaluator = CutGroupsEvaluator([[[(0, 2), (0, 1)]], [[(0, 2), (1, 2)]]], triangle_edges)
+    probabilities = {(0, 1): 0.5, (1, 2): 0.5, (0, 2): 0.5}
+    assert paths_evaluator(probabilities) == pytest.approx(1 - 0.5 * 0.75)
+    assert cuts_evaluator(probabilities) == pytest.approx(0.75)
+    # there is no group at all
+    assert PathGroupsEvaluator([], triangle_edges)(probabilities) == 0.
@@ -0,0 +1,36 @@
+"""Exhaustive search: shards of states in pool of processes and cancel of calculation"""
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+from functional_stability import exhaustive_search
+from functional_stability.exhaustive_search import ExhaustiveSearchEvaluator
+from functional_stability.paths_enumeration import CalculationCancelled, EnumerationBudget, cancellation_scope
+
+# 24 edges, so states are split into shards of processes (min_edges_amount_for_processes)
+grid_graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(4, 4))
+
+
+def test_shards_of_processes_give_the_same_values():
+    all_edges = list(grid_graph.edges)
+    probabilities_matrix = np.random.default_rng(0).uniform(0., 1., (3, len(all_edges)))
+    single_process_evaluator = ExhaustiveSearchEvaluator(all_edges, 0, 15, processes_amount=1)
+    processes_evaluator = ExhaustiveSearchEvaluator(all_edges, 0, 15, processes_amount=2)
+    assert processes_evaluator.evaluate(probabilities_matrix) == pytest.approx(
+        single_process_evaluator.evaluate(probabilities_matrix))
+    connectivity_diagram = functional_stability.get_connectivity_diagram(grid_graph, 0, 15)
+    assert single_process_evaluator.evaluate(probabilities_matrix) == pytest.approx(
+        connectivity_diagram.evaluate(probabilities_matrix))
+
+
+@pytest.mark.parametrize("processes_amount", [1, 2])
+def test_cancel_of_states_search(processes_amount):
+    exhaustive_search_evaluator = ExhaustiveSearchEvaluator(list(grid_graph.edges), 0, 15,
+                                                            processes_amount=processes_amount)
+    enumeration_budget = EnumerationBudget()
+    enumeration_budget.cancel()
+    with cancellation_scope(enumeration_budget), pytest.raises(CalculationCancelled):
+        exhaustive_search_evaluator.get_reliability_polynomial()
+    # shards of cancelled pool aren't waited for, the next calculation starts new pool
+    assert processes_amount not in exhaustive_search._processes_pools
@@ -0,0 +1,52 @@
+"""Formula as lines of terms: rows of view, search, text by parts and terms which are made when they are read"""
+import io
+import pickle
+
+import pytest
+
+from functional_stability.formula_text import FormulaText, MappedTerms
+
+
+def get_path_term(one_path):
+    return "(1 - " + "×".join(f"p{first_node}₋{second_node}" for first_node, second_node in one_path) + ")"
+
+
+def get_paths_formula():
+    paths_formula = FormulaText.from_text("P₁₋₃ = 1 - Π(1 - Π p) =")
+    all_terms = paths_formula.add_line("1 - ", terms_separator="×", line_suffix=" (2 paths)")
+    all_terms.extend(["(1 - p1₋3)", "(1 - p1₋2×p2₋3)"])
+    return paths_formula
+
+
+def test_rows_and_text():
+    paths_formula = get_paths_formula()
+    assert str(paths_formula) == "P₁₋₃ = 1 - Π(1 - Π p) =\n1 - (1 - p1₋3)×(1 - p1₋2×p2₋3) (2 paths)"
+    # first line, prefix of second line, two terms and suffix
+    assert len(paths_formula) == 5 and paths_formula.terms_amount == 2
+    assert [paths_formula.get_row(one_row_ind) for one_row_ind in range(5)] == [
+        "P₁₋₃ = 1 - Π(1 - Π p) =", "1 - ", "  1: (1 - p1₋3)", "  2: (1 - p1₋2×p2₋3)", " (2 paths)"]
+    with pytest.raises(IndexError):
+        paths_formula.get_row(5)
+    text_file = io.StringIO()
+    paths_formula.write_text(text_file)
+    assert text_file.getvalue() == str(paths_formula)
+
+
+def test_search_of_rows():
+    paths_formula = get_paths_formula()
+    assert paths_formula.find_row("P1₋2") == 3
+    # search goes from start row, then from beginning
+    assert paths_formula.find_row("(1 - ", start_row=3) == 3
+    assert paths_formula.find_row("Π", start_row=3) == 0
+    assert paths_formula.find_row("p5") is None and paths_formula.find_row("") is None
+
+
+def test_mapped_terms_are_made_when_they_are_read():
+    all_paths = [[(1, 3)], [(1, 2), (2, 3)]]
+    mapped_terms = MappedTerms(all_paths, get_path_term)
+    paths_formula = FormulaText()
+    paths_formula.add_line("1 - ", mapped_terms, "×")
+    assert paths_formula.get_row(2) == "  2: (1 - p1₋2×p2₋3)"
+    assert str(paths_formula) == "1 - (1 - p1₋3)×(1 - p1₋2×p2₋3)"
+    # module-level function of terms, so formula is kept by cache of results
+    assert str(pickle.loads(pickle.dumps(paths_formula))) == str(paths_formula)
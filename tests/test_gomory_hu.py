@@ -0,0 +1,42 @@
+"""All-pairs minimum cuts by one Gomory-Hu tree against max-flow of every pair of nodes"""
+import itertools
+
+import networkx as nx
+
+from functional_stability.gomory_hu import AllPairsMinimumCuts, get_all_pairs_minimum_cuts
+
+
+def check_all_pairs(arg_defined_graph):
+    all_pairs_cuts = AllPairsMinimumCuts(arg_defined_graph)
+    for first_node, second_node in itertools.combinations(arg_defined_graph.nodes, 2):
+        minimum_cut = all_pairs_cuts.get_minimum_cut(first_node, second_node)
+        assert all_pairs_cuts.get_minimum_cut_size(first_node, second_node) == len(minimum_cut)
+        if nx.has_path(arg_defined_graph, first_node, second_node):
+            assert len(minimum_cut) == len(nx.minimum_edge_cut(arg_defined_graph, first_node, second_node))
+            # edges of cut separate nodes
+            cut_graph = arg_defined_graph.copy()
+            cut_graph.remove_edges_from(minimum_cut)
+            assert not nx.has_path(cut_graph, first_node, second_node)
+        else:
+            assert minimum_cut == []
+
+
+def test_every_pair_of_random_graphs():
+    for seed in range(5):
+        check_all_pairs(nx.gnm_random_graph(8, 14, seed=seed))
+
+
+def test_pairs_of_different_components():
+    # two triangles and isolated node
+    defined_graph = nx.Graph([(0, 1), (1, 2), (0, 2), (3, 4), (4, 5), (3, 5)])
+    defined_graph.add_node(6)
+    check_all_pairs(defined_graph)
+    assert AllPairsMinimumCuts(defined_graph).get_all_minimum_cuts(only_global_minimum=True) == [[]]
+
+
+def test_global_minimum_cuts():
+    # bridge 2-3 between two triangles is the only global minimum cut
+    defined_graph = nx.Graph([(0, 1), (1, 2), (0, 2), (2, 3), (3, 4), (4, 5), (3, 5)])
+    assert get_all_pairs_minimum_cuts(defined_graph).get_all_minimum_cuts(only_global_minimum=True) == [[(2, 3)]]
+    # table of the same graph is taken from cache
+    assert get_all_pairs_minimum_cuts(defined_graph.copy()) is get_all_pairs_minimum_cuts(defined_graph)
@@ -0,0 +1,56 @@
+"""Reduction of graph keeps reliability: Ω × P(reduced graph) against diagram of original graph"""
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+from functional_stability.graph_reduction import GraphReduction, ReducedGraphEvaluator, get_polygon_values
+
+
+def get_reduced_evaluator(arg_defined_graph, arg_source, arg_target, fixed_edges_values=None):
+    graph_reduction = GraphReduction(list(arg_defined_graph.edges), arg_source, arg_target, fixed_edges_values)
+    reduced_diagram = functional_stability.get_connectivity_diagram(
+        graph_reduction.reduced_graph, graph_reduction.reduced_source, graph_reduction.reduced_target)
+    return ReducedGraphEvaluator(reduced_diagram, graph_reduction), graph_reduction
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_graphs(seed):
+    defined_graph = nx.gnm_random_graph(9, 13, seed=seed)
+    probabilities_matrix = np.random.default_rng(seed).uniform(0., 1., (5, defined_graph.number_of_edges()))
+    reduced_evaluator, _ = get_reduced_evaluator(defined_graph, 0, 8)
+    original_diagram = functional_stability.get_connectivity_diagram(defined_graph, 0, 8)
+    assert reduced_evaluator.evaluate(probabilities_matrix) == pytest.approx(
+        original_diagram.evaluate(probabilities_matrix))
+
+
+def test_series_parallel_graph_is_one_edge():
+    # two paths 0-1-3 and 0-2-3, dangling edge 3-4
+    defined_graph = nx.Graph([(0, 1), (1, 3), (0, 2), (2, 3), (3, 4)])
+    reduced_evaluator, graph_reduction = get_reduced_evaluator(defined_graph, 0, 3)
+    assert graph_reduction.reduced_graph.number_of_edges() == 1
+    assert graph_reduction.reductions_amounts["removed"] == 1
+    assert graph_reduction.reductions_amounts["series"] == 2 and graph_reduction.reductions_amounts["parallel"] == 1
+    assert reduced_evaluator.evaluate_uniform(0.5) == pytest.approx(1 - 0.75 ** 2)
+
+
+def test_fixed_edges_are_deleted_and_contracted():
+    defined_graph = nx.Graph([(0, 1), (1, 3), (0, 2), (2, 3)])
+    fixed_edges_values = {(1, 0): 0., (2, 3): 1.}
+    reduced_evaluator, graph_reduction = get_reduced_evaluator(defined_graph, 0, 3, fixed_edges_values)
+    assert graph_reduction.reductions_amounts["deleted"] == 1 and graph_reduction.reductions_amounts["contracted"] == 1
+    # only edge 0-2 is left
+    assert reduced_evaluator({(0, 1): 0., (1, 3): 0.9, (0, 2): 0.4, (2, 3): 1.}) == pytest.approx(0.4)
+
+
+def test_polygon_to_chain():
+    all_probabilities = np.array([0.2, 0.6, 0.9])
+    first_chain_probability, second_chain_probability, chain_factor = get_polygon_values(*all_probabilities[:, None])
+    # x is connected with a only, with b only and with both: the same probabilities for triangle and chain
+    first_probability, second_probability, third_probability = all_probabilities
+    assert chain_factor * first_chain_probability * second_chain_probability == pytest.approx(
+        1 - (1 - first_probability * third_probability) * (1 - second_probability)
+        - (1 - second_probability * third_probability) * (1 - first_probability)
+        + (1 - first_probability) * (1 - second_probability))
+    assert chain_factor * first_chain_probability * (1 - second_chain_probability) == pytest.approx(
+        first_probability * (1 - second_probability) * (1 - third_probability))
@@ -0,0 +1,33 @@
+"""Birnbaum importance of edges: derivatives of diagram, scenarios of other evaluators and ranking of edges"""
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+from functional_stability.evaluators import PathsFormulaEvaluator
+from functional_stability.importance import get_birnbaum_importances, get_importance_ranking
+
+
+def test_importances_of_series_and_parallel_edges():
+    # path 0-1-2 and edge 0-2: P = 1 - (1 - p₀₂)(1 - p₀₁p₁₂)
+    all_edges = [(0, 1), (1, 2), (0, 2)]
+    paths_evaluator = PathsFormulaEvaluator([[(0, 2)], [(0, 1), (1, 2)]], all_edges)
+    all_importances = get_birnbaum_importances(paths_evaluator, {(0, 1): 0.5, (1, 2): 0.8, (0, 2): 0.3})
+    assert all_importances == pytest.approx([0.8 * 0.7, 0.5 * 0.7, 1 - 0.5 * 0.8])
+    assert get_importance_ranking(all_edges, all_importances) == [((0, 2), pytest.approx(0.6)),
+                                                                  ((0, 1), pytest.approx(0.56)),
+                                                                  ((1, 2), pytest.approx(0.35))]
+
+
+def test_derivatives_of_diagram_are_the_same_as_scenarios():
+    defined_graph = nx.gnm_random_graph(7, 12, seed=3)
+    connectivity_diagram = functional_stability.get_connectivity_diagram(defined_graph, 0, 6)
+    all_edges_values = np.random.default_rng(3).uniform(0.1, 0.9, defined_graph.number_of_edges())
+
+    class ScenariosOnlyEvaluator:
+        # the same function without own derivatives
+        edges_index = connectivity_diagram.edges_index
+        evaluate = staticmethod(connectivity_diagram.evaluate)
+
+    assert get_birnbaum_importances(connectivity_diagram, all_edges_values) == pytest.approx(
+        get_birnbaum_importances(ScenariosOnlyEvaluator(), all_edges_values))
@@ -0,0 +1,49 @@
+"""Paths and minimal cuts after edits of graph against full enumeration of edited graph"""
+import random
+
+import networkx as nx
+import pytest
+
+from functional_stability.cuts_enumeration import iterate_minimal_cuts
+from functional_stability.incremental_structure import IncrementalPathsAndCuts
+
+
+def check_sets(paths_and_cuts, arg_defined_graph, arg_source, arg_target):
+    assert paths_and_cuts.matches(arg_defined_graph, arg_source, arg_target)
+    assert sorted(map(tuple, paths_and_cuts.get_paths())) == sorted(
+        map(tuple, nx.all_simple_paths(arg_defined_graph, arg_source, arg_target)))
+    assert sorted(map(tuple, paths_and_cuts.get_cuts())) == sorted(
+        map(tuple, iterate_minimal_cuts(arg_defined_graph, arg_source, arg_target)))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_edits(seed):
+    random_generator = random.Random(seed)
+    defined_graph = nx.gnm_random_graph(7, 10, seed=seed)
+    paths_and_cuts = IncrementalPathsAndCuts(defined_graph, 0, 6)
+    check_sets(paths_and_cuts, defined_graph, 0, 6)
+    for _ in range(12):
+        first_node, second_node = random_generator.sample(range(7), 2)
+        # edits of editor: sets are changed together with graph
+        if defined_graph.has_edge(first_node, second_node):
+            defined_graph.remove_edge(first_node, second_node)
+            paths_and_cuts.remove_edge(first_node, second_node)
+        else:
+            defined_graph.add_edge(first_node, second_node)
+            paths_and_cuts.add_edge(first_node, second_node)
+        check_sets(paths_and_cuts, defined_graph, 0, 6)
+
+
+def test_removed_node_and_other_graph():
+    defined_graph = nx.cycle_graph(5)
+    paths_and_cuts = IncrementalPathsAndCuts(defined_graph, 0, 2)
+    defined_graph.remove_node(1)
+    paths_and_cuts.remove_node(1)
+    check_sets(paths_and_cuts, defined_graph, 0, 2)
+    assert not paths_and_cuts.matches(nx.cycle_graph(5), 0, 2)
+    assert not paths_and_cuts.matches(defined_graph, 0, 3)
+
+
+def test_partial_sets_are_not_given():
+    paths_and_cuts = IncrementalPathsAndCuts(nx.complete_graph(5), 0, 4, paths_limits={"max_paths_amount": 2})
+    assert paths_and_cuts.get_paths() is None and paths_and_cuts.get_cuts() is None
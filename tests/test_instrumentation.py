@@ -0,0 +1,61 @@
+"""Stages of run: own time of nested stages, time of generator, memory and counters, summary and JSON"""
+import json
+import time
+
+import networkx as nx
+import pytest
+
+import functional_stability
+from functional_stability.instrumentation import RunMetrics
+
+
+def test_inner_stage_isnt_counted_by_outer_stage():
+    run_metrics = RunMetrics()
+    with run_metrics.measure_stage("compilation"):
+        with run_metrics.measure_stage("paths enumeration"):
+            time.sleep(0.05)
+    assert run_metrics.stages["paths enumeration"]["seconds"] >= 0.05
+    assert run_metrics.stages["compilation"]["seconds"] < run_metrics.stages["paths enumeration"]["seconds"]
+    assert run_metrics.stages["compilation"]["calls"] == 1
+
+
+def test_time_of_generator_items():
+    def iterate_slowly():
+        for one_item in range(3):
+            time.sleep(0.01)
+            yield one_item
+
+    run_metrics = RunMetrics()
+    all_items = []
+    start_time = time.perf_counter()
+    for one_item in run_metrics.iterate_stage("paths enumeration", iterate_slowly(), "paths"):
+        time.sleep(0.02)  # reader of items isn't counted
+        all_items.append(one_item)
+    all_seconds = time.perf_counter() - start_time
+    assert all_items == [0, 1, 2]
+    paths_stage = run_metrics.stages["paths enumeration"]
+    assert 0.03 <= paths_stage["seconds"] <= all_seconds - 0.06
+    assert paths_stage["counters"] == {"paths": 3}
+
+
+def test_memory_summary_and_json(tmp_path):
+    run_metrics = RunMetrics(trace_memory=True)
+    with run_metrics.measure_stage("paths storage"):
+        kept_list = [0] * 2 ** 18
+    run_metrics.add_counter("paths storage", "bytes", 100)
+    run_metrics.finish()
+    assert run_metrics.stages["paths storage"]["peak_memory_bytes"] >= 8 * len(kept_list)
+    summary_lines = run_metrics.get_summary().split("\n")
+    assert summary_lines[0].startswith("paths storage: ") and summary_lines[0].endswith(" MB, bytes = 100")
+    assert summary_lines[-1].startswith("total: ")
+    run_metrics.write_json(tmp_path / "metrics.json")
+    metrics_data = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert metrics_data["stages"]["paths storage"]["counters"] == {"bytes": 100}
+    assert metrics_data["total_seconds"] == pytest.approx(run_metrics.total_seconds)
+
+
+def test_stages_of_method():
+    run_metrics = RunMetrics()
+    functional_stability.get_all_info_by_method(nx.ladder_graph(4), "Simple paths", 0, 7, arg_metrics=run_metrics,
+                                                arg_reduce_graph=False, arg_decompose_blocks=False)
+    assert {"paths enumeration", "compilation"} <= set(run_metrics.stages)
@@ -0,0 +1,171 @@
+"""Every method of functional stability against exhaustive check of all states of small random graphs
+
+    python -m pytest tests
+
+Exact value for given probabilities of edges is found here without the package: all 2ᵐ states of edges (m ≤ 10)
+are checked by networkx. Exact methods must give it (and exact importance of edges), bounds must contain it,
+estimate of Monte Carlo must be near it.
+"""
+import itertools
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import functional_stability
+
+# graphs are small, so exhaustive check of all states takes no time
+max_edges_amount = 10
+graphs_seeds = range(12)
+exact_methods = ["Exhaustive search", "Binary decision diagram"]
+bounds_methods = ["Esary-Proshan", "Litvak-Ushakov"]
+# distance of estimate of Monte Carlo (10000 samples, fixed seed) to exact value
+monte_carlo_tolerance = 0.03
+# rounding of floating point sums, products and logarithms
+values_tolerance = 1e-9
+
+
+def get_random_graph(seed, disconnected=False):
+    # random edges of complete graph (as "generate_new_graph" of main window); disconnected -> source and target
+    # are inside different components
+    random_generator = random.Random(seed)
+    nodes_amount = random_generator.randint(4, 7)
+    all_possible_edges = list(itertools.combinations(range(nodes_amount), 2))
+    if disconnected:
+        half_amount = nodes_amount // 2
+        all_possible_edges = [one_edge for one_edge in all_possible_edges
+                              if (one_edge[0] < half_amount) == (one_edge[1] < half_amount)]
+    random_generator.shuffle(all_possible_edges)
+    edges_amount = random_generator.randint(min(nodes_amount - 1, len(all_possible_edges)),
+                                            min(max_edges_amount, len(all_possible_edges)))
+    new_graph_data = nx.Graph()
+    new_graph_data.add_nodes_from(range(nodes_amount))
+    new_graph_data.add_edges_from(all_possible_edges[:edges_amount])
+    return new_graph_data, 0, nodes_amount - 1
+
+
+def get_random_probabilities(arg_defined_graph, seed, fixed_edges_amount=0):
+    # {(0, 1): p, ...}, the first 'fixed_edges_amount' edges get p = 0 or p = 1
+    random_generator = random.Random(seed)
+    all_edges_values = {}
+    for one_edge_ind, one_edge in enumerate(sorted(tuple(sorted(one_edge)) for one_edge in arg_defined_graph.edges)):
+        if one_edge_ind < fixed_edges_amount:
+            all_edges_values[one_edge] = float(random_generator.randint(0, 1))
+        else:
+            all_edges_values[one_edge] = random_generator.uniform(0.05, 0.95)
+    return all_edges_values
+
+
+def get_exact_value(arg_defined_graph, arg_source, arg_target, arg_all_edges_values):
+    # Σ P(state) over all states of edges, where source and target are connected
+    all_edges = list(arg_all_edges_values)
+    exact_value = 0.
+    for edges_states in itertools.product((False, True), repeat=len(all_edges)):
+        state_probability = 1.
+        state_graph = nx.Graph()
+        state_graph.add_nodes_from(arg_defined_graph.nodes)
+        for one_edge, edge_works in zip(all_edges, edges_states):
+            state_probability *= arg_all_edges_values[one_edge] if edge_works else 1 - arg_all_edges_values[one_edge]
+            if edge_works:
+                state_graph.add_edge(*one_edge)
+        if state_probability and nx.has_path(state_graph, arg_source, arg_target):
+            exact_value += state_probability
+    return exact_value
+
+
+def get_exact_importances(arg_defined_graph, arg_source, arg_target, arg_all_edges_values):
+    # ∂P/∂pₑ = P(pₑ = 1) - P(pₑ = 0)
+    exact_importances = {}
+    for one_edge in arg_all_edges_values:
+        working_values = dict(arg_all_edges_values)
+        working_values[one_edge] = 1.
+        failed_values = dict(arg_all_edges_values)
+        failed_values[one_edge] = 0.
+        exact_importances[one_edge] = (get_exact_value(arg_defined_graph, arg_source, arg_target, working_values)
+                                       - get_exact_value(arg_defined_graph, arg_source, arg_target, failed_values))
+    return exact_importances
+
+
+def get_method_values(method_result_data, arg_all_edges_values):
+    # values of every function of the first formula (value, bounds or estimate with interval)
+    return [one_function(arg_all_edges_values) for one_function, _ in method_result_data["first_formula_functions"]]
+
+
+def check_method(arg_defined_graph, arg_source, arg_target, arg_chosen_method, arg_all_edges_values,
+                 fixed_edges_values=None):
+    method_result_data = functional_stability.get_all_info_by_method(
+        arg_defined_graph, arg_chosen_method, arg_source, arg_target, arg_fixed_edges_values=fixed_edges_values)
+    exact_value = get_exact_value(arg_defined_graph, arg_source, arg_target, arg_all_edges_values)
+    method_values = get_method_values(method_result_data, arg_all_edges_values)
+    # there is no path between source and target (e.g. after deletion of edges with p = 0), then every method
+    # gives exact P = 0
+    if arg_chosen_method in exact_methods or method_result_data["first_formula_functions"][0][1].endswith("= "):
+        assert method_values[0] == pytest.approx(exact_value, abs=values_tolerance)
+    elif arg_chosen_method in bounds_methods:
+        lower_bound, upper_bound = method_values
+        assert lower_bound - values_tolerance <= exact_value <= upper_bound + values_tolerance
+    elif arg_chosen_method == "Simple paths":
+        # 1 - Π(1 - Π p) over all simple paths is upper bound
+        assert exact_value <= method_values[0] + values_tolerance
+    else:
+        assert method_values[0] == pytest.approx(exact_value, abs=monte_carlo_tolerance)
+    return method_result_data
+
+
+@pytest.mark.parametrize("seed", graphs_seeds)
+@pytest.mark.parametrize("chosen_method", functional_stability.all_methods_for_functional_stability)
+def test_method_by_all_states(chosen_method, seed):
+    defined_graph, source_node, target_node = get_random_graph(seed)
+    check_method(defined_graph, source_node, target_node, chosen_method,
+                 get_random_probabilities(defined_graph, seed))
+
+
+@pytest.mark.parametrize("seed", graphs_seeds[:4])
+@pytest.mark.parametrize("chosen_method", functional_stability.all_methods_for_functional_stability)
+def test_disconnected_terminals(chosen_method, seed):
+    defined_graph, source_node, target_node = get_random_graph(seed, disconnected=True)
+    all_edges_values = get_random_probabilities(defined_graph, seed)
+    method_result_data = check_method(defined_graph, source_node, target_node, chosen_method, all_edges_values)
+    assert get_method_values(method_result_data, all_edges_values)[0] == pytest.approx(0., abs=values_tolerance)
+
+
+@pytest.mark.parametrize("seed", graphs_seeds)
+@pytest.mark.parametrize("chosen_method", functional_stability.all_methods_for_functional_stability)
+def test_fixed_edges(chosen_method, seed):
+    defined_graph, source_node, target_node = get_random_graph(seed)
+    all_edges_values = get_random_probabilities(defined_graph, seed, fixed_edges_amount=2)
+    fixed_edges_values = {one_edge: one_value for one_edge, one_value in all_edges_values.items()
+                          if one_value in (0., 1.)}
+    check_method(defined_graph, source_node, target_node, chosen_method, all_edges_values, fixed_edges_values)
+
+
+@pytest.mark.parametrize("seed", graphs_seeds[:6])
+@pytest.mark.parametrize("chosen_method", exact_methods)
+@pytest.mark.parametrize("fixed_edges_amount", [0, 2])
+def test_exact_importances(chosen_method, seed, fixed_edges_amount):
+    # importance of edges with p = 0 or p = 1 isn't lost by reduction of graph
+    defined_graph, source_node, target_node = get_random_graph(seed)
+    all_edges_values = get_random_probabilities(defined_graph, seed, fixed_edges_amount)
+    fixed_edges_values = {one_edge: one_value for one_edge, one_value in all_edges_values.items()
+                          if one_value in (0., 1.)}
+    method_result_data = functional_stability.get_all_info_by_method(
+        defined_graph, chosen_method, source_node, target_node, arg_fixed_edges_values=fixed_edges_values)
+    importance_evaluator = method_result_data["importance_functions"][0][0]
+    all_importances = functional_stability.get_birnbaum_importances(importance_evaluator, all_edges_values)
+    exact_importances = get_exact_importances(defined_graph, source_node, target_node, all_edges_values)
+    for one_edge, one_edge_ind in importance_evaluator.edges_index.items():
+        assert all_importances[one_edge_ind] == pytest.approx(exact_importances[one_edge], abs=values_tolerance)
+
+
+@pytest.mark.parametrize("seed", graphs_seeds[:4])
+@pytest.mark.parametrize("chosen_method", exact_methods)
+def test_reliability_polynomial(chosen_method, seed):
+    defined_graph, source_node, target_node = get_random_graph(seed)
+    method_result_data = functional_stability.get_all_info_by_method(defined_graph, chosen_method, source_node,
+                                                                     target_node)
+    for general_edge_value in np.linspace(0.1, 0.9, 5):
+        exact_value = get_exact_value(defined_graph, source_node, target_node,
+                                      {tuple(sorted(one_edge)): general_edge_value for one_edge in defined_graph.edges})
+        assert method_result_data["reliability_polynomial"].evaluate_uniform(general_edge_value) == pytest.approx(
+            exact_value, abs=values_tolerance)
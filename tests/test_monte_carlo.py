@@ -0,0 +1,81 @@
+"""Monte Carlo estimate: the same samples for every scenario, confidence interval, evaluator shared by threads"""
+import threading
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from functional_stability.monte_carlo import MonteCarloEvaluator, get_wilson_interval
+from functional_stability.paths_enumeration import CalculationCancelled, EnumerationBudget, cancellation_scope
+
+
+def get_ladder_evaluator(samples_amount=2000):
+    ladder_graph = nx.ladder_graph(4)
+    return MonteCarloEvaluator(list(ladder_graph.edges), 0, 7, samples_amount=samples_amount), ladder_graph
+
+
+def test_uniform_values_are_the_same_as_values_of_matrix():
+    # chart of equal p is found by critical values of samples, matrix is checked sample by sample
+    monte_carlo_evaluator, ladder_graph = get_ladder_evaluator()
+    general_edge_values = np.array([0.2, 0.5, 0.8])
+    probabilities_matrix = np.repeat(general_edge_values[:, np.newaxis], ladder_graph.number_of_edges(), axis=1)
+    assert monte_carlo_evaluator.evaluate_uniform(general_edge_values) == pytest.approx(
+        monte_carlo_evaluator.evaluate(probabilities_matrix))
+
+
+def test_interval_contains_estimate():
+    monte_carlo_evaluator, _ = get_ladder_evaluator()
+    estimates, lower_values, upper_values = monte_carlo_evaluator.evaluate_uniform_with_interval(
+        np.linspace(0, 1, 11))
+    # Wilson interval is found by floating point arithmetic, its end for 0 or N connected samples is ≈ 0 or ≈ 1
+    assert np.all(lower_values <= estimates + 1e-12) and np.all(estimates <= upper_values + 1e-12)
+    assert estimates[0] == 0. and estimates[-1] == 1.
+    lower_values, upper_values = get_wilson_interval(np.array([0., 50.]), 100, 0.95)
+    assert lower_values[0] == pytest.approx(0.) and 0.39 < lower_values[1] < 0.5 < upper_values[1] < 0.61
+
+
+def test_the_same_terminals():
+    assert MonteCarloEvaluator([(0, 1)], 0, 0).evaluate_uniform(0.3) == 1.
+
+
+def test_last_results_of_other_input_are_not_returned():
+    monte_carlo_evaluator, ladder_graph = get_ladder_evaluator()
+    first_matrix = np.full((1, ladder_graph.number_of_edges()), 0.3)
+    second_matrix = np.full((1, ladder_graph.number_of_edges()), 0.9)
+    first_value = monte_carlo_evaluator.evaluate(first_matrix)[0]
+    second_value = monte_carlo_evaluator.evaluate(second_matrix)[0]
+    assert first_value < second_value
+    assert monte_carlo_evaluator.evaluate(first_matrix)[0] == first_value
+    assert monte_carlo_evaluator.lower_bound.evaluate(first_matrix)[0] <= first_value
+
+
+def test_evaluator_shared_by_threads():
+    monte_carlo_evaluator, ladder_graph = get_ladder_evaluator(samples_amount=500)
+    all_probabilities = np.linspace(0.1, 0.9, 8)
+    expected_values = [monte_carlo_evaluator.evaluate(np.full((1, ladder_graph.number_of_edges()), one_value))[0]
+                       for one_value in all_probabilities]
+    all_errors = []
+
+    def calculate_again(one_value_ind):
+        probabilities_matrix = np.full((1, ladder_graph.number_of_edges()), all_probabilities[one_value_ind])
+        for _ in range(20):
+            if monte_carlo_evaluator.evaluate(probabilities_matrix)[0] != expected_values[one_value_ind]:
+                all_errors.append(one_value_ind)
+
+    all_threads = [threading.Thread(target=calculate_again, args=(one_value_ind,))
+                   for one_value_ind in range(len(all_probabilities))]
+    for one_thread in all_threads:
+        one_thread.start()
+    for one_thread in all_threads:
+        one_thread.join()
+    assert all_errors == []
+
+
+def test_cancel_between_batches_of_samples():
+    monte_carlo_evaluator, _ = get_ladder_evaluator()
+    enumeration_budget = EnumerationBudget()
+    enumeration_budget.cancel()
+    with cancellation_scope(enumeration_budget), pytest.raises(CalculationCancelled):
+        monte_carlo_evaluator.evaluate_uniform(np.linspace(0, 1, 5))
+    # cancelled calculation isn't kept as last results
+    assert 0. < monte_carlo_evaluator.evaluate_uniform(0.5) < 1.
@@ -0,0 +1,57 @@
+"""Paths in CSR layout: paths with direction of edges, lengths, memory, groups and compiled functions"""
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from functional_stability.evaluators import PathGroupsEvaluator
+from functional_stability.path_set import PathGroups, PathSet
+
+
+def get_ladder_paths():
+    ladder_graph = nx.ladder_graph(3)
+    all_paths = list(nx.all_simple_paths(ladder_graph, 0, 5))
+    path_set = PathSet(list(ladder_graph.edges))
+    for one_path in all_paths:
+        path_set.add_path(one_path)
+    return path_set, all_paths, ladder_graph
+
+
+def test_paths_are_given_back_in_their_direction():
+    path_set, all_paths, _ = get_ladder_paths()
+    assert len(path_set) == len(all_paths)
+    assert list(path_set) == [list(zip(one_path, one_path[1:])) for one_path in all_paths]
+    assert path_set[-1] == path_set[len(path_set) - 1]
+    with pytest.raises(IndexError):
+        path_set[len(path_set)]
+    assert pickle.loads(pickle.dumps(path_set))[0] == path_set[0]
+
+
+def test_lengths_and_memory():
+    path_set, all_paths, _ = get_ladder_paths()
+    assert path_set.get_lengths().tolist() == [len(one_path) - 1 for one_path in all_paths]
+    assert sum(path_set.get_amounts_by_length().values()) == len(all_paths)
+    edges_amount = sum(len(one_path) - 1 for one_path in all_paths)
+    # edge id (int32), offset of path (int64, with the first offset) and first node (int64)
+    assert path_set.nbytes == 4 * edges_amount + 8 * (len(all_paths) + 1) + 8 * len(all_paths)
+    assert PathSet([(0, 1)]).get_amounts_by_length() == {}
+
+
+def test_matrices_of_paths_and_groups():
+    path_set, all_paths, ladder_graph = get_ladder_paths()
+    paths_matrix = path_set.get_matrix().toarray()
+    assert paths_matrix.shape == (len(all_paths), ladder_graph.number_of_edges())
+    assert paths_matrix.sum(axis=1).tolist() == [len(one_path) - 1 for one_path in all_paths]
+    path_groups = PathGroups(path_set)
+    path_groups.add_group([0, 2])
+    path_groups.add_group([1])
+    assert len(path_groups) == 2 and path_groups[1] == [path_set[1]]
+    assert path_groups.get_matrix().toarray().tolist() == [[1, 0, 1] + [0] * (len(all_paths) - 3),
+                                                           [0, 1, 0] + [0] * (len(all_paths) - 3)]
+    # function of groups by ready matrices is the same as function of lists of paths
+    probabilities_matrix = np.random.default_rng(0).uniform(0., 1., (4, ladder_graph.number_of_edges()))
+    groups_evaluator = PathGroupsEvaluator.from_matrices(path_set.edges_index, path_set.get_matrix(),
+                                                         path_groups.get_matrix())
+    assert groups_evaluator.evaluate(probabilities_matrix) == pytest.approx(
+        PathGroupsEvaluator(list(path_groups), list(ladder_graph.edges)).evaluate(probabilities_matrix))
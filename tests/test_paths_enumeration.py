@@ -0,0 +1,118 @@
+"""Budget of enumeration: limits of amount, length, seconds and memory, cancel and progress"""
+import time
+
+import networkx as nx
+import pytest
+
+from functional_stability.paths_enumeration import (
+    CalculationCancelled,
+    EnumerationBudget,
+    cancellation_scope,
+    check_cancelled,
+    iterate_simple_paths,
+    iterate_with_budget,
+)
+
+
+def iterate_slowly(all_items, pause_seconds):
+    for one_item in all_items:
+        time.sleep(pause_seconds)
+        yield one_item
+
+
+def test_all_paths_without_limits():
+    enumeration_budget = EnumerationBudget()
+    all_paths = list(iterate_simple_paths(nx.complete_graph(5), 0, 4, enumeration_budget))
+    # 1 + 3 + 3×2 + 3×2×1 paths
+    assert len(all_paths) == 16
+    assert enumeration_budget.found_amount == 16
+    assert enumeration_budget.is_complete
+
+
+def test_limit_of_paths_amount():
+    enumeration_budget = EnumerationBudget(max_paths_amount=5)
+    assert len(list(iterate_simple_paths(nx.complete_graph(6), 0, 5, enumeration_budget))) == 5
+    assert enumeration_budget.stop_reason == "limit of 5 paths is reached"
+    assert not enumeration_budget.is_stopped_by_time
+
+
+def test_limit_is_checked_before_the_first_item():
+    enumeration_budget = EnumerationBudget(max_paths_amount=0)
+    assert list(iterate_simple_paths(nx.complete_graph(4), 0, 3, enumeration_budget)) == []
+    assert not enumeration_budget.is_complete
+
+
+def test_limit_of_path_length():
+    enumeration_budget = EnumerationBudget(max_path_length=2)
+    all_paths = list(iterate_simple_paths(nx.complete_graph(5), 0, 4, enumeration_budget))
+    assert len(all_paths) == 4
+    assert all(len(one_path) <= 3 for one_path in all_paths)
+
+
+def test_limit_of_memory():
+    enumeration_budget = EnumerationBudget(max_memory_bytes=1)
+    assert len(list(iterate_with_budget([[(0, 1)], [(1, 2)]], enumeration_budget, len))) == 1
+    assert enumeration_budget.estimated_memory_bytes == (EnumerationBudget.estimated_bytes_per_path
+                                                         + EnumerationBudget.estimated_bytes_per_path_edge)
+    assert "bytes of memory" in enumeration_budget.stop_reason
+
+
+def test_limit_of_seconds():
+    enumeration_budget = EnumerationBudget(max_seconds=0.05)
+    found_items = list(iterate_with_budget(iterate_slowly(range(100), 0.01), enumeration_budget, lambda _: 1))
+    assert len(found_items) < 100
+    assert enumeration_budget.is_stopped_by_time
+
+
+def test_seconds_of_several_stages_are_added():
+    enumeration_budget = EnumerationBudget(max_seconds=0.08)
+    first_items = list(iterate_with_budget(iterate_slowly(range(5), 0.01), enumeration_budget, lambda _: 1))
+    first_elapsed_seconds = enumeration_budget.elapsed_seconds
+    assert len(first_items) == 5 and first_elapsed_seconds >= 0.05
+    second_items = list(iterate_with_budget(iterate_slowly(range(100), 0.01), enumeration_budget, lambda _: 1))
+    # the second stage has only the rest of limit
+    assert len(second_items) < 5
+    assert enumeration_budget.elapsed_seconds > first_elapsed_seconds
+    assert enumeration_budget.is_stopped_by_time
+
+
+def test_cancel_before_and_during_enumeration():
+    enumeration_budget = EnumerationBudget()
+    enumeration_budget.cancel()
+    with pytest.raises(CalculationCancelled):
+        list(iterate_simple_paths(nx.complete_graph(4), 0, 3, enumeration_budget))
+    enumeration_budget = EnumerationBudget()
+    found_items = []
+    with pytest.raises(CalculationCancelled):
+        for one_item in iterate_with_budget(range(10), enumeration_budget, lambda _: 1):
+            found_items.append(one_item)
+            enumeration_budget.cancel()
+    assert found_items == [0]
+
+
+def test_progress_callback():
+    all_progress = []
+    enumeration_budget = EnumerationBudget(progress_callback=lambda found_amount, _: all_progress.append(found_amount),
+                                           progress_step=2)
+    list(iterate_with_budget(range(5), enumeration_budget, lambda _: 1))
+    # every 'progress_step' items and once after enumeration
+    assert all_progress == [2, 4, 5]
+
+
+def test_reset_progress_keeps_limits():
+    enumeration_budget = EnumerationBudget(max_paths_amount=1)
+    list(iterate_with_budget(range(5), enumeration_budget, lambda _: 1))
+    enumeration_budget.reset_progress()
+    assert enumeration_budget.found_amount == 0 and enumeration_budget.is_complete
+    assert len(list(iterate_with_budget(range(5), enumeration_budget, lambda _: 1))) == 1
+
+
+def test_cancellation_scope_of_thread():
+    enumeration_budget = EnumerationBudget()
+    with cancellation_scope(None, enumeration_budget):
+        check_cancelled("Stage")
+        enumeration_budget.cancel()
+        with pytest.raises(CalculationCancelled, match="Stage is cancelled"):
+            check_cancelled("Stage")
+    # budgets are forgotten after scope
+    check_cancelled("Stage")
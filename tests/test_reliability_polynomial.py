@@ -0,0 +1,41 @@
+"""Reliability polynomial: counts of states and coefficients of powers, values near 0 and 1, product of blocks"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from functional_stability.reliability_polynomial import ReliabilityPolynomial, get_states_counts
+
+
+def test_series_and_parallel_edges():
+    # two edges in series: P = p², in parallel: P = 2p - p²
+    assert ReliabilityPolynomial([0, 0, 1]).power_coefficients == [0, 0, 1]
+    assert ReliabilityPolynomial([0, 2, 1]).power_coefficients == [0, 2, -1]
+    assert ReliabilityPolynomial.from_power_coefficients([0, 2, -1]).states_counts == [0, 2, 1]
+    parallel_polynomial = ReliabilityPolynomial([0, 2, 1])
+    all_p_values = np.linspace(0, 1, 11)
+    assert parallel_polynomial.evaluate_uniform(all_p_values) == pytest.approx(2 * all_p_values - all_p_values ** 2)
+    assert parallel_polynomial.evaluate_uniform(0.) == 0. and parallel_polynomial.evaluate_uniform(1.) == 1.
+
+
+def test_counts_and_coefficients_are_inverse():
+    random_generator = random.Random(0)
+    states_counts = [random_generator.randint(0, 10 ** 12) for _ in range(41)]
+    assert get_states_counts(ReliabilityPolynomial(states_counts).power_coefficients) == states_counts
+
+
+def test_product_of_blocks():
+    # (p²) × (2p - p²) for 4 edges of two blocks
+    product_polynomial = ReliabilityPolynomial([0, 0, 1]) * ReliabilityPolynomial([0, 2, 1])
+    assert product_polynomial.edges_amount == 4
+    assert product_polynomial.evaluate_uniform(0.3) == pytest.approx(0.3 ** 2 * (2 * 0.3 - 0.3 ** 2))
+
+
+def test_precision_of_many_edges():
+    # 60 parallel edges: P = 1 - q⁶⁰, coefficients of powers of p are too big for floating point
+    parallel_polynomial = ReliabilityPolynomial([0] + [math.comb(60, one_amount) for one_amount in range(1, 61)])
+    all_p_values = np.array([1e-3, 0.01, 0.3, 0.7, 0.999])
+    assert parallel_polynomial.evaluate_uniform(all_p_values) == pytest.approx(1 - (1 - all_p_values) ** 60,
+                                                                               rel=1e-12)
+
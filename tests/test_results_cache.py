@@ -0,0 +1,59 @@
+"""Cache of results: key of graph and limits, least recently used items, files of other processes"""
+import networkx as nx
+
+import functional_stability
+from functional_stability.paths_enumeration import EnumerationBudget
+from functional_stability.results_cache import ResultsCache, get_results_key
+
+
+def test_key_depends_on_graph_terminals_and_limits():
+    defined_graph = nx.Graph([(0, 1), (1, 2)])
+    results_key = get_results_key(defined_graph, 0, 2, "Simple paths", (EnumerationBudget(),))
+    assert results_key == get_results_key(nx.Graph([(0, 1), (1, 2)]), 0, 2, "Simple paths", (EnumerationBudget(),))
+    # order of edges is order of columns of functions
+    assert results_key != get_results_key(nx.Graph([(1, 2), (0, 1)]), 0, 2, "Simple paths", (EnumerationBudget(),))
+    assert results_key != get_results_key(defined_graph, 2, 0, "Simple paths", (EnumerationBudget(),))
+    assert results_key != get_results_key(defined_graph, 0, 2, "Simple paths",
+                                          (EnumerationBudget(max_paths_amount=1),))
+    assert results_key != get_results_key(defined_graph, 0, 2, "Simple paths", (EnumerationBudget(),),
+                                          {"reduce_graph": False})
+
+
+def test_least_recently_used_items_stay_in_memory():
+    results_cache = ResultsCache(max_memory_items=2)
+    results_cache.put("first", 1)
+    results_cache.put("second", 2)
+    assert results_cache.get("first") == 1
+    results_cache.put("third", 3)
+    assert results_cache.get("second") is None
+    assert results_cache.get("first") == 1 and results_cache.get("third") == 3
+    assert (results_cache.hits_amount, results_cache.misses_amount) == (3, 1)
+
+
+def test_files_are_read_by_other_cache(tmp_path):
+    ResultsCache(str(tmp_path), max_memory_items=1).put("first", {"paths": [[(0, 1)]]})
+    other_cache = ResultsCache(str(tmp_path))
+    assert other_cache.get("first") == {"paths": [[(0, 1)]]}
+    other_cache.clear()
+    assert ResultsCache(str(tmp_path)).get("first") is None
+
+
+def test_broken_and_old_files_are_removed(tmp_path):
+    results_cache = ResultsCache(str(tmp_path), max_memory_items=0, max_disk_bytes=0)
+    results_cache.put("first", list(range(100)))
+    # the only file is more than limit
+    assert list(tmp_path.iterdir()) == []
+    (tmp_path / "broken.pickle").write_bytes(b"not pickle")
+    assert ResultsCache(str(tmp_path)).get("broken") is None
+    assert not (tmp_path / "broken.pickle").exists()
+
+
+def test_results_of_method_are_taken_from_cache():
+    results_cache = ResultsCache()
+    defined_graph = nx.ladder_graph(3)
+    first_result_data = functional_stability.get_all_info_by_method(defined_graph, "Simple paths", 0, 5,
+                                                                    arg_results_cache=results_cache)
+    second_result_data = functional_stability.get_all_info_by_method(defined_graph, "Simple paths", 0, 5,
+                                                                     arg_results_cache=results_cache)
+    assert results_cache.hits_amount == 1
+    assert second_result_data["first_formula_functions"][0][0] is first_result_data["first_formula_functions"][0][0]